@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 <+YOU OR YOUR COMPANY+>.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+#
+# Measures the CPU time used by the simple deframer when searching for the
+# start of frame on an idle channel. Random bits are used as the input, which
+# corresponds to the demodulated noise seen by a listening receiver. The result
+# is reported as CPU seconds per second of input at the specified bit rate.
+#
+
+import time
+import random
+import argparse
+from gnuradio import gr
+from gnuradio import blocks
+import scratch_radio
+
+def runBenchmark(bitCount, packed):
+  if (packed):
+    srcData = [random.getrandbits(8) for i in range(bitCount / 8)]
+  else:
+    srcData = [random.getrandbits(1) for i in range(bitCount)]
+  tb = gr.top_block()
+  src = blocks.vector_source_b(srcData)
+  deframer = scratch_radio.simple_deframer(packed)
+  dst = blocks.null_sink(gr.sizeof_char)
+  tb.connect(src, deframer, dst)
+  startTime = time.clock()
+  tb.run()
+  return time.clock() - startTime
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(
+    description="Simple deframer idle channel benchmark")
+  parser.add_argument("--bit-rate", type=float, default=100e3,
+    help="nominal channel bit rate used to scale the results")
+  parser.add_argument("--bit-count", type=int, default=10000000,
+    help="number of random input bits to process")
+  options = parser.parse_args()
+  inputSeconds = options.bit_count / options.bit_rate
+  for packed in [False, True]:
+    cpuSeconds = runBenchmark(options.bit_count, packed)
+    print "%s input : %.3f CPU seconds for %.1f seconds of input (%.4f%% load)" % \
+      ("Packed" if packed else "Unpacked", cpuSeconds, inputSeconds,
+      100.0 * cpuSeconds / inputSeconds)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 <+YOU OR YOUR COMPANY+>.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+#
+# Measures the throughput of the OOK modulator for random data, with and
+# without pulse shaping. The nominal sample rate is set well above the
+# achievable throughput so that the modulator output latency limit has no
+# effect, while keeping the same number of samples per symbol and relative
+# modulation frequency as the Scratch Radio transmit chain. The result is
+# reported as output megasamples per CPU second.
+#
+
+import time
+import random
+import argparse
+from gnuradio import gr
+from gnuradio import blocks
+import scratch_radio
+
+# Scratch Radio uses 400 kHz sampling with 2400 baud Manchester encoded
+# symbols, giving 166 samples per symbol.
+SAMPLES_PER_SYMBOL = 166
+BAUD_RATE = 10000000
+SAMPLE_RATE = SAMPLES_PER_SYMBOL * BAUD_RATE
+MOD_FREQ = SAMPLE_RATE / 8
+
+def runBenchmark(symbolCount, rampFraction):
+  srcData = [random.randint(0, 1) for i in range(symbolCount)]
+  tb = gr.top_block()
+  src = blocks.vector_source_b(srcData)
+  modulator = scratch_radio.ook_modulator(
+    BAUD_RATE, SAMPLE_RATE, MOD_FREQ, False, rampFraction)
+  dst = blocks.null_sink(gr.sizeof_gr_complex)
+  tb.connect(src, modulator, dst)
+  startTime = time.clock()
+  tb.run()
+  cpuSeconds = time.clock() - startTime
+  return cpuSeconds
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(
+    description="OOK modulator sample synthesis benchmark")
+  parser.add_argument("--symbol-count", type=int, default=200000,
+    help="number of random symbols to modulate")
+  options = parser.parse_args()
+  sampleCount = options.symbol_count * SAMPLES_PER_SYMBOL
+  for (shapeName, rampFraction) in [("None", 0.0), ("Ramped", 0.25)]:
+    cpuSeconds = runBenchmark(options.symbol_count, rampFraction)
+    print "%-8s : %.3f CPU seconds for %d samples (%.1f MS/s)" % \
+      (shapeName, cpuSeconds, sampleCount, sampleCount / cpuSeconds / 1e6)
@@ -0,0 +1,63 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_BURST_GAP_FILL_CC_H
+#define INCLUDED_SCRATCH_RADIO_BURST_GAP_FILL_CC_H
+
+#include <scratch_radio/api.h>
+#include <gnuradio/block.h>
+
+namespace gr {
+  namespace scratch_radio {
+
+    /*!
+     * \brief Converts a burst mode transmit stream to a continuous one.
+     * \ingroup scratch_radio
+     *
+     * Input samples are passed through unchanged. Between bursts,
+     * which are delimited by 'tx_sob' and 'tx_eob' tags, zero valued
+     * samples are inserted at the nominal sample rate while there is
+     * no input. This is used to model a radio which transmits nothing
+     * between bursts.
+     */
+    class SCRATCH_RADIO_API burst_gap_fill_cc : virtual public gr::block
+    {
+     public:
+      typedef boost::shared_ptr<burst_gap_fill_cc> sptr;
+
+      /*!
+       * \brief Return a shared_ptr to a new instance of scratch_radio::burst_gap_fill_cc.
+       *
+       * To avoid accidental use of raw pointers, scratch_radio::burst_gap_fill_cc's
+       * constructor is in a private implementation
+       * class. scratch_radio::burst_gap_fill_cc::make is the public interface for
+       * creating new instances.
+       *
+       * \param sample_rate The nominal sample rate used when inserting
+       *        zero valued samples.
+       */
+      static sptr make(int sample_rate);
+    };
+
+  } // namespace scratch_radio
+} // namespace gr
+
+#endif /* INCLUDED_SCRATCH_RADIO_BURST_GAP_FILL_CC_H */
+
@@ -0,0 +1,70 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_CONV_DEC_H
+#define INCLUDED_SCRATCH_RADIO_CONV_DEC_H
+
+#include <scratch_radio/api.h>
+#include <gnuradio/block.h>
+
+namespace gr {
+  namespace scratch_radio {
+
+    /*!
+     * \brief Viterbi decoder for the rate 1/2 convolutional code.
+     * \ingroup scratch_radio
+     *
+     * Decodes the bit stream generated by the convolutional encoder
+     * using hard decision Viterbi decoding. The received stream does
+     * not indicate which code bits form a pair, so both possible
+     * alignments are decoded in parallel and the output is taken from
+     * the alignment with the fewest recent bit errors. The decoded
+     * output is delayed by 56 bits.
+     */
+    class SCRATCH_RADIO_API conv_dec : virtual public gr::block
+    {
+     public:
+      typedef boost::shared_ptr<conv_dec> sptr;
+
+      /*!
+       * \brief Return a shared_ptr to a new instance of scratch_radio::conv_dec.
+       *
+       * To avoid accidental use of raw pointers, scratch_radio::conv_dec's
+       * constructor is in a private implementation
+       * class. scratch_radio::conv_dec::make is the public interface for
+       * creating new instances.
+       *
+       * \param packed Use packed bit streams with eight bits per item,
+       *        least significant bit first.
+       */
+      static sptr make(bool packed=false);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
+       */
+      virtual void reset_state() = 0;
+    };
+
+  } // namespace scratch_radio
+} // namespace gr
+
+#endif /* INCLUDED_SCRATCH_RADIO_CONV_DEC_H */
+
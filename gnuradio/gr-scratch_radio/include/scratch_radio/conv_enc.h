@@ -0,0 +1,72 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_CONV_ENC_H
+#define INCLUDED_SCRATCH_RADIO_CONV_ENC_H
+
+#include <scratch_radio/api.h>
+#include <gnuradio/sync_interpolator.h>
+
+namespace gr {
+  namespace scratch_radio {
+
+    /*!
+     * \brief Rate 1/2 convolutional encoder for forward error correction.
+     * \ingroup scratch_radio
+     *
+     * Encodes the bit stream using the constraint length 7 code with
+     * generator polynomials 171 and 133 octal. Each input bit is
+     * replaced by two code bits. Idle bits are passed through without
+     * changing the encoder state, except that the first eight idle
+     * bits after any data are encoded as zero bits in order to flush
+     * the encoder at the end of each frame.
+     */
+    class SCRATCH_RADIO_API conv_enc : virtual public gr::sync_interpolator
+    {
+     public:
+      typedef boost::shared_ptr<conv_enc> sptr;
+
+      /*!
+       * \brief Return a shared_ptr to a new instance of scratch_radio::conv_enc.
+       *
+       * To avoid accidental use of raw pointers, scratch_radio::conv_enc's
+       * constructor is in a private implementation
+       * class. scratch_radio::conv_enc::make is the public interface for
+       * creating new instances.
+       *
+       * \param packed Use packed bit streams with eight bits per item,
+       *        least significant bit first. Idle bytes marked with an
+       *        'idle' tag are encoded as two zero valued bytes, each of
+       *        which carries an 'idle' tag.
+       */
+      static sptr make(bool packed=false);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
+       */
+      virtual void reset_state() = 0;
+    };
+
+  } // namespace scratch_radio
+} // namespace gr
+
+#endif /* INCLUDED_SCRATCH_RADIO_CONV_ENC_H */
+
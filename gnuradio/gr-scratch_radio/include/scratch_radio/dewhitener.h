@@ -0,0 +1,68 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_DEWHITENER_H
+#define INCLUDED_SCRATCH_RADIO_DEWHITENER_H
+
+#include <scratch_radio/api.h>
+#include <gnuradio/sync_block.h>
+
+namespace gr {
+  namespace scratch_radio {
+
+    /*!
+     * \brief Self synchronising data dewhitener for NRZ line coding.
+     * \ingroup scratch_radio
+     *
+     * Recovers the bit stream generated by the data whitener. The
+     * dewhitener synchronises to the received bit stream after 17 bits,
+     * without any framing information. Each received bit error results
+     * in three output bit errors.
+     */
+    class SCRATCH_RADIO_API dewhitener : virtual public gr::sync_block
+    {
+     public:
+      typedef boost::shared_ptr<dewhitener> sptr;
+
+      /*!
+       * \brief Return a shared_ptr to a new instance of scratch_radio::dewhitener.
+       *
+       * To avoid accidental use of raw pointers, scratch_radio::dewhitener's
+       * constructor is in a private implementation
+       * class. scratch_radio::dewhitener::make is the public interface for
+       * creating new instances.
+       *
+       * \param packed Use packed bit streams with eight bits per item,
+       *        least significant bit first.
+       */
+      static sptr make(bool packed=false);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
+       */
+      virtual void reset_state() = 0;
+    };
+
+  } // namespace scratch_radio
+} // namespace gr
+
+#endif /* INCLUDED_SCRATCH_RADIO_DEWHITENER_H */
+
@@ -45,8 +45,19 @@ namespace gr {
        * constructor is in a private implementation
        * class. scratch_radio::manc_dec::make is the public interface for
        * creating new instances.
+       *
+       * \param invert Decode a falling edge as '1' instead of a rising
+       *        edge.
+       * \param packed Use packed bit streams with eight bits per item,
+       *        least significant bit first.
+       */
+      static sptr make(bool invert, bool packed=false);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
        */
-      static sptr make(bool invert);
+      virtual void reset_state() = 0;
     };
 
   } // namespace scratch_radio
@@ -45,8 +45,21 @@ namespace gr {
        * constructor is in a private implementation
        * class. scratch_radio::manc_enc::make is the public interface for
        * creating new instances.
+       *
+       * \param invert Encode '1' as a falling edge instead of a rising
+       *        edge.
+       * \param packed Use packed bit streams with eight bits per item,
+       *        least significant bit first. Idle bytes marked with an
+       *        'idle' tag are encoded as two zero valued bytes, each of
+       *        which carries an 'idle' tag.
+       */
+      static sptr make(bool invert, bool packed=false);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
        */
-      static sptr make(bool invert);
+      virtual void reset_state() = 0;
     };
 
   } // namespace scratch_radio
@@ -23,6 +23,7 @@
 #define INCLUDED_SCRATCH_RADIO_MESSAGE_SINK_H
 
 #include <scratch_radio/api.h>
+#include <scratch_radio/simple_frame_format.h>
 #include <gnuradio/sync_block.h>
 
 namespace gr {
@@ -45,8 +46,29 @@ namespace gr {
        * constructor is in a private implementation
        * class. scratch_radio::message_sink::make is the public interface for
        * creating new instances.
+       *
+       * \param msg_file_name The message pipe to write received messages to.
+       * \param max_flush_latency The maximum time in milliseconds for which
+       *        complete messages may be held before they are written out, so
+       *        that multiple messages can be written together. Messages are
+       *        written out on every call to work if this is zero.
+       * \param extended Accept two byte length fields for the extended
+       *        frame format. Fragmented messages are then reassembled
+       *        before being written out.
+       */
+      static sptr make(char* msg_file_name, int max_flush_latency=0,
+        bool extended=false);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
+       */
+      virtual void reset_state() = 0;
+
+      /*!
+       * \brief Indicates whether the message pipe has been opened for writing.
        */
-      static sptr make(char* msg_file_name);
+      virtual bool is_attached() = 0;
     };
 
   } // namespace scratch_radio
@@ -23,6 +23,7 @@
 #define INCLUDED_SCRATCH_RADIO_MESSAGE_SOURCE_H
 
 #include <scratch_radio/api.h>
+#include <scratch_radio/simple_frame_format.h>
 #include <gnuradio/sync_block.h>
 
 namespace gr {
@@ -45,8 +46,27 @@ namespace gr {
        * constructor is in a private implementation
        * class. scratch_radio::message_source::make is the public interface for
        * creating new instances.
+       *
+       * \param msg_file_name The message pipe to read messages from.
+       * \param msg_cps_rate The maximum message rate in characters per
+       *        second, which limits the output buffer latency.
+       * \param extended Generate two byte length fields for the extended
+       *        frame format. Messages which are longer than the maximum
+       *        frame length are then split into fragments.
+       */
+      static sptr make(char* msg_file_name, int msg_cps_rate,
+        bool extended=false);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
+       */
+      virtual void reset_state() = 0;
+
+      /*!
+       * \brief Indicates whether a writer has opened the message pipe.
        */
-      static sptr make(char* msg_file_name, int msg_cps_rate);
+      virtual bool is_attached() = 0;
     };
 
   } // namespace scratch_radio
@@ -23,7 +23,7 @@
 #define INCLUDED_SCRATCH_RADIO_OOK_DEMODULATOR_H
 
 #include <scratch_radio/api.h>
-#include <gnuradio/sync_block.h>
+#include <gnuradio/sync_decimator.h>
 
 namespace gr {
   namespace scratch_radio {
@@ -33,7 +33,7 @@ namespace gr {
      * \ingroup scratch_radio
      *
      */
-    class SCRATCH_RADIO_API ook_demodulator : virtual public gr::sync_block
+    class SCRATCH_RADIO_API ook_demodulator : virtual public gr::sync_decimator
     {
      public:
       typedef boost::shared_ptr<ook_demodulator> sptr;
@@ -45,8 +45,18 @@ namespace gr {
        * constructor is in a private implementation
        * class. scratch_radio::ook_demodulator::make is the public interface for
        * creating new instances.
+       *
+       * \param decimation The number of demodulated input samples which
+       *        are averaged to generate each output sample. This reduces
+       *        the sample rate for the following symbol timing recovery.
+       */
+      static sptr make(int baud_rate, int sample_rate, int decimation=1);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
        */
-      static sptr make(int baud_rate, int sample_rate);
+      virtual void reset_state() = 0;
     };
 
   } // namespace scratch_radio
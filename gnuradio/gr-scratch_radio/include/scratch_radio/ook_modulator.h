@@ -45,8 +45,40 @@ namespace gr {
        * constructor is in a private implementation
        * class. scratch_radio::ook_modulator::make is the public interface for
        * creating new instances.
+       *
+       * \param burst_mode Generate no output samples for idle input
+       *        bits. Each burst of modulated symbols starts with a sample
+       *        marked using the 'tx_sob' tag and is followed by a single
+       *        zero valued symbol, the last sample of which is marked
+       *        using the 'tx_eob' tag. Idle bits are still consumed at
+       *        the nominal symbol rate. The radio sink must honour the
+       *        burst tags, or be preceded by a burst_gap_fill_cc block.
+       * \param ramp_fraction The fraction of the symbol period, from 0.0
+       *        to 1.0, over which the carrier is ramped up or down at the
+       *        start of a symbol with a raised cosine envelope. This
+       *        reduces the spectral splatter caused by switching the
+       *        carrier. Zero selects rectangular pulses.
+       */
+      static sptr make(int baud_rate, int sample_rate, int mod_freq,
+        bool burst_mode=false, float ramp_fraction=0.0);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
+       */
+      virtual void reset_state() = 0;
+
+      /*!
+       * \brief Change the symbol rate. Takes effect at the next symbol
+       * boundary.
+       */
+      virtual void set_baud_rate(int baud_rate) = 0;
+
+      /*!
+       * \brief Change the modulation frequency. Takes effect at the next
+       * symbol boundary.
        */
-      static sptr make(int baud_rate, int sample_rate, int mod_freq);
+      virtual void set_mod_freq(int mod_freq) = 0;
     };
 
   } // namespace scratch_radio
@@ -23,6 +23,7 @@
 #define INCLUDED_SCRATCH_RADIO_SIMPLE_DEFRAMER_H
 
 #include <scratch_radio/api.h>
+#include <scratch_radio/simple_frame_format.h>
 #include <gnuradio/block.h>
 
 namespace gr {
@@ -45,8 +46,36 @@ namespace gr {
        * constructor is in a private implementation
        * class. scratch_radio::simple_deframer::make is the public interface for
        * creating new instances.
+       *
+       * \param packed Accept a packed bit stream with eight bits per
+       *        input item, least significant bit first.
+       * \param sync_word The frame sync word to search for. This must
+       *        match the sync word used by the framer.
+       * \param max_sync_errors The maximum number of bit errors which
+       *        are accepted when matching the sync word. This must be
+       *        between zero and SIMPLE_FRAME_MAX_SYNC_ERRORS.
+       * \param extended Use the extended frame format, with a two byte
+       *        frame length field. The length field is passed on to the
+       *        output as two bytes, most significant byte first.
+       * \param frame_check The frame integrity check to use, which must
+       *        be one of the SIMPLE_FRAME_CHECK_* values. This must match
+       *        the frame check used by the framer.
+       */
+      static sptr make(bool packed=false,
+        uint32_t sync_word=SIMPLE_FRAME_SYNC_WORD, int max_sync_errors=0,
+        bool extended=false, int frame_check=SIMPLE_FRAME_CHECK_FLETCHER);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
+       */
+      virtual void reset_state() = 0;
+
+      /*!
+       * \brief Set the maximum number of bit errors which are accepted
+       * when matching the sync word.
        */
-      static sptr make();
+      virtual void set_max_sync_errors(int max_sync_errors) = 0;
     };
 
   } // namespace scratch_radio
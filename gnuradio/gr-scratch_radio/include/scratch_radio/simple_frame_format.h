@@ -0,0 +1,76 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_SIMPLE_FRAME_FORMAT_H
+#define INCLUDED_SCRATCH_RADIO_SIMPLE_FRAME_FORMAT_H
+
+/*
+ * Frame sync word used by default by the simple framer and deframer.
+ * The sync word is sent as the last four header bytes, least
+ * significant byte first, which gives the byte sequence 0x7E, 0x81,
+ * 0xC3, 0x3C for the default value. It is preceded by a fixed
+ * alternating 0xA5, 0xF0 preamble.
+ */
+#define SIMPLE_FRAME_SYNC_WORD 0x3CC3817E
+
+/*
+ * Maximum number of bit errors which may be accepted when matching
+ * the sync word. For the default header the sync word differs from
+ * every earlier alignment of the header bits in at least eleven bit
+ * positions, so up to five bit errors can be tolerated without the
+ * match becoming ambiguous.
+ */
+#define SIMPLE_FRAME_MAX_SYNC_ERRORS 5
+
+/*
+ * In the standard frame format the frame length field is a single
+ * byte, giving a maximum message size of 255 bytes. In the extended
+ * frame format the length field is two bytes, most significant byte
+ * first. The most significant bit of the field is always set so that
+ * it can not be mistaken for an idle byte. Messages which are too
+ * long for a single frame are split into a series of fragments which
+ * are sent in consecutive frames. The fragment flag is set for all
+ * but the last fragment of a message, and the fragment index counts
+ * the fragments of each message from zero. The remaining bits hold
+ * the length of the frame payload.
+ */
+#define SIMPLE_FRAME_MAX_LENGTH 255
+#define SIMPLE_FRAME_EXTENDED_FLAG 0x8000
+#define SIMPLE_FRAME_FRAGMENT_FLAG 0x4000
+#define SIMPLE_FRAME_FRAGMENT_INDEX_MASK 0x3800
+#define SIMPLE_FRAME_FRAGMENT_INDEX_SHIFT 11
+#define SIMPLE_FRAME_EXTENDED_LENGTH_MASK 0x07FF
+#define SIMPLE_FRAME_MAX_EXTENDED_LENGTH 2047
+#define SIMPLE_FRAME_MAX_FRAGMENTS 8
+#define SIMPLE_FRAME_MAX_EXTENDED_MESSAGE_SIZE \
+  (SIMPLE_FRAME_MAX_FRAGMENTS * SIMPLE_FRAME_MAX_EXTENDED_LENGTH)
+
+/*
+ * Selects the frame integrity check which is calculated over the
+ * frame length field and payload. The default is a two byte Fletcher
+ * checksum with modulo 255 sums. Alternatively a CRC-16/X-25 or
+ * CRC-32 check may be used, which detects all burst errors of up to
+ * 16 or 32 bits respectively.
+ */
+#define SIMPLE_FRAME_CHECK_FLETCHER 0
+#define SIMPLE_FRAME_CHECK_CRC16 1
+#define SIMPLE_FRAME_CHECK_CRC32 2
+
+#endif /* INCLUDED_SCRATCH_RADIO_SIMPLE_FRAME_FORMAT_H */
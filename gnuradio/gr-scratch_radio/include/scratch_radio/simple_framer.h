@@ -23,6 +23,7 @@
 #define INCLUDED_SCRATCH_RADIO_SIMPLE_FRAMER_H
 
 #include <scratch_radio/api.h>
+#include <scratch_radio/simple_frame_format.h>
 #include <gnuradio/block.h>
 
 namespace gr {
@@ -45,8 +46,31 @@ namespace gr {
        * constructor is in a private implementation
        * class. scratch_radio::simple_framer::make is the public interface for
        * creating new instances.
+       *
+       * \param packed Generate a packed bit stream with eight bits per
+       *        output item, least significant bit first. Idle bytes are
+       *        then sent as zero valued items marked with an 'idle' tag.
+       *        Otherwise one bit is generated per output item, with
+       *        idle bits set to 0xFF.
+       * \param sync_word The frame sync word, which is sent as the last
+       *        four header bytes, least significant byte first. This
+       *        must match the sync word used by the deframer.
+       * \param extended Use the extended frame format, with a two byte
+       *        frame length field. The length field is then read from
+       *        the input as two bytes, most significant byte first.
+       * \param frame_check The frame integrity check to use, which must
+       *        be one of the SIMPLE_FRAME_CHECK_* values. This must match
+       *        the frame check used by the deframer.
+       */
+      static sptr make(bool packed=false,
+        uint32_t sync_word=SIMPLE_FRAME_SYNC_WORD, bool extended=false,
+        int frame_check=SIMPLE_FRAME_CHECK_FLETCHER);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
        */
-      static sptr make();
+      virtual void reset_state() = 0;
     };
 
   } // namespace scratch_radio
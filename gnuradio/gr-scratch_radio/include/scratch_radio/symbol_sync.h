@@ -45,8 +45,24 @@ namespace gr {
        * constructor is in a private implementation
        * class. scratch_radio::symbol_sync::make is the public interface for
        * creating new instances.
+       *
+       * \param baud_rate The expected symbol rate.
+       * \param sample_rate The input sample rate.
+       * \param packed Generate a packed bit stream with eight bits per
+       *        output item, least significant bit first.
+       */
+      static sptr make(int baud_rate, int sample_rate, bool packed=false);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
+       */
+      virtual void reset_state() = 0;
+
+      /*!
+       * \brief Change the expected symbol rate.
        */
-      static sptr make(int baud_rate, int sample_rate);
+      virtual void set_baud_rate(int baud_rate) = 0;
     };
 
   } // namespace scratch_radio
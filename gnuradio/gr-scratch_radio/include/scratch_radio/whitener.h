@@ -0,0 +1,69 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_WHITENER_H
+#define INCLUDED_SCRATCH_RADIO_WHITENER_H
+
+#include <scratch_radio/api.h>
+#include <gnuradio/sync_block.h>
+
+namespace gr {
+  namespace scratch_radio {
+
+    /*!
+     * \brief Self synchronising data whitener for NRZ line coding.
+     * \ingroup scratch_radio
+     *
+     * Scrambles the bit stream using the polynomial x^17 + x^12 + 1,
+     * so that long runs of identical bits are broken up without the
+     * bandwidth cost of Manchester encoding. Idle bits are passed
+     * through without changing the scrambler state.
+     */
+    class SCRATCH_RADIO_API whitener : virtual public gr::sync_block
+    {
+     public:
+      typedef boost::shared_ptr<whitener> sptr;
+
+      /*!
+       * \brief Return a shared_ptr to a new instance of scratch_radio::whitener.
+       *
+       * To avoid accidental use of raw pointers, scratch_radio::whitener's
+       * constructor is in a private implementation
+       * class. scratch_radio::whitener::make is the public interface for
+       * creating new instances.
+       *
+       * \param packed Use packed bit streams with eight bits per item,
+       *        least significant bit first. Idle bytes marked with an
+       *        'idle' tag are passed through unchanged.
+       */
+      static sptr make(bool packed=false);
+
+      /*!
+       * \brief Discard any internal state, returning the block to the
+       * condition it was in immediately after construction.
+       */
+      virtual void reset_state() = 0;
+    };
+
+  } // namespace scratch_radio
+} // namespace gr
+
+#endif /* INCLUDED_SCRATCH_RADIO_WHITENER_H */
+
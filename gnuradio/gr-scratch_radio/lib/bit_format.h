@@ -0,0 +1,41 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_BIT_FORMAT_H
+#define INCLUDED_SCRATCH_RADIO_BIT_FORMAT_H
+
+/*
+ * Unpacked bit streams carry one bit per byte, with the value 0xFF
+ * used to mark idle bits. Packed bit streams carry eight bits per
+ * byte, least significant bit first, with idle bytes marked by a
+ * stream tag using the idle tag key.
+ */
+#define IDLE_BIT 0xFF
+#define IDLE_TAG_KEY "idle"
+
+/*
+ * In burst transmit mode, idle bits generate no output samples and
+ * each burst of modulated samples is delimited by stream tags on its
+ * first and last samples.
+ */
+#define TX_SOB_TAG_KEY "tx_sob"
+#define TX_EOB_TAG_KEY "tx_eob"
+
+#endif /* INCLUDED_SCRATCH_RADIO_BIT_FORMAT_H */
@@ -0,0 +1,93 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include <gnuradio/io_signature.h>
+#include "bit_packer_impl.h"
+#include "bit_format.h"
+
+namespace gr {
+  namespace scratch_radio {
+
+    bit_packer::sptr
+    bit_packer::make()
+    {
+      return gnuradio::get_initial_sptr
+        (new bit_packer_impl());
+    }
+
+    /*
+     * The private constructor
+     */
+    bit_packer_impl::bit_packer_impl()
+      : gr::sync_decimator("bit_packer",
+              gr::io_signature::make(1, 1, sizeof(uint8_t)),
+              gr::io_signature::make(1, 1, sizeof(uint8_t)), 8)
+    {
+      d_idle_tag_key = pmt::intern(IDLE_TAG_KEY);
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    bit_packer_impl::~bit_packer_impl()
+    {
+    }
+
+    int
+    bit_packer_impl::work(int noutput_items,
+        gr_vector_const_void_star &input_items,
+        gr_vector_void_star &output_items)
+    {
+      const uint8_t* in = (const uint8_t*) input_items[0];
+      uint8_t* out = (uint8_t*) output_items[0];
+      uint64_t out_offset = nitems_written(0);
+
+      for (int i = 0; i < noutput_items; i++) {
+        uint8_t byte_data = 0;
+        bool idle = false;
+
+        // Pack the input bits, least significant bit first. Any idle
+        // bits mark the entire output byte as idle.
+        for (int j = 0; j < 8; j++) {
+          uint8_t this_bit = in[8*i+j];
+          if (this_bit == IDLE_BIT)
+            idle = true;
+          else if (this_bit != 0)
+            byte_data |= 1 << j;
+        }
+        if (idle) {
+          out[i] = 0x00;
+          add_item_tag(0, out_offset + i, d_idle_tag_key, pmt::PMT_T);
+        } else {
+          out[i] = byte_data;
+        }
+      }
+
+      // Tell runtime system how many output items we produced.
+      return noutput_items;
+    }
+
+  } /* namespace scratch_radio */
+} /* namespace gr */
+
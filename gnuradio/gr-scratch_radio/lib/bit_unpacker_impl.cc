@@ -0,0 +1,92 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include <gnuradio/io_signature.h>
+#include "bit_unpacker_impl.h"
+#include "bit_format.h"
+
+namespace gr {
+  namespace scratch_radio {
+
+    bit_unpacker::sptr
+    bit_unpacker::make()
+    {
+      return gnuradio::get_initial_sptr
+        (new bit_unpacker_impl());
+    }
+
+    /*
+     * The private constructor
+     */
+    bit_unpacker_impl::bit_unpacker_impl()
+      : gr::sync_interpolator("bit_unpacker",
+              gr::io_signature::make(1, 1, sizeof(uint8_t)),
+              gr::io_signature::make(1, 1, sizeof(uint8_t)), 8)
+    {
+      d_idle_tag_key = pmt::intern(IDLE_TAG_KEY);
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    bit_unpacker_impl::~bit_unpacker_impl()
+    {
+    }
+
+    int
+    bit_unpacker_impl::work(int noutput_items,
+        gr_vector_const_void_star &input_items,
+        gr_vector_void_star &output_items)
+    {
+      const uint8_t* in = (const uint8_t*) input_items[0];
+      uint8_t* out = (uint8_t*) output_items[0];
+      std::vector<tag_t> idle_tags;
+      uint64_t in_offset = nitems_read(0);
+      int ninput_items = noutput_items / 8;
+
+      // Expand each input byte, least significant bit first.
+      for (int i = 0; i < ninput_items; i++) {
+        uint8_t byte_data = in[i];
+        for (int j = 0; j < 8; j++) {
+          out[8*i+j] = byte_data & 1;
+          byte_data >>= 1;
+        }
+      }
+
+      // Replace tagged idle bytes with idle bits.
+      get_tags_in_range(idle_tags, 0, in_offset, in_offset + ninput_items, d_idle_tag_key);
+      for (size_t t = 0; t < idle_tags.size(); t++) {
+        int idle_i = (int) (idle_tags[t].offset - in_offset);
+        for (int j = 0; j < 8; j++) {
+          out[8*idle_i+j] = IDLE_BIT;
+        }
+      }
+
+      // Tell runtime system how many output items we produced.
+      return 8 * ninput_items;
+    }
+
+  } /* namespace scratch_radio */
+} /* namespace gr */
+
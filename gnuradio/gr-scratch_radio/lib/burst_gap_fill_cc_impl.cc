@@ -0,0 +1,155 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include <ctime>
+#include <cstring>
+#include <algorithm>
+#include <boost/thread/thread.hpp>
+#include <gnuradio/io_signature.h>
+#include "burst_gap_fill_cc_impl.h"
+#include "bit_format.h"
+
+namespace gr {
+  namespace scratch_radio {
+
+    burst_gap_fill_cc::sptr
+    burst_gap_fill_cc::make(int sample_rate)
+    {
+      return gnuradio::get_initial_sptr
+        (new burst_gap_fill_cc_impl(sample_rate));
+    }
+
+    /*
+     * The private constructor
+     */
+    burst_gap_fill_cc_impl::burst_gap_fill_cc_impl(int sample_rate)
+      : gr::block("burst_gap_fill_cc",
+              gr::io_signature::make(1, 1, sizeof(gr_complex)),
+              gr::io_signature::make(1, 1, sizeof(gr_complex)))
+    {
+      d_sample_rate = sample_rate;
+      d_in_burst = false;
+      d_first_call = true;
+      d_start_time = 0;
+      d_sample_count = 0;
+      d_sob_tag_key = pmt::intern(TX_SOB_TAG_KEY);
+      d_eob_tag_key = pmt::intern(TX_EOB_TAG_KEY);
+
+      // Tags are copied explicitly, since input items do not map to
+      // fixed output item offsets.
+      set_tag_propagation_policy(TPP_DONT);
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    burst_gap_fill_cc_impl::~burst_gap_fill_cc_impl()
+    {
+    }
+
+    /*
+     * Input is only required during a burst. Between bursts the output
+     * is generated without waiting for input.
+     */
+    void
+    burst_gap_fill_cc_impl::forecast (int noutput_items, gr_vector_int &ninput_items_required)
+    {
+      ninput_items_required[0] = d_in_burst ? 1 : 0;
+    }
+
+    int64_t
+    burst_gap_fill_cc_impl::m_get_time_now()
+    {
+      struct timespec ts_now;
+      clock_gettime (CLOCK_MONOTONIC, &ts_now);
+      return (int64_t) ts_now.tv_sec * 1000000000 + ts_now.tv_nsec;
+    }
+
+    int
+    burst_gap_fill_cc_impl::general_work (int noutput_items,
+                       gr_vector_int &ninput_items,
+                       gr_vector_const_void_star &input_items,
+                       gr_vector_void_star &output_items)
+    {
+      const gr_complex *in = (const gr_complex *) input_items[0];
+      gr_complex *out = (gr_complex *) output_items[0];
+      int64_t now = m_get_time_now();
+
+      if (d_first_call) {
+        d_first_call = false;
+        d_start_time = now;
+      }
+
+      // Pass through any available input samples, copying the tags and
+      // tracking the start and end of each burst.
+      if (ninput_items[0] > 0) {
+        int count = std::min (noutput_items, ninput_items[0]);
+        std::vector<tag_t> tags;
+        uint64_t in_offset = nitems_read(0);
+        uint64_t out_offset = nitems_written(0);
+        memcpy (out, in, count * sizeof(gr_complex));
+        get_tags_in_range(tags, 0, in_offset, in_offset + count);
+        std::sort (tags.begin(), tags.end(), tag_t::offset_compare);
+        for (size_t t = 0; t < tags.size(); t++) {
+          if (pmt::eq (tags[t].key, d_sob_tag_key)) {
+            d_in_burst = true;
+          } else if (pmt::eq (tags[t].key, d_eob_tag_key)) {
+            d_in_burst = false;
+          }
+          add_item_tag(0, tags[t].offset - in_offset + out_offset,
+            tags[t].key, tags[t].value, tags[t].srcid);
+        }
+        d_sample_count += count;
+        consume_each (count);
+        return count;
+      }
+
+      // Wait for the rest of a burst which has been delayed upstream.
+      if (d_in_burst) {
+        return 0;
+      }
+
+      // Between bursts, zero valued samples are inserted to make up the
+      // number of samples due at the nominal sample rate. The block
+      // thread sleeps until at least one insertion interval is due, so
+      // a new burst is passed through with at most this latency.
+      int64_t min_count = (int64_t) GAP_FILL_INTERVAL * d_sample_rate / 1000;
+      int64_t due_count = (now - d_start_time) * d_sample_rate / 1000000000 - d_sample_count;
+      if (due_count < min_count) {
+        int64_t wait_us = (min_count - due_count) * 1000000 / d_sample_rate;
+        boost::this_thread::sleep (boost::posix_time::microseconds (wait_us + 1));
+        now = m_get_time_now();
+        due_count = (now - d_start_time) * d_sample_rate / 1000000000 - d_sample_count;
+      }
+      int count = (int) std::min ((int64_t) noutput_items, std::max ((int64_t) 0, due_count));
+      std::fill (out, out + count, gr_complex (0.0, 0.0));
+      d_sample_count += count;
+
+      // Tell runtime system how many output items we produced.
+      return count;
+    }
+
+  } /* namespace scratch_radio */
+} /* namespace gr */
+
@@ -0,0 +1,63 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_BURST_GAP_FILL_CC_IMPL_H
+#define INCLUDED_SCRATCH_RADIO_BURST_GAP_FILL_CC_IMPL_H
+
+#include <scratch_radio/burst_gap_fill_cc.h>
+
+// The interval between insertions of zero valued samples, in
+// milliseconds.
+#define GAP_FILL_INTERVAL 10
+
+namespace gr {
+  namespace scratch_radio {
+
+    class burst_gap_fill_cc_impl : public burst_gap_fill_cc
+    {
+     private:
+      int d_sample_rate;
+      bool d_in_burst;
+      bool d_first_call;
+      int64_t d_start_time;
+      int64_t d_sample_count;
+      pmt::pmt_t d_sob_tag_key;
+      pmt::pmt_t d_eob_tag_key;
+
+      int64_t m_get_time_now();
+
+     public:
+      burst_gap_fill_cc_impl(int sample_rate);
+      ~burst_gap_fill_cc_impl();
+
+      // Where all the action really happens
+      void forecast (int noutput_items, gr_vector_int &ninput_items_required);
+
+      int general_work(int noutput_items,
+           gr_vector_int &ninput_items,
+           gr_vector_const_void_star &input_items,
+           gr_vector_void_star &output_items);
+    };
+
+  } // namespace scratch_radio
+} // namespace gr
+
+#endif /* INCLUDED_SCRATCH_RADIO_BURST_GAP_FILL_CC_IMPL_H */
+
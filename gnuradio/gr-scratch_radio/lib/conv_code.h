@@ -0,0 +1,51 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_CONV_CODE_H
+#define INCLUDED_SCRATCH_RADIO_CONV_CODE_H
+
+#include <stdint.h>
+
+/*
+ * The rate 1/2 constraint length 7 convolutional code with generator
+ * polynomials 171 and 133 octal. The encoder shift register holds the
+ * most recent input bit in the least significant bit position, so the
+ * polynomials are given here in bit reversed form. Each input bit maps
+ * to a pair of code bits, with the first generator output sent first.
+ */
+#define CONV_CODE_POLY_A 0x4F
+#define CONV_CODE_POLY_B 0x6D
+#define CONV_CODE_REG_MASK 0x7F
+#define CONV_CODE_STATES 64
+
+/*
+ * Gets the pair of code bits generated for the specified encoder
+ * shift register contents. The first code bit is held in the least
+ * significant bit position.
+ */
+static inline uint8_t
+conv_code_symbol (int shift_reg)
+{
+  return __builtin_parity (shift_reg & CONV_CODE_POLY_A) |
+    (__builtin_parity (shift_reg & CONV_CODE_POLY_B) << 1);
+}
+
+#endif /* INCLUDED_SCRATCH_RADIO_CONV_CODE_H */
+
@@ -0,0 +1,268 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include <gnuradio/io_signature.h>
+#include "conv_dec_impl.h"
+
+// The number of code bit pairs processed before each decoded bit is
+// determined. This is about seven times the code constraint length,
+// which is sufficient for the surviving paths to converge.
+#define TRACEBACK_DEPTH 48
+
+namespace gr {
+  namespace scratch_radio {
+
+    conv_dec::sptr
+    conv_dec::make(bool packed)
+    {
+      return gnuradio::get_initial_sptr
+        (new conv_dec_impl(packed));
+    }
+
+    /*
+     * The private constructor
+     */
+    conv_dec_impl::conv_dec_impl(bool packed)
+      : gr::block("conv_dec",
+              gr::io_signature::make(1, 1, sizeof(uint8_t)),
+              gr::io_signature::make(1, 1, sizeof(uint8_t)))
+    {
+      d_packed = packed;
+      for (int symbol = 0; symbol < 4; symbol++) {
+        for (int i = 0; i < 128; i++) {
+          d_branch_metrics[symbol][i] =
+            __builtin_popcount (conv_code_symbol(i) ^ symbol);
+        }
+      }
+      reset_state();
+      set_output_multiple(packed ? 1 : 8);
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    conv_dec_impl::~conv_dec_impl()
+    {
+    }
+
+    void
+    conv_dec_impl::forecast (int noutput_items, gr_vector_int &ninput_items_required)
+    {
+      ninput_items_required[0] = noutput_items * 2;
+    }
+
+    void
+    conv_dec_impl::reset_state()
+    {
+      d_last_chip = 0;
+      d_chip_parity = 0;
+      d_active_phase = 0;
+      d_step_index = 0;
+      d_pending_steps = 0;
+      d_error_index = 0;
+      for (int phase = 0; phase < 2; phase++) {
+        for (int i = 0; i < CONV_CODE_STATES; i++) {
+          d_path_metrics[phase][i] = 0;
+        }
+        for (int i = 0; i < ERROR_HISTORY_LEN; i++) {
+          d_errors[phase][i] = 0;
+        }
+        d_best_state[phase] = 0;
+        d_error_count[phase] = 0;
+      }
+    }
+
+    /*
+     * Perform the Viterbi add-compare-select step for a received pair
+     * of code bits. The decoder state is the most recent six data
+     * bits, so each state has two predecessors which differ in the
+     * oldest bit. The selected predecessor for each state is recorded
+     * in the decision history. The selection is branch free, since
+     * the decisions are unpredictable for noisy input.
+     */
+    void
+    conv_dec_impl::m_decode_symbol(int phase, int symbol)
+    {
+      const int* metrics = d_path_metrics[phase];
+      const uint8_t* branch_metrics = d_branch_metrics[symbol];
+      int new_metrics[CONV_CODE_STATES];
+      uint64_t decisions = 0;
+      for (int state = 0; state < CONV_CODE_STATES; state++) {
+        int prev_state = state >> 1;
+        int metric_0 = metrics[prev_state] + branch_metrics[state];
+        int metric_1 = metrics[prev_state + CONV_CODE_STATES/2] +
+          branch_metrics[state + CONV_CODE_STATES];
+        int delta = metric_1 - metric_0;
+        int decision = ((uint32_t) delta) >> 31;
+        new_metrics[state] = metric_0 + (delta & -decision);
+        decisions |= ((uint64_t) decision) << state;
+      }
+      for (int state = 0; state < CONV_CODE_STATES; state++) {
+        d_path_metrics[phase][state] = new_metrics[state];
+      }
+      d_decisions[phase][d_step_index] = decisions;
+    }
+
+    /*
+     * Subtract the best path metric from all the path metrics. Since
+     * the metrics were last normalised, the best path metric has
+     * increased by the number of bit errors on the best path, which is
+     * added to the error history.
+     */
+    void
+    conv_dec_impl::m_normalise_metrics(int phase)
+    {
+      int* metrics = d_path_metrics[phase];
+      int best_state = 0;
+      for (int state = 1; state < CONV_CODE_STATES; state++) {
+        if (metrics[state] < metrics[best_state]) {
+          best_state = state;
+        }
+      }
+      int bit_errors = metrics[best_state];
+      for (int state = 0; state < CONV_CODE_STATES; state++) {
+        metrics[state] -= bit_errors;
+      }
+      d_best_state[phase] = best_state;
+      d_error_count[phase] += bit_errors - d_errors[phase][d_error_index];
+      d_errors[phase][d_error_index] = bit_errors;
+    }
+
+    /*
+     * Trace back through the decision history from the current best
+     * state. The oldest eight decoded bits are returned as a packed
+     * byte, least significant bit first.
+     */
+    uint8_t
+    conv_dec_impl::m_traceback(int phase)
+    {
+      const uint64_t* decisions = d_decisions[phase];
+      int state = d_best_state[phase];
+      int step_index = d_step_index;
+      uint8_t byte_data = 0;
+      for (int i = 0; i < TRACEBACK_DEPTH + 8; i++) {
+        step_index = (step_index + DECISION_HISTORY_LEN - 1) % DECISION_HISTORY_LEN;
+        if (i >= TRACEBACK_DEPTH) {
+          byte_data |= (state & 1) << (TRACEBACK_DEPTH + 7 - i);
+        }
+        int decision = (decisions[step_index] >> state) & 1;
+        state = (state >> 1) | (decision * CONV_CODE_STATES/2);
+      }
+      return byte_data;
+    }
+
+    /*
+     * Process a single input chip, returning true and setting the
+     * output byte if eight data bits were decoded. Chip pairs which
+     * start on odd chips are decoded by the second decoder and are
+     * always completed one chip before the pairs starting on even
+     * chips, which are decoded by the first decoder. Both decoders
+     * therefore hold the same number of decoded bits after each even
+     * chip pair, when the output may be switched between them.
+     */
+    bool
+    conv_dec_impl::m_decode_chip(uint8_t chip, uint8_t* output_byte)
+    {
+      int symbol = d_last_chip | (chip << 1);
+      d_last_chip = chip;
+      d_chip_parity ^= 1;
+      if (d_chip_parity == 1) {
+        m_decode_symbol(1, symbol);
+        return false;
+      }
+      m_decode_symbol(0, symbol);
+      d_step_index = (d_step_index + 1) % DECISION_HISTORY_LEN;
+      d_pending_steps += 1;
+      if ((d_pending_steps % 8) != 0) {
+        return false;
+      }
+
+      // Update the error history for both decoders every eight steps.
+      // The output is switched to the other decoder if it has less than
+      // half as many recent errors, so that it does not switch randomly
+      // when both decoders are processing noise between frames.
+      m_normalise_metrics(0);
+      m_normalise_metrics(1);
+      d_error_index = (d_error_index + 1) % ERROR_HISTORY_LEN;
+      if (2 * d_error_count[d_active_phase ^ 1] < d_error_count[d_active_phase]) {
+        d_active_phase ^= 1;
+      }
+
+      // Generate an output byte once the traceback depth is reached.
+      if (d_pending_steps < TRACEBACK_DEPTH + 8) {
+        return false;
+      }
+      *output_byte = m_traceback(d_active_phase);
+      d_pending_steps -= 8;
+      return true;
+    }
+
+    int
+    conv_dec_impl::general_work (int noutput_items,
+                       gr_vector_int &ninput_items,
+                       gr_vector_const_void_star &input_items,
+                       gr_vector_void_star &output_items)
+    {
+      const uint8_t *in = (const uint8_t *) input_items[0];
+      uint8_t *out = (uint8_t *) output_items[0];
+      int in_i = 0;
+      int out_i = 0;
+      uint8_t output_byte;
+
+      // In packed mode each input byte holds four chip pairs, so at
+      // most one output byte can be completed per input byte.
+      if (d_packed) {
+        while ((in_i < ninput_items[0]) && (out_i < noutput_items)) {
+          uint8_t input_byte = in[in_i++];
+          for (int i = 0; i < 8; i++) {
+            if (m_decode_chip ((input_byte >> i) & 1, &output_byte)) {
+              out[out_i++] = output_byte;
+            }
+          }
+        }
+      }
+
+      // In unpacked mode each input byte holds a single chip and the
+      // decoded bits are output eight at a time.
+      else {
+        while ((in_i < ninput_items[0]) && (out_i <= noutput_items - 8)) {
+          if (m_decode_chip ((in[in_i++] != 0) ? 1 : 0, &output_byte)) {
+            for (int i = 0; i < 8; i++) {
+              out[out_i++] = (output_byte >> i) & 1;
+            }
+          }
+        }
+      }
+
+      // Tell runtime system how many input items we consumed on
+      // each input stream.
+      consume_each (in_i);
+
+      // Tell runtime system how many output items we produced.
+      return out_i;
+    }
+
+  } /* namespace scratch_radio */
+} /* namespace gr */
+
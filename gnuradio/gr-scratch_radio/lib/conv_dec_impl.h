@@ -0,0 +1,78 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_CONV_DEC_IMPL_H
+#define INCLUDED_SCRATCH_RADIO_CONV_DEC_IMPL_H
+
+#include <scratch_radio/conv_dec.h>
+#include "conv_code.h"
+
+// The Viterbi decoder retains the path decisions for the most recent
+// 64 code bit pairs, which covers the traceback depth plus one output
+// byte. The error history used for alignment selection covers four
+// output bytes.
+#define DECISION_HISTORY_LEN 64
+#define ERROR_HISTORY_LEN 4
+
+namespace gr {
+  namespace scratch_radio {
+
+    class conv_dec_impl : public conv_dec
+    {
+     private:
+      bool d_packed;
+      uint8_t d_branch_metrics[4][128];
+      uint8_t d_last_chip;
+      int d_chip_parity;
+      int d_active_phase;
+      int d_step_index;
+      int d_pending_steps;
+      int d_error_index;
+      int d_path_metrics[2][CONV_CODE_STATES];
+      uint64_t d_decisions[2][DECISION_HISTORY_LEN];
+      int d_best_state[2];
+      int d_errors[2][ERROR_HISTORY_LEN];
+      int d_error_count[2];
+
+      void m_decode_symbol(int phase, int symbol);
+      void m_normalise_metrics(int phase);
+      uint8_t m_traceback(int phase);
+      bool m_decode_chip(uint8_t chip, uint8_t* output_byte);
+
+     public:
+      conv_dec_impl(bool packed);
+      ~conv_dec_impl();
+
+      void reset_state();
+
+      // Where all the action really happens
+      void forecast (int noutput_items, gr_vector_int &ninput_items_required);
+
+      int general_work(int noutput_items,
+           gr_vector_int &ninput_items,
+           gr_vector_const_void_star &input_items,
+           gr_vector_void_star &output_items);
+    };
+
+  } // namespace scratch_radio
+} // namespace gr
+
+#endif /* INCLUDED_SCRATCH_RADIO_CONV_DEC_IMPL_H */
+
@@ -0,0 +1,174 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include <gnuradio/io_signature.h>
+#include "conv_enc_impl.h"
+#include "conv_code.h"
+#include "bit_format.h"
+
+// The number of zero bits used to flush the encoder at the end of each
+// frame. This must be at least the encoder memory of six bits.
+#define FLUSH_BITS 8
+
+namespace gr {
+  namespace scratch_radio {
+
+    conv_enc::sptr
+    conv_enc::make(bool packed)
+    {
+      return gnuradio::get_initial_sptr
+        (new conv_enc_impl(packed));
+    }
+
+    /*
+     * The private constructor
+     */
+    conv_enc_impl::conv_enc_impl(bool packed)
+      : gr::sync_interpolator("conv_enc",
+              gr::io_signature::make(1, 1, sizeof(uint8_t)),
+              gr::io_signature::make(1, 1, sizeof(uint8_t)), 2)
+    {
+      d_packed = packed;
+      d_idle_tag_key = pmt::intern(IDLE_TAG_KEY);
+      for (int i = 0; i < 128; i++) {
+        d_symbol_table[i] = conv_code_symbol(i);
+      }
+
+      // Idle tags are generated explicitly, since the flush bytes
+      // at the end of each frame are not idle.
+      set_tag_propagation_policy(TPP_DONT);
+      reset_state();
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    conv_enc_impl::~conv_enc_impl()
+    {
+    }
+
+    void
+    conv_enc_impl::reset_state()
+    {
+      d_shift_reg = 0;
+      d_flush_count = 0;
+    }
+
+    /*
+     * Encode a single data bit, returning the pair of code bits with
+     * the first code bit in the least significant bit position.
+     */
+    uint8_t
+    conv_enc_impl::m_encode_bit(uint8_t bit_data)
+    {
+      d_shift_reg = ((d_shift_reg << 1) | bit_data) & CONV_CODE_REG_MASK;
+      return d_symbol_table[d_shift_reg];
+    }
+
+    /*
+     * Encode a packed data byte, least significant bit first, returning
+     * the sixteen code bits in transmit order.
+     */
+    uint16_t
+    conv_enc_impl::m_encode_byte(uint8_t byte_data)
+    {
+      uint16_t code_bits = 0;
+      for (int i = 0; i < 8; i++) {
+        code_bits |= m_encode_bit((byte_data >> i) & 1) << (2 * i);
+      }
+      return code_bits;
+    }
+
+    int
+    conv_enc_impl::work(int noutput_items,
+        gr_vector_const_void_star &input_items,
+        gr_vector_void_star &output_items)
+    {
+      // Specify buffer data types.
+      const uint8_t* in = (const uint8_t*) input_items[0];
+      uint8_t* out = (uint8_t*) output_items[0];
+      int i;
+
+      // Encode packed data bytes. Idle bytes are replaced by two zero
+      // valued bytes which are both marked using the idle tag, unless
+      // they are used to flush the encoder.
+      if (d_packed) {
+        std::vector<tag_t> idle_tags;
+        uint64_t in_offset = nitems_read(0);
+        uint64_t out_offset = nitems_written(0);
+        int in_count = noutput_items/2;
+        std::vector<bool> idle_flags(in_count, false);
+        get_tags_in_range(idle_tags, 0, in_offset, in_offset + in_count, d_idle_tag_key);
+        for (size_t t = 0; t < idle_tags.size(); t++) {
+          idle_flags[idle_tags[t].offset - in_offset] = true;
+        }
+        for (i = 0; i < in_count; i++) {
+          uint16_t code_bits;
+          if (!idle_flags[i]) {
+            code_bits = m_encode_byte(in[i]);
+            d_flush_count = FLUSH_BITS;
+          }
+          else if (d_flush_count > 0) {
+            code_bits = m_encode_byte(0x00);
+            d_flush_count = 0;
+          }
+          else {
+            code_bits = 0;
+            add_item_tag(0, out_offset + 2*i, d_idle_tag_key, pmt::PMT_T);
+            add_item_tag(0, out_offset + 2*i+1, d_idle_tag_key, pmt::PMT_T);
+          }
+          out[2*i]   = (uint8_t) code_bits;
+          out[2*i+1] = (uint8_t) (code_bits >> 8);
+        }
+        return 2 * i;
+      }
+
+      // Encode unpacked data bits, inserting idle bits once the encoder
+      // has been flushed.
+      for (i = 0; i < noutput_items/2; i++) {
+        uint8_t bit_data = 0;
+        if (in[i] != IDLE_BIT) {
+          bit_data = (in[i] > 0) ? 1 : 0;
+          d_flush_count = FLUSH_BITS;
+        }
+        else if (d_flush_count > 0) {
+          d_flush_count -= 1;
+        }
+        else {
+          out[2*i]   = IDLE_BIT;
+          out[2*i+1] = IDLE_BIT;
+          continue;
+        }
+        uint8_t code_bits = m_encode_bit(bit_data);
+        out[2*i]   = code_bits & 1;
+        out[2*i+1] = code_bits >> 1;
+      }
+
+      // Tell runtime system how many output items we produced.
+      return 2 * i;
+    }
+
+  } /* namespace scratch_radio */
+} /* namespace gr */
+
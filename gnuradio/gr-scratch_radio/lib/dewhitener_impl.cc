@@ -0,0 +1,94 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include <gnuradio/io_signature.h>
+#include "dewhitener_impl.h"
+#include "whitening.h"
+
+namespace gr {
+  namespace scratch_radio {
+
+    dewhitener::sptr
+    dewhitener::make(bool packed)
+    {
+      return gnuradio::get_initial_sptr
+        (new dewhitener_impl(packed));
+    }
+
+    /*
+     * The private constructor
+     */
+    dewhitener_impl::dewhitener_impl(bool packed)
+      : gr::sync_block("dewhitener",
+              gr::io_signature::make(1, 1, sizeof(uint8_t)),
+              gr::io_signature::make(1, 1, sizeof(uint8_t)))
+    {
+      d_packed = packed;
+      reset_state();
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    dewhitener_impl::~dewhitener_impl()
+    {
+    }
+
+    void
+    dewhitener_impl::reset_state()
+    {
+      d_history = 0;
+    }
+
+    int
+    dewhitener_impl::work(int noutput_items,
+        gr_vector_const_void_star &input_items,
+        gr_vector_void_star &output_items)
+    {
+      const uint8_t* in = (const uint8_t*) input_items[0];
+      uint8_t* out = (uint8_t*) output_items[0];
+
+      // The history holds the received scrambled bits, so the
+      // dewhitener is synchronised once the history has been filled.
+      if (d_packed) {
+        for (int i = 0; i < noutput_items; i++) {
+          out[i] = in[i] ^ whitening_sequence(d_history);
+          d_history = (d_history >> 8) | ((uint32_t) in[i] << 24);
+        }
+      }
+      else {
+        for (int i = 0; i < noutput_items; i++) {
+          uint8_t bit_data = (in[i] != 0) ? 1 : 0;
+          out[i] = bit_data ^ (whitening_sequence(d_history) & 1);
+          d_history = (d_history >> 1) | ((uint32_t) bit_data << 31);
+        }
+      }
+
+      // Tell runtime system how many output items we produced.
+      return noutput_items;
+    }
+
+  } /* namespace scratch_radio */
+} /* namespace gr */
+
@@ -0,0 +1,206 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include <stdexcept>
+#include "frame_check.h"
+
+// CRC-16/X-25 as used for HDLC and AX.25 frames and CRC-32 as used
+// for Ethernet frames. Both are bit reversed CRCs, which match the
+// least significant bit first transmission order.
+#define CRC16_POLY 0x8408
+#define CRC16_INIT 0xFFFF
+#define CRC16_XOROUT 0xFFFF
+#define CRC32_POLY 0xEDB88320
+#define CRC32_INIT 0xFFFFFFFF
+#define CRC32_XOROUT 0xFFFFFFFF
+
+namespace gr {
+  namespace scratch_radio {
+
+    /*
+     * Lookup tables for 'slice by eight' CRC calculation. The first
+     * table gives the conventional byte at a time CRC update, and each
+     * subsequent table advances the CRC over an additional zero byte,
+     * so that eight input bytes can be processed using eight
+     * independent table lookups. The tables are built when the library
+     * is loaded.
+     */
+    static uint32_t crc16_table[8][256];
+    static uint32_t crc32_table[8][256];
+
+    static void
+    build_crc_table(uint32_t table[8][256], uint32_t poly)
+    {
+      for (int i = 0; i < 256; i++) {
+        uint32_t crc = i;
+        for (int j = 0; j < 8; j++) {
+          crc = (crc >> 1) ^ ((crc & 1) ? poly : 0);
+        }
+        table[0][i] = crc;
+      }
+      for (int k = 1; k < 8; k++) {
+        for (int i = 0; i < 256; i++) {
+          uint32_t crc = table[k-1][i];
+          table[k][i] = (crc >> 8) ^ table[0][crc & 0xFF];
+        }
+      }
+    }
+
+    static struct crc_table_builder
+    {
+      crc_table_builder()
+      {
+        build_crc_table(crc16_table, CRC16_POLY);
+        build_crc_table(crc32_table, CRC32_POLY);
+      }
+    } crc_tables;
+
+    static uint32_t
+    crc_update(uint32_t table[8][256], uint32_t crc, const uint8_t* data, int length)
+    {
+      while (length >= 8) {
+        uint32_t lo = crc ^ (data[0] | (data[1] << 8) |
+          (data[2] << 16) | ((uint32_t) data[3] << 24));
+        uint32_t hi = data[4] | (data[5] << 8) |
+          (data[6] << 16) | ((uint32_t) data[7] << 24);
+        crc = table[7][lo & 0xFF] ^ table[6][(lo >> 8) & 0xFF] ^
+          table[5][(lo >> 16) & 0xFF] ^ table[4][lo >> 24] ^
+          table[3][hi & 0xFF] ^ table[2][(hi >> 8) & 0xFF] ^
+          table[1][(hi >> 16) & 0xFF] ^ table[0][hi >> 24];
+        data += 8;
+        length -= 8;
+      }
+      while (length-- > 0) {
+        crc = (crc >> 8) ^ table[0][(crc ^ *data++) & 0xFF];
+      }
+      return crc;
+    }
+
+    frame_check::frame_check(int check_type)
+    {
+      if ((check_type != SIMPLE_FRAME_CHECK_FLETCHER) &&
+          (check_type != SIMPLE_FRAME_CHECK_CRC16) &&
+          (check_type != SIMPLE_FRAME_CHECK_CRC32)) {
+        throw std::invalid_argument ("frame_check: unknown frame check type");
+      }
+      d_check_type = check_type;
+      reset();
+    }
+
+    frame_check::~frame_check()
+    {
+    }
+
+    /*
+     * Gets the number of check bytes appended to each frame.
+     */
+    int
+    frame_check::check_size()
+    {
+      return (d_check_type == SIMPLE_FRAME_CHECK_CRC32) ? 4 : 2;
+    }
+
+    void
+    frame_check::reset()
+    {
+      switch (d_check_type) {
+        case SIMPLE_FRAME_CHECK_CRC16 :
+          d_state_0 = CRC16_INIT;
+          break;
+        case SIMPLE_FRAME_CHECK_CRC32 :
+          d_state_0 = CRC32_INIT;
+          break;
+        default :
+          d_state_0 = 0;
+          break;
+      }
+      d_state_1 = 0;
+    }
+
+    void
+    frame_check::update(uint8_t byte_data)
+    {
+      switch (d_check_type) {
+        case SIMPLE_FRAME_CHECK_CRC16 :
+          d_state_0 = (d_state_0 >> 8) ^ crc16_table[0][(d_state_0 ^ byte_data) & 0xFF];
+          break;
+        case SIMPLE_FRAME_CHECK_CRC32 :
+          d_state_0 = (d_state_0 >> 8) ^ crc32_table[0][(d_state_0 ^ byte_data) & 0xFF];
+          break;
+        default :
+          d_state_0 += byte_data;
+          d_state_1 += d_state_0;
+          break;
+      }
+    }
+
+    /*
+     * Updates the check over a block of data. The Fletcher sums are
+     * reduced modulo 255 after each block so that the running totals
+     * can not overflow.
+     */
+    void
+    frame_check::update(const uint8_t* data, int length)
+    {
+      switch (d_check_type) {
+        case SIMPLE_FRAME_CHECK_CRC16 :
+          d_state_0 = crc_update(crc16_table, d_state_0, data, length);
+          break;
+        case SIMPLE_FRAME_CHECK_CRC32 :
+          d_state_0 = crc_update(crc32_table, d_state_0, data, length);
+          break;
+        default :
+          for (int i = 0; i < length; i++) {
+            d_state_0 += data[i];
+            d_state_1 += d_state_0;
+          }
+          d_state_0 %= 255;
+          d_state_1 %= 255;
+          break;
+      }
+    }
+
+    void
+    frame_check::get_check_bytes(uint8_t* check_bytes)
+    {
+      uint32_t check_value;
+      switch (d_check_type) {
+        case SIMPLE_FRAME_CHECK_CRC16 :
+          check_value = d_state_0 ^ CRC16_XOROUT;
+          break;
+        case SIMPLE_FRAME_CHECK_CRC32 :
+          check_value = d_state_0 ^ CRC32_XOROUT;
+          break;
+        default :
+          check_value = (d_state_0 % 255) | ((d_state_1 % 255) << 8);
+          break;
+      }
+      for (int i = 0; i < check_size(); i++) {
+        check_bytes[i] = (uint8_t) check_value;
+        check_value >>= 8;
+      }
+    }
+
+  } /* namespace scratch_radio */
+} /* namespace gr */
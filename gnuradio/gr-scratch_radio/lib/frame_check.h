@@ -0,0 +1,58 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_FRAME_CHECK_H
+#define INCLUDED_SCRATCH_RADIO_FRAME_CHECK_H
+
+#include <stdint.h>
+#include <scratch_radio/simple_frame_format.h>
+
+namespace gr {
+  namespace scratch_radio {
+
+    /*
+     * Implements the selectable frame integrity checks which are used
+     * by the simple framer and deframer. The check is calculated over
+     * the frame length field and payload, either one byte at a time or
+     * for a complete block of data. The check bytes are appended to
+     * the frame least significant byte first.
+     */
+    class frame_check
+    {
+     private:
+      int d_check_type;
+      uint32_t d_state_0;
+      uint32_t d_state_1;
+
+     public:
+      frame_check(int check_type);
+      ~frame_check();
+
+      int check_size();
+      void reset();
+      void update(uint8_t byte_data);
+      void update(const uint8_t* data, int length);
+      void get_check_bytes(uint8_t* check_bytes);
+    };
+
+  } // namespace scratch_radio
+} // namespace gr
+
+#endif /* INCLUDED_SCRATCH_RADIO_FRAME_CHECK_H */
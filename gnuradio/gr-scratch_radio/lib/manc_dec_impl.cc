@@ -29,24 +29,24 @@ namespace gr {
   namespace scratch_radio {
 
     manc_dec::sptr
-    manc_dec::make(bool invert)
+    manc_dec::make(bool invert, bool packed)
     {
       return gnuradio::get_initial_sptr
-        (new manc_dec_impl(invert));
+        (new manc_dec_impl(invert, packed));
     }
 
     /*
      * The private constructor
      */
-    manc_dec_impl::manc_dec_impl(bool invert)
+    manc_dec_impl::manc_dec_impl(bool invert, bool packed)
       : gr::block("manc_dec",
               gr::io_signature::make(1, 1, sizeof(uint8_t)),
               gr::io_signature::make(1, 1, sizeof(uint8_t)))
     {
       d_invert = invert;
-      d_out_of_sync = true;
-      d_do_decode = true;
-      d_start_bit = 0xFF;
+      d_packed = packed;
+      m_build_decode_table();
+      reset_state();
     }
 
     /*
@@ -62,6 +62,79 @@ namespace gr {
       ninput_items_required[0] = noutput_items * 2;
     }
 
+    void
+    manc_dec_impl::reset_state()
+    {
+      d_out_of_sync = true;
+      d_do_decode = true;
+      d_start_bit = 0xFF;
+      d_out_bits = 0;
+      d_out_bit_count = 0;
+    }
+
+    /*
+     * Build the table used to decode packed chip bytes which are
+     * aligned to chip pair boundaries. Each valid byte decodes to four
+     * data bits. Bytes containing invalid chip pairs are marked with -1.
+     */
+    void
+    manc_dec_impl::m_build_decode_table()
+    {
+      for (int i = 0; i < 256; i++) {
+        if (((i ^ (i >> 1)) & 0x55) != 0x55) {
+          d_decode_table[i] = -1;
+          continue;
+        }
+        int data_bits = 0;
+        for (int j = 0; j < 4; j++) {
+          int chip_pair = i >> (2 * j);
+          int data_bit = d_invert ? chip_pair & 1 : (chip_pair >> 1) & 1;
+          data_bits |= data_bit << j;
+        }
+        d_decode_table[i] = data_bits;
+      }
+    }
+
+    /*
+     * Process a single input chip, returning true and setting the
+     * output bit if a data bit was decoded.
+     */
+    bool
+    manc_dec_impl::m_decode_chip(uint8_t input_bit, uint8_t* output_bit)
+    {
+      // If the decoder is out of sync, search for a transition.
+      if (d_out_of_sync) {
+        if (d_start_bit == 0xFF) {
+          d_start_bit = input_bit;
+        }
+        else if (d_start_bit != input_bit) {
+          d_out_of_sync = false;
+          d_do_decode = false;
+        }
+      }
+
+      // Store the first bit of each coding pair.
+      else if (!d_do_decode) {
+        d_do_decode = true;
+        d_start_bit = input_bit;
+      }
+
+      // Slip the decoder on invalid bit pairs.
+      else if (d_start_bit == input_bit) {
+        d_out_of_sync = true;
+        d_start_bit = 0xFF;
+      }
+
+      // Generate the decoded bit. Default is to decode a rising edge
+      // as '1'.
+      else {
+        *output_bit = d_invert ? d_start_bit : input_bit;
+        d_do_decode = false;
+        return true;
+      }
+      return false;
+    }
+
     int
     manc_dec_impl::general_work (int noutput_items,
                        gr_vector_int &ninput_items,
@@ -73,42 +146,45 @@ namespace gr {
       int in_i = 0;
       int out_i = 0;
 
-      while ((in_i < ninput_items[0]) && (out_i < noutput_items)) {
-        uint8_t input_bit = in[in_i];
-        in_i += 1;
-
-        // If the decoder is out of sync, search for a transition.
-        if (d_out_of_sync) {
-          if (d_start_bit == 0xFF) {
-            d_start_bit = input_bit;
+      // In packed mode each input byte holds four chip pairs, so at
+      // most one output byte can be completed per input byte. Bytes
+      // which are aligned to chip pair boundaries are decoded using the
+      // lookup table, falling back to chip by chip decoding on errors.
+      if (d_packed) {
+        while ((in_i < ninput_items[0]) && (out_i < noutput_items)) {
+          uint8_t input_byte = in[in_i++];
+          int data_bits = -1;
+          if (!d_out_of_sync && !d_do_decode) {
+            data_bits = d_decode_table[input_byte];
           }
-          else if (d_start_bit != input_bit) {
-            d_out_of_sync = false;
-            d_do_decode = false;
+          if (data_bits >= 0) {
+            d_out_bits |= data_bits << d_out_bit_count;
+            d_out_bit_count += 4;
+          }
+          else {
+            for (int i = 0; i < 8; i++) {
+              uint8_t output_bit;
+              if (m_decode_chip ((input_byte >> i) & 1, &output_bit)) {
+                d_out_bits |= output_bit << d_out_bit_count;
+                d_out_bit_count += 1;
+              }
+            }
+          }
+          if (d_out_bit_count >= 8) {
+            out[out_i++] = (uint8_t) d_out_bits;
+            d_out_bits >>= 8;
+            d_out_bit_count -= 8;
           }
         }
+      }
 
-        // Store the first bit of each coding pair.
-        else if (!d_do_decode) {
-          d_do_decode = true;
-          d_start_bit = input_bit;
-        }
-
-        // Slip the decoder on invalid bit pairs.
-        else if (d_start_bit == input_bit) {
-          d_out_of_sync = true;
-          d_start_bit = 0xFF;
-        }
-
-        // Store the decoded bit to the output buffer. Default is to
-        // decode a rising edge as '1'.
-        else {
-          if (!d_invert)
-            out[out_i] = input_bit;
-          else
-            out[out_i] = d_start_bit;
-          d_do_decode = false;
-          out_i += 1;
+      // In unpacked mode each input byte holds a single chip.
+      else {
+        while ((in_i < ninput_items[0]) && (out_i < noutput_items)) {
+          uint8_t output_bit;
+          if (m_decode_chip (in[in_i++], &output_bit)) {
+            out[out_i++] = output_bit;
+          }
         }
       }
 
@@ -30,14 +30,23 @@ namespace gr {
     {
      private:
       bool d_invert;
+      bool d_packed;
       bool d_out_of_sync;
       bool d_do_decode;
       uint8_t d_start_bit;
+      uint16_t d_out_bits;
+      int d_out_bit_count;
+      int8_t d_decode_table[256];
+
+      void m_build_decode_table();
+      bool m_decode_chip(uint8_t input_bit, uint8_t* output_bit);
 
      public:
-      manc_dec_impl(bool invert);
+      manc_dec_impl(bool invert, bool packed);
       ~manc_dec_impl();
 
+      void reset_state();
+
       // Where all the action really happens
       void forecast (int noutput_items, gr_vector_int &ninput_items_required);
 
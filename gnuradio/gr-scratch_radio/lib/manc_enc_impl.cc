@@ -24,26 +24,30 @@
 
 #include <gnuradio/io_signature.h>
 #include "manc_enc_impl.h"
+#include "bit_format.h"
 
 namespace gr {
   namespace scratch_radio {
 
     manc_enc::sptr
-    manc_enc::make(bool invert)
+    manc_enc::make(bool invert, bool packed)
     {
       return gnuradio::get_initial_sptr
-        (new manc_enc_impl(invert));
+        (new manc_enc_impl(invert, packed));
     }
 
     /*
      * The private constructor
      */
-    manc_enc_impl::manc_enc_impl(bool invert)
+    manc_enc_impl::manc_enc_impl(bool invert, bool packed)
       : gr::sync_interpolator("manc_enc",
               gr::io_signature::make(1, 1, sizeof(uint8_t)),
               gr::io_signature::make(1, 1, sizeof(uint8_t)), 2)
     {
       d_invert = invert;
+      d_packed = packed;
+      d_idle_tag_key = pmt::intern(IDLE_TAG_KEY);
+      m_build_chip_table();
     }
 
     /*
@@ -53,6 +57,24 @@ namespace gr {
     {
     }
 
+    /*
+     * Build the table used to encode packed data bytes. Each input bit
+     * maps to a pair of output chips, least significant bit first.
+     */
+    void
+    manc_enc_impl::m_build_chip_table()
+    {
+      uint16_t one_chips = d_invert ? 1 : 2;
+      uint16_t zero_chips = d_invert ? 2 : 1;
+      for (int i = 0; i < 256; i++) {
+        uint16_t chips = 0;
+        for (int j = 0; j < 8; j++) {
+          chips |= (((i >> j) & 1) ? one_chips : zero_chips) << (2 * j);
+        }
+        d_chip_table[i] = chips;
+      }
+    }
+
     int
     manc_enc_impl::work(int noutput_items,
         gr_vector_const_void_star &input_items,
@@ -63,12 +85,35 @@ namespace gr {
       uint8_t* out = (uint8_t*) output_items[0];
       int i;
 
+      // Encode packed data using the chip lookup table. Idle bytes are
+      // replaced by two zero valued bytes. The idle tag is propagated
+      // to the first of these by the runtime and a matching tag is
+      // added to the second.
+      if (d_packed) {
+        std::vector<tag_t> idle_tags;
+        uint64_t in_offset = nitems_read(0);
+        uint64_t out_offset = nitems_written(0);
+        for (i = 0; i < noutput_items/2; i++) {
+          uint16_t chips = d_chip_table[in[i]];
+          out[2*i]   = (uint8_t) chips;
+          out[2*i+1] = (uint8_t) (chips >> 8);
+        }
+        get_tags_in_range(idle_tags, 0, in_offset, in_offset + i, d_idle_tag_key);
+        for (size_t t = 0; t < idle_tags.size(); t++) {
+          int idle_i = (int) (idle_tags[t].offset - in_offset);
+          out[2*idle_i]   = 0x00;
+          out[2*idle_i+1] = 0x00;
+          add_item_tag(0, out_offset + 2*idle_i + 1, d_idle_tag_key, pmt::PMT_T);
+        }
+        return 2 * i;
+      }
+
       for (i = 0; i < noutput_items/2; i++) {
 
         // Insert idle bits if required.
-        if (in[i] == 0xFF) {
-          out[2*i]   = 0xFF;
-          out[2*i+1] = 0xFF;
+        if (in[i] == IDLE_BIT) {
+          out[2*i]   = IDLE_BIT;
+          out[2*i+1] = IDLE_BIT;
         }
 
         // Default is to encode '1' as a rising edge.
@@ -100,6 +145,12 @@ namespace gr {
       return 2 * i;
     }
 
+    void
+    manc_enc_impl::reset_state()
+    {
+      // The encoder has no internal state.
+    }
+
   } /* namespace scratch_radio */
 } /* namespace gr */
 
@@ -30,11 +30,18 @@ namespace gr {
     {
      private:
       bool d_invert;
+      bool d_packed;
+      pmt::pmt_t d_idle_tag_key;
+      uint16_t d_chip_table[256];
+
+      void m_build_chip_table();
 
      public:
-      manc_enc_impl(bool invert);
+      manc_enc_impl(bool invert, bool packed);
       ~manc_enc_impl();
 
+      void reset_state();
+
       // Where all the action really happens
       int work(int noutput_items,
          gr_vector_const_void_star &input_items,
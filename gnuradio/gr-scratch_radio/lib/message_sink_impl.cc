@@ -22,6 +22,11 @@
 #include "config.h"
 #endif
 
+#include <cerrno>
+#include <cstring>
+#include <ctime>
+#include <fcntl.h>
+#include <unistd.h>
 #include <gnuradio/io_signature.h>
 #include "message_sink_impl.h"
 
@@ -29,25 +34,29 @@ namespace gr {
   namespace scratch_radio {
 
     message_sink::sptr
-    message_sink::make(char* msg_file_name)
+    message_sink::make(char* msg_file_name, int max_flush_latency, bool extended)
     {
       return gnuradio::get_initial_sptr
-        (new message_sink_impl(msg_file_name));
+        (new message_sink_impl(msg_file_name, max_flush_latency, extended));
     }
 
     /*
      * The private constructor
      */
-    message_sink_impl::message_sink_impl(char* msg_file_name)
+    message_sink_impl::message_sink_impl(char* msg_file_name, int max_flush_latency, bool extended)
       : gr::sync_block("message_sink",
               gr::io_signature::make(1, 1, sizeof(uint8_t)),
               gr::io_signature::make(0, 0, 0))
     {
-      d_msg_byte_count = 0;
-      d_sink = new std::ofstream(msg_file_name);
-      if ((!d_sink) || (!d_sink->is_open ())) {
-        // TODO: How do we handle missing files?
-      }
+      d_file_name = msg_file_name;
+      d_sink_fd = -1;
+      d_next_attach_time = 0;
+      d_max_flush_latency = max_flush_latency;
+      d_extended = extended;
+      d_max_msg_length = extended ?
+        SIMPLE_FRAME_MAX_EXTENDED_MESSAGE_SIZE : SIMPLE_FRAME_MAX_LENGTH;
+      reset_state();
+      m_attach();
     }
 
     /*
@@ -55,12 +64,141 @@ namespace gr {
      */
     message_sink_impl::~message_sink_impl()
     {
-      if (d_sink) {
-        if (d_sink->is_open()) {
-          d_sink->close();
+      m_detach();
+    }
+
+    void
+    message_sink_impl::reset_state()
+    {
+      d_msg_byte_count = 0;
+      d_length_pending = false;
+      d_length_msb = 0;
+      d_msg_fragment = false;
+      d_msg_discard = false;
+      d_next_fragment_index = 0;
+      d_write_count = 0;
+      d_line_count = 0;
+      d_first_line_time = 0;
+    }
+
+    bool
+    message_sink_impl::is_attached()
+    {
+      return d_sink_fd >= 0;
+    }
+
+    /*
+     * Writes out any complete messages when the flow graph is stopped.
+     */
+    bool
+    message_sink_impl::stop()
+    {
+      m_flush();
+      return true;
+    }
+
+    /*
+     * Gets the current monotonic time in milliseconds.
+     */
+    int64_t
+    message_sink_impl::m_time_now()
+    {
+      struct timespec ts_now;
+      clock_gettime (CLOCK_MONOTONIC, &ts_now);
+      return (int64_t) ts_now.tv_sec * 1000 + ts_now.tv_nsec / 1000000;
+    }
+
+    /*
+     * Opens the message pipe without blocking. Opening a named pipe for
+     * writing in non-blocking mode fails with ENXIO if there is no
+     * reader, in which case the open is retried at intervals from the
+     * work function. Once open, the pipe is switched to blocking mode so
+     * that no messages are lost if the reader falls behind.
+     */
+    bool
+    message_sink_impl::m_attach()
+    {
+      if (d_sink_fd >= 0) {
+        return true;
+      }
+      int64_t now = m_time_now();
+      if (now < d_next_attach_time) {
+        return false;
+      }
+      d_sink_fd = open(d_file_name.c_str(),
+        O_WRONLY | O_NONBLOCK | O_CREAT | O_TRUNC, 0666);
+      if (d_sink_fd < 0) {
+        d_next_attach_time = now + ATTACH_RETRY_INTERVAL;
+        return false;
+      }
+      fcntl(d_sink_fd, F_SETFL, fcntl(d_sink_fd, F_GETFL) & ~O_NONBLOCK);
+      return true;
+    }
+
+    void
+    message_sink_impl::m_detach()
+    {
+      if (d_sink_fd >= 0) {
+        close(d_sink_fd);
+        d_sink_fd = -1;
+      }
+    }
+
+    /*
+     * Writes all the complete message lines to the message pipe with a
+     * single write call, retaining any partially assembled message. If
+     * the reader has closed the pipe it is detached, and will be
+     * reattached when a new reader opens it. Messages are discarded
+     * while detached.
+     */
+    void
+    message_sink_impl::m_flush()
+    {
+      if (d_line_count == 0) {
+        return;
+      }
+      if (m_attach()) {
+        int written = 0;
+        while (written < d_line_count) {
+          ssize_t result = write(d_sink_fd,
+            d_write_buffer + written, d_line_count - written);
+          if (result < 0) {
+            if (errno == EINTR) {
+              continue;
+            }
+            m_detach();
+            break;
+          }
+          written += result;
         }
-        delete d_sink;
       }
+      memmove(d_write_buffer, d_write_buffer + d_line_count,
+        d_write_count - d_line_count);
+      d_write_count -= d_line_count;
+      d_line_count = 0;
+    }
+
+    /*
+     * Processes an extended frame format length field at the start of
+     * a message fragment. A fragment which does not follow on from the
+     * previous one causes any partially reassembled message to be
+     * discarded, and the remaining fragments of a message are then
+     * discarded if the first fragment was missing.
+     */
+    void
+    message_sink_impl::m_start_message(int length_field)
+    {
+      int fragment_index = (length_field & SIMPLE_FRAME_FRAGMENT_INDEX_MASK) >>
+        SIMPLE_FRAME_FRAGMENT_INDEX_SHIFT;
+      if (fragment_index != d_next_fragment_index) {
+        d_write_count = d_line_count;
+        d_msg_discard = (fragment_index != 0);
+      } else if (fragment_index == 0) {
+        d_msg_discard = false;
+      }
+      d_msg_fragment = (length_field & SIMPLE_FRAME_FRAGMENT_FLAG) != 0;
+      d_next_fragment_index = d_msg_fragment ? fragment_index + 1 : 0;
+      d_msg_byte_count = length_field & SIMPLE_FRAME_EXTENDED_LENGTH_MASK;
     }
 
     int
@@ -69,23 +207,67 @@ namespace gr {
         gr_vector_void_star &output_items)
     {
       const uint8_t *in = (const uint8_t *) input_items[0];
+      int in_i = 0;
 
-      for (int in_i = 0; in_i < noutput_items; in_i++) {
-        uint8_t next_char = in[in_i];
+      while (in_i < noutput_items) {
+
+        // Complete an extended frame format length field, the first
+        // byte of which was received on the previous call.
+        if (d_length_pending) {
+          d_length_pending = false;
+          m_start_message((d_length_msb << 8) | in[in_i++]);
+          continue;
+        }
 
-        // Search for start of next message.
+        // Skip idle bytes and search for the start of the next message.
+        // Flush the complete messages first if there may not be enough
+        // space to assemble the next one.
         if (d_msg_byte_count == 0) {
-          d_msg_byte_count = next_char;
+          while ((in_i < noutput_items) && (in[in_i] == 0)) {
+            in_i++;
+          }
+          if (in_i == noutput_items) {
+            break;
+          }
+          if (d_write_count + d_max_msg_length + 1 > WRITE_BUFFER_LEN) {
+            m_flush();
+          }
+          if (d_extended) {
+            d_length_msb = in[in_i++];
+            d_length_pending = true;
+            continue;
+          }
+          d_msg_byte_count = in[in_i++];
         }
 
-        // Copy message to output stream.
-        else {
-          d_sink->put(next_char);
-          d_msg_byte_count -= 1;
-          if (d_msg_byte_count == 0) {
-            d_sink->put('\n');
-            d_sink->flush();
+        // Copy as much of the message contents as possible in one go,
+        // terminating the line once the message is complete. Fragments
+        // of a message which is being discarded are skipped.
+        int copy_count = noutput_items - in_i;
+        if (copy_count > d_msg_byte_count) {
+          copy_count = d_msg_byte_count;
+        }
+        if (!d_msg_discard) {
+          memcpy(d_write_buffer + d_write_count, in + in_i, copy_count);
+          d_write_count += copy_count;
+        }
+        d_msg_byte_count -= copy_count;
+        in_i += copy_count;
+        if ((d_msg_byte_count == 0) && (!d_msg_fragment) && (!d_msg_discard)) {
+          d_write_buffer[d_write_count++] = '\n';
+          if (d_line_count == 0) {
+            d_first_line_time = m_time_now();
           }
+          d_line_count = d_write_count;
+        }
+      }
+
+      // Write out the complete messages unless flushing has been
+      // deferred and the oldest message is within the latency limit.
+      if (d_line_count > 0) {
+        if ((d_max_flush_latency <= 0) ||
+            (m_time_now() - d_first_line_time >= d_max_flush_latency)) {
+          m_flush();
         }
       }
 
@@ -21,21 +21,56 @@
 #ifndef INCLUDED_SCRATCH_RADIO_MESSAGE_SINK_IMPL_H
 #define INCLUDED_SCRATCH_RADIO_MESSAGE_SINK_IMPL_H
 
+#include <string>
 #include <scratch_radio/message_sink.h>
 
+#define WRITE_BUFFER_LEN 32768
+#define ATTACH_RETRY_INTERVAL 100
+
 namespace gr {
   namespace scratch_radio {
 
     class message_sink_impl : public message_sink
     {
      private:
+      std::string d_file_name;
+      int d_sink_fd;
+      int64_t d_next_attach_time;
+      int d_max_flush_latency;
+      bool d_extended;
+      int d_max_msg_length;
       int d_msg_byte_count;
-      std::ofstream* d_sink;
+
+      // State of the extended frame format length field and message
+      // fragment reassembly. Fragments are discarded when one or more
+      // fragments of the same message are missing.
+      bool d_length_pending;
+      uint8_t d_length_msb;
+      bool d_msg_fragment;
+      bool d_msg_discard;
+      int d_next_fragment_index;
+
+      // Buffer of complete message lines waiting to be written, followed
+      // by the message currently being assembled.
+      uint8_t d_write_buffer[WRITE_BUFFER_LEN];
+      int d_write_count;
+      int d_line_count;
+      int64_t d_first_line_time;
+
+      int64_t m_time_now(void);
+      bool m_attach(void);
+      void m_detach(void);
+      void m_flush(void);
+      void m_start_message(int length_field);
 
      public:
-      message_sink_impl(char* msg_file_name);
+      message_sink_impl(char* msg_file_name, int max_flush_latency, bool extended);
       ~message_sink_impl();
 
+      void reset_state();
+      bool is_attached();
+      bool stop();
+
       // Where all the action really happens
       int work(int noutput_items,
          gr_vector_const_void_star &input_items,
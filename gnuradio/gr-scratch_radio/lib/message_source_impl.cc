@@ -22,6 +22,11 @@
 #include "config.h"
 #endif
 
+#include <cerrno>
+#include <cstring>
+#include <ctime>
+#include <fcntl.h>
+#include <unistd.h>
 #include <gnuradio/io_signature.h>
 #include "message_source_impl.h"
 
@@ -29,28 +34,29 @@ namespace gr {
   namespace scratch_radio {
 
     message_source::sptr
-    message_source::make(char* msg_file_name, int msg_cps_rate)
+    message_source::make(char* msg_file_name, int msg_cps_rate, bool extended)
     {
       return gnuradio::get_initial_sptr
-        (new message_source_impl(msg_file_name, msg_cps_rate));
+        (new message_source_impl(msg_file_name, msg_cps_rate, extended));
     }
 
     /*
      * The private constructor
      */
-    message_source_impl::message_source_impl(char* msg_file_name, int msg_cps_rate)
+    message_source_impl::message_source_impl(char* msg_file_name, int msg_cps_rate, bool extended)
       : gr::sync_block("message_source",
               gr::io_signature::make(0, 0, 0),
               gr::io_signature::make(1, 1, sizeof(uint8_t)))
     {
-      d_msg_ready = false;
-      d_msg_overflow = false;
-      d_msg_byte_count = 0;
-      d_msg_length = 0;
-      d_source = new std::ifstream(msg_file_name);
-      if ((!d_source) || (!d_source->is_open ())) {
-        // TODO: How do we handle missing files?
-      }
+      d_file_name = msg_file_name;
+      d_extended = extended;
+      d_max_msg_length = extended ?
+        SIMPLE_FRAME_MAX_EXTENDED_LENGTH : SIMPLE_FRAME_MAX_LENGTH;
+      d_source_fd = -1;
+      d_peer_attached = false;
+      d_next_attach_time = 0;
+      reset_state();
+      m_attach();
 
       // Determine the output buffer threshold required to limit the
       // latency imposed by the output buffer.
@@ -64,38 +70,201 @@ namespace gr {
      */
     message_source_impl::~message_source_impl()
     {
-      if (d_source) {
-        if (d_source->is_open()) {
-          d_source->close();
-        }
-        delete d_source;
+      if (d_source_fd >= 0) {
+        close(d_source_fd);
+      }
+    }
+
+    void
+    message_source_impl::reset_state()
+    {
+      d_read_offset = 0;
+      d_read_count = 0;
+      d_msg_ready = false;
+      d_msg_overflow = false;
+      d_msg_fragment = false;
+      d_msg_fragment_index = 0;
+      d_msg_byte_count = 0;
+      d_ring_head = 0;
+      d_ring_tail = 0;
+    }
+
+    bool
+    message_source_impl::is_attached()
+    {
+      return (d_source_fd >= 0) && d_peer_attached;
+    }
+
+    /*
+     * Opens the message pipe without blocking. Opening a named pipe for
+     * reading in non-blocking mode succeeds even if there is no writer,
+     * so this only fails if the pipe is missing. In that case the open
+     * is retried at intervals from the work function. Once open, the
+     * pipe is kept open when writers close it, since subsequent writers
+     * will reconnect to the same pipe.
+     */
+    bool
+    message_source_impl::m_attach()
+    {
+      if (d_source_fd >= 0) {
+        return true;
       }
+      struct timespec ts_now;
+      clock_gettime (CLOCK_MONOTONIC, &ts_now);
+      int64_t now = (int64_t) ts_now.tv_sec * 1000 + ts_now.tv_nsec / 1000000;
+      if (now < d_next_attach_time) {
+        return false;
+      }
+      d_source_fd = open(d_file_name.c_str(), O_RDONLY | O_NONBLOCK);
+      if (d_source_fd < 0) {
+        d_next_attach_time = now + ATTACH_RETRY_INTERVAL;
+        return false;
+      }
+      return true;
     }
 
+    /*
+     * Attempts to copy the assembled message or message fragment into
+     * the ring buffer, returning false if there is not enough space.
+     * Empty messages can not be framed, so they are discarded.
+     */
     bool
-    message_source_impl::m_poll_for_message()
+    message_source_impl::m_queue_message()
     {
-      bool msg_valid = false;
-      if ((d_source) && (d_source->is_open())) {
-        while ((!msg_valid) && (d_source->rdbuf()->in_avail())) {
-          uint8_t next_byte = (uint8_t) d_source->get();
-          if (next_byte == '\n') {
-            d_msg_buffer[d_msg_byte_count] = 0;
-            msg_valid = !d_msg_overflow;
-            d_msg_ready = !d_msg_overflow;
-            d_msg_overflow = false;
-            d_msg_length = d_msg_byte_count;
-            d_msg_byte_count = 0;
+      unsigned int ring_space = MSG_RING_LEN - (d_ring_head - d_ring_tail);
+      int length_field_size = d_extended ? 2 : 1;
+      if (ring_space < (unsigned int) (d_msg_byte_count + length_field_size)) {
+        return false;
+      }
+      if (d_msg_byte_count > 0) {
+        if (d_extended) {
+          int length_field = SIMPLE_FRAME_EXTENDED_FLAG | d_msg_byte_count |
+            (d_msg_fragment_index << SIMPLE_FRAME_FRAGMENT_INDEX_SHIFT);
+          if (d_msg_fragment) {
+            length_field |= SIMPLE_FRAME_FRAGMENT_FLAG;
           }
-          else if (d_msg_byte_count < MAX_MESSAGE_SIZE) {
-            d_msg_buffer[d_msg_byte_count++] = next_byte;
+          d_msg_ring[d_ring_head++ % MSG_RING_LEN] = (uint8_t) (length_field >> 8);
+          d_msg_ring[d_ring_head++ % MSG_RING_LEN] = (uint8_t) length_field;
+        } else {
+          d_msg_ring[d_ring_head++ % MSG_RING_LEN] = (uint8_t) d_msg_byte_count;
+        }
+        for (int i = 0; i < d_msg_byte_count; i++) {
+          d_msg_ring[d_ring_head++ % MSG_RING_LEN] = d_msg_buffer[i];
+        }
+      }
+      d_msg_fragment_index = d_msg_fragment ? d_msg_fragment_index + 1 : 0;
+      d_msg_ready = false;
+      d_msg_fragment = false;
+      d_msg_byte_count = 0;
+      return true;
+    }
+
+    /*
+     * Reads all available data from the message pipe, splitting it into
+     * messages which are queued in the ring buffer. Stops reading from
+     * the pipe if the ring buffer fills up, leaving any remaining data
+     * in the pipe until there is space available. When using the
+     * extended frame format, messages which are longer than the
+     * maximum frame length are queued as a series of fragments.
+     */
+    void
+    message_source_impl::m_fill_ring()
+    {
+      if ((d_msg_ready) && (!m_queue_message())) {
+        return;
+      }
+      while (true) {
+
+        // Refill the read buffer when all the data has been processed.
+        // A read of zero bytes indicates that there is no writer, while
+        // EAGAIN indicates that the writer has no data ready.
+        if (d_read_offset == d_read_count) {
+          if (!m_attach()) {
+            return;
+          }
+          ssize_t read_count = read(d_source_fd, d_read_buffer, READ_BUFFER_LEN);
+          if (read_count < 0) {
+            d_peer_attached = (errno == EAGAIN);
+            return;
           }
-          else {
-            d_msg_overflow = true;
+          d_peer_attached = (read_count > 0);
+          if (read_count == 0) {
+            return;
           }
+          d_read_offset = 0;
+          d_read_count = read_count;
+        }
+
+        // Scan the read buffer for the next end of line, copying as
+        // much of the message contents as will fit in a single frame.
+        uint8_t* start = d_read_buffer + d_read_offset;
+        int scan_count = d_read_count - d_read_offset;
+        uint8_t* eol = (uint8_t*) memchr(start, '\n', scan_count);
+        int line_count = (eol == NULL) ? scan_count : eol - start;
+        int copy_count = d_max_msg_length - d_msg_byte_count;
+        if (copy_count > line_count) {
+          copy_count = line_count;
         }
+        if (!d_msg_overflow) {
+          memcpy(d_msg_buffer + d_msg_byte_count, start, copy_count);
+          d_msg_byte_count += copy_count;
+        }
+
+        // If the message continues beyond the end of a full frame it
+        // is either queued as a message fragment or discarded, once the
+        // maximum number of fragments has been reached.
+        if (copy_count < line_count) {
+          if ((d_extended) && (!d_msg_overflow) &&
+              (d_msg_fragment_index < SIMPLE_FRAME_MAX_FRAGMENTS - 1)) {
+            d_read_offset += copy_count;
+            d_msg_ready = true;
+            d_msg_fragment = true;
+            if (!m_queue_message()) {
+              return;
+            }
+            continue;
+          }
+          d_msg_overflow = true;
+        }
+        if (eol == NULL) {
+          d_read_offset = d_read_count;
+          continue;
+        }
+        d_read_offset += line_count + 1;
+
+        // Queue the completed message.
+        if (d_msg_overflow) {
+          d_msg_overflow = false;
+          d_msg_fragment_index = 0;
+          d_msg_byte_count = 0;
+        } else {
+          d_msg_ready = true;
+          if (!m_queue_message()) {
+            return;
+          }
+        }
+      }
+    }
+
+    /*
+     * Copies queued message data from the ring buffer to the output.
+     */
+    int
+    message_source_impl::m_drain_ring(uint8_t* out, int max_items)
+    {
+      int copy_count = d_ring_head - d_ring_tail;
+      if (copy_count > max_items) {
+        copy_count = max_items;
       }
-      return msg_valid;
+      int ring_offset = d_ring_tail % MSG_RING_LEN;
+      int first_count = MSG_RING_LEN - ring_offset;
+      if (first_count > copy_count) {
+        first_count = copy_count;
+      }
+      memcpy(out, d_msg_ring + ring_offset, first_count);
+      memcpy(out + first_count, d_msg_ring, copy_count - first_count);
+      d_ring_tail += copy_count;
+      return copy_count;
     }
 
     int
@@ -106,30 +275,22 @@ namespace gr {
       uint8_t *out = (uint8_t *) output_items[0];
       int out_i = 0;
 
-      // If waiting, poll for next input message once per work cycle.
-      // If no message is available, pad the output with idle bytes.
-      if ((!d_msg_ready) && (noutput_items > 0)) {
-        d_msg_ready = m_poll_for_message();
-        if (d_msg_ready) {
-          out[out_i++] = d_msg_length;
-        }
-        else {
-          while (out_i < noutput_items) {
-            out[out_i++] = 0x00;
+      // Copy over as many queued messages as possible, refilling the
+      // ring buffer from the message pipe as it empties.
+      while (out_i < noutput_items) {
+        if (d_ring_head == d_ring_tail) {
+          m_fill_ring();
+          if (d_ring_head == d_ring_tail) {
+            break;
           }
         }
+        out_i += m_drain_ring(out + out_i, noutput_items - out_i);
       }
 
-      // Copy over the message contents.
-      while ((d_msg_ready) && (out_i < noutput_items)) {
-        if (d_msg_byte_count == d_msg_length) {
-          d_msg_ready = false;
-          d_msg_overflow = false;
-          d_msg_byte_count = 0;
-          d_msg_length = 0;
-        } else {
-          out[out_i++] = d_msg_buffer[d_msg_byte_count++];
-        }
+      // If no message data is available, pad the output with idle bytes.
+      if (out_i == 0) {
+        memset(out, 0x00, noutput_items);
+        out_i = noutput_items;
       }
 
       // Tell runtime system how many output items we produced.
@@ -21,11 +21,13 @@
 #ifndef INCLUDED_SCRATCH_RADIO_MESSAGE_SOURCE_IMPL_H
 #define INCLUDED_SCRATCH_RADIO_MESSAGE_SOURCE_IMPL_H
 
-#include <fstream>
+#include <string>
 #include <scratch_radio/message_source.h>
 
-#define MAX_MESSAGE_SIZE 255
-#define MSG_BUFFER_LEN (MAX_MESSAGE_SIZE+1)
+#define MSG_BUFFER_LEN SIMPLE_FRAME_MAX_EXTENDED_LENGTH
+#define READ_BUFFER_LEN 4096
+#define MSG_RING_LEN 4096
+#define ATTACH_RETRY_INTERVAL 100
 
 namespace gr {
   namespace scratch_radio {
@@ -33,19 +35,47 @@ namespace gr {
     class message_source_impl : public message_source
     {
      private:
+      std::string d_file_name;
+      bool d_extended;
+      int d_max_msg_length;
+      int d_source_fd;
+      bool d_peer_attached;
+      int64_t d_next_attach_time;
+
+      // Raw data read from the message pipe which has not yet been
+      // split into messages.
+      uint8_t d_read_buffer[READ_BUFFER_LEN];
+      int d_read_offset;
+      int d_read_count;
+
+      // The message or message fragment which is currently being
+      // assembled. A complete message or fragment is held here if
+      // there is no space for it in the ring.
       bool d_msg_ready;
       bool d_msg_overflow;
+      bool d_msg_fragment;
+      int d_msg_fragment_index;
       int d_msg_byte_count;
-      int d_msg_length;
-      std::ifstream* d_source;
       uint8_t d_msg_buffer[MSG_BUFFER_LEN];
 
-      bool m_poll_for_message(void);
+      // Ring buffer of queued messages, each consisting of a length
+      // field followed by the message contents.
+      uint8_t d_msg_ring[MSG_RING_LEN];
+      unsigned int d_ring_head;
+      unsigned int d_ring_tail;
+
+      bool m_attach(void);
+      bool m_queue_message(void);
+      void m_fill_ring(void);
+      int m_drain_ring(uint8_t* out, int max_items);
 
      public:
-      message_source_impl(char* msg_file_name, int msg_cps_rate);
+      message_source_impl(char* msg_file_name, int msg_cps_rate, bool extended);
       ~message_source_impl();
 
+      void reset_state();
+      bool is_attached();
+
       // Where all the action really happens
       int work(int noutput_items,
          gr_vector_const_void_star &input_items,
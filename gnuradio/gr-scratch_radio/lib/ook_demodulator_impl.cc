@@ -22,32 +22,38 @@
 #include "config.h"
 #endif
 
+#include <cstring>
+#include <stdexcept>
 #include <gnuradio/io_signature.h>
 #include <gnuradio/gr_complex.h>
+#include <volk/volk.h>
 #include "ook_demodulator_impl.h"
 
 namespace gr {
   namespace scratch_radio {
 
     ook_demodulator::sptr
-    ook_demodulator::make(int baud_rate, int sample_rate)
+    ook_demodulator::make(int baud_rate, int sample_rate, int decimation)
     {
       return gnuradio::get_initial_sptr
-        (new ook_demodulator_impl(baud_rate, sample_rate));
+        (new ook_demodulator_impl(baud_rate, sample_rate, decimation));
     }
 
     /*
      * The private constructor
      */
-    ook_demodulator_impl::ook_demodulator_impl(int baud_rate, int sample_rate)
-      : gr::sync_block("ook_demodulator",
+    ook_demodulator_impl::ook_demodulator_impl(int baud_rate, int sample_rate, int decimation)
+      : gr::sync_decimator("ook_demodulator",
               gr::io_signature::make(1, 1, sizeof(gr_complex)),
-              gr::io_signature::make(1, 1, sizeof(float)))
+              gr::io_signature::make(1, 1, sizeof(float)), decimation)
     {
+      if (decimation < 1) {
+        throw std::invalid_argument ("ook_demodulator: decimation out of range");
+      }
+      d_decimation = decimation;
       d_symbol_avg_period = (3*sample_rate) / (4*baud_rate);
       d_offset_avg_period = d_symbol_avg_period * 10;
-      d_symbol_acc_value = 0.0;
-      d_offset_acc_value = 0.0;
+      reset_state();
       set_history(d_symbol_avg_period + d_offset_avg_period + 1);
     }
 
@@ -58,6 +64,28 @@ namespace gr {
     {
     }
 
+    /*
+     * Recalculate the moving average accumulators from the input sample
+     * magnitudes, which prevents rounding errors from building up in the
+     * running sums. The accumulators are set to the values which they
+     * would have before processing the first output sample.
+     */
+    void
+    ook_demodulator_impl::m_resum_accumulators()
+    {
+      double symbol_sum = 0.0;
+      double offset_sum = 0.0;
+      for (int i = 0; i < d_offset_avg_period; i++) {
+        offset_sum += d_magnitudes[i];
+      }
+      for (int i = 0; i < d_symbol_avg_period; i++) {
+        symbol_sum += d_magnitudes[d_offset_avg_period + i];
+      }
+      d_symbol_acc_value = symbol_sum;
+      d_offset_acc_value = offset_sum;
+      d_resum_count = 0;
+    }
+
     int
     ook_demodulator_impl::work(int noutput_items,
         gr_vector_const_void_star &input_items,
@@ -65,28 +93,67 @@ namespace gr {
     {
       const gr_complex *in = (const gr_complex *) input_items[0];
       float *out = (float *) output_items[0];
+      int history_length = history() - 1;
+      int ninput_items = noutput_items * d_decimation;
 
-      for (int i = 0; i < noutput_items; i++) {
-        int old_offset_i = i;
-        int old_sample_i = old_offset_i + d_offset_avg_period;
-        int new_sample_i = old_sample_i + d_symbol_avg_period;
-
-        float abs_input_sample = abs(in[new_sample_i]);
-        float abs_old_symbol_sample = abs(in[old_sample_i]);
-        float abs_old_offset_sample = abs(in[old_offset_i]);
+      // Calculate the magnitude of each input sample once. The
+      // magnitudes of the history samples are retained from the
+      // previous call, so only the new input samples are processed.
+      int new_count = ninput_items;
+      bool resum = (d_resum_count >= ACC_RESUM_INTERVAL);
+      if (!d_magnitudes_valid) {
+        new_count += history_length;
+        d_magnitudes_valid = true;
+        resum = true;
+      }
+      else {
+        memmove (&d_magnitudes[0], &d_magnitudes[d_magnitudes.size() - history_length],
+          history_length * sizeof(float));
+      }
+      d_magnitudes.resize (ninput_items + history_length);
+      volk_32fc_magnitude_32f (&d_magnitudes[d_magnitudes.size() - new_count],
+        in + d_magnitudes.size() - new_count, new_count);
 
-        d_symbol_acc_value += abs_input_sample - abs_old_symbol_sample;
-        d_offset_acc_value += abs_old_symbol_sample - abs_old_offset_sample;
+      // Recalculate the accumulators on the first call and then at
+      // regular intervals.
+      if (resum) {
+        m_resum_accumulators();
+      }
+      d_resum_count += ninput_items;
 
-        float symbol_value = d_symbol_acc_value / d_symbol_avg_period;
-        symbol_value -= d_offset_acc_value / d_offset_avg_period;
-        out[i] = symbol_value;
+      // Run the symbol and offset moving averages over the magnitudes.
+      // Each output sample is the average of the demodulated values
+      // for the decimation period.
+      const float *old_offset_mag = &d_magnitudes[0];
+      const float *old_symbol_mag = old_offset_mag + d_offset_avg_period;
+      const float *new_symbol_mag = old_symbol_mag + d_symbol_avg_period;
+      float symbol_scale = 1.0 / d_symbol_avg_period;
+      float offset_scale = 1.0 / d_offset_avg_period;
+      float output_scale = 1.0 / d_decimation;
+      int in_i = 0;
+      for (int i = 0; i < noutput_items; i++) {
+        float symbol_value = 0.0;
+        for (int j = 0; j < d_decimation; j++, in_i++) {
+          d_symbol_acc_value += new_symbol_mag[in_i] - old_symbol_mag[in_i];
+          d_offset_acc_value += old_symbol_mag[in_i] - old_offset_mag[in_i];
+          symbol_value += d_symbol_acc_value * symbol_scale - d_offset_acc_value * offset_scale;
+        }
+        out[i] = symbol_value * output_scale;
       }
 
       // Tell runtime system how many output items we produced.
       return noutput_items;
     }
 
+    void
+    ook_demodulator_impl::reset_state()
+    {
+      d_symbol_acc_value = 0.0;
+      d_offset_acc_value = 0.0;
+      d_resum_count = 0;
+      d_magnitudes_valid = false;
+    }
+
   } /* namespace scratch_radio */
 } /* namespace gr */
 
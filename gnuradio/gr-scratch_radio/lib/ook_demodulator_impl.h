@@ -21,8 +21,13 @@
 #ifndef INCLUDED_SCRATCH_RADIO_OOK_DEMODULATOR_IMPL_H
 #define INCLUDED_SCRATCH_RADIO_OOK_DEMODULATOR_IMPL_H
 
+#include <vector>
 #include <scratch_radio/ook_demodulator.h>
 
+// The number of input samples between recalculations of the moving
+// average accumulators from the stored input sample magnitudes.
+#define ACC_RESUM_INTERVAL 65536
+
 namespace gr {
   namespace scratch_radio {
 
@@ -31,13 +36,21 @@ namespace gr {
      private:
       int d_symbol_avg_period;
       int d_offset_avg_period;
+      int d_decimation;
       float d_symbol_acc_value;
       float d_offset_acc_value;
+      int d_resum_count;
+      bool d_magnitudes_valid;
+      std::vector<float> d_magnitudes;
+
+      void m_resum_accumulators();
 
      public:
-      ook_demodulator_impl(int baud_rate, int sample_rate);
+      ook_demodulator_impl(int baud_rate, int sample_rate, int decimation);
       ~ook_demodulator_impl();
 
+      void reset_state();
+
       // Where all the action really happens
       int work(int noutput_items,
          gr_vector_const_void_star &input_items,
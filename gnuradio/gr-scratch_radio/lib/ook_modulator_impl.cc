@@ -24,56 +24,192 @@
 
 #include <ctime>
 #include <cmath>
+#include <cstring>
+#include <algorithm>
+#include <stdexcept>
+#include <boost/thread/thread.hpp>
 #include <gnuradio/io_signature.h>
 #include <gnuradio/gr_complex.h>
 #include "ook_modulator_impl.h"
+#include "bit_format.h"
 
 namespace gr {
   namespace scratch_radio {
 
     ook_modulator::sptr
-    ook_modulator::make(int baud_rate, int sample_rate, int mod_freq)
+    ook_modulator::make(int baud_rate, int sample_rate, int mod_freq,
+      bool burst_mode, float ramp_fraction)
     {
       return gnuradio::get_initial_sptr
-        (new ook_modulator_impl(baud_rate, sample_rate, mod_freq));
+        (new ook_modulator_impl(baud_rate, sample_rate, mod_freq,
+          burst_mode, ramp_fraction));
     }
 
     /*
      * The private constructor
      */
-    ook_modulator_impl::ook_modulator_impl(int baud_rate, int sample_rate, int mod_freq)
+    ook_modulator_impl::ook_modulator_impl(int baud_rate, int sample_rate, int mod_freq,
+      bool burst_mode, float ramp_fraction)
       : gr::block("ook_modulator",
               gr::io_signature::make(1, 1, sizeof(uint8_t)),
               gr::io_signature::make(1, 1, sizeof(gr_complex)))
     {
+      if ((ramp_fraction < 0.0) || (ramp_fraction > 1.0)) {
+        throw std::invalid_argument ("ook_modulator: ramp fraction out of range");
+      }
+      d_ramp_fraction = ramp_fraction;
+      d_baud_rate = baud_rate;
       d_sample_rate = sample_rate;
-      d_sample_count = 0;
+      d_mod_freq = mod_freq;
+      d_burst_mode = burst_mode;
+      d_sob_tag_key = pmt::intern(TX_SOB_TAG_KEY);
+      d_eob_tag_key = pmt::intern(TX_EOB_TAG_KEY);
+      d_sample_table = NULL;
+      m_build_sample_table();
+      reset_state();
+
+      // In burst mode there is no fixed mapping between input and
+      // output items, so input tags are not propagated.
+      if (burst_mode) {
+        set_tag_propagation_policy(TPP_DONT);
+      }
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    ook_modulator_impl::~ook_modulator_impl()
+    {
+      delete[] d_sample_table;
+    }
+
+    void
+    ook_modulator_impl::reset_state()
+    {
+      gr::thread::scoped_lock guard(d_setlock);
+      d_sample_count = d_symbol_length;
       d_current_symbol = 0;
+      d_table_index = SYMBOL_TABLE_ZERO;
       d_timestamp = 0;
       d_first_call = true;
+      d_in_burst = false;
+      d_burst_tail = false;
+    }
 
-      // Build the table of modulated symbol samples.
-      d_symbol_length = sample_rate / baud_rate;
-      d_sample_table = new gr_complex [d_symbol_length];
-      double mod_factor = double (mod_freq) * 2 * 3.141592653589793 / double (sample_rate);
+    /*
+     * Build the table of modulated symbol samples. Must be called with
+     * the block set lock held once the block is running. Each input
+     * symbol is interpolated to a fixed number of output samples, so
+     * the relative rate is also updated. The table holds consecutive
+     * symbol waveforms for a steady carrier, a carrier which ramps up
+     * from zero and a carrier which ramps down to zero.
+     */
+    void
+    ook_modulator_impl::m_build_sample_table()
+    {
+      delete[] d_sample_table;
+      d_symbol_length = d_sample_rate / d_baud_rate;
+      set_relative_rate(d_symbol_length);
+      d_sample_table = new gr_complex [3 * d_symbol_length];
+      double mod_factor = double (d_mod_freq) * 2 * 3.141592653589793 / double (d_sample_rate);
+      int ramp_length = int (d_ramp_fraction * d_symbol_length);
       for (int i = 0; i < d_symbol_length; i++) {
         double theta = i * mod_factor;
-        d_sample_table[i] = gr_complex (float (sin (theta)) / 2, - float (cos (theta)) / 2);
+        double ramp = 1.0;
+        if (i < ramp_length) {
+          ramp = (1 - cos (3.141592653589793 * (i + 0.5) / ramp_length)) / 2;
+        }
+        gr_complex sample (float (sin (theta)) / 2, - float (cos (theta)) / 2);
+        d_sample_table[i] = sample;
+        d_sample_table[i + d_symbol_length] = sample * float (ramp);
+        d_sample_table[i + 2 * d_symbol_length] = sample * float (1.0 - ramp);
       }
     }
 
     /*
-     * Our virtual destructor.
+     * Select the symbol waveform for a new symbol value, given the
+     * value of the previous symbol. Ramped waveforms are only used at
+     * the transitions when pulse shaping is enabled.
      */
-    ook_modulator_impl::~ook_modulator_impl()
+    void
+    ook_modulator_impl::m_select_symbol_table(int symbol)
     {
-      delete[] d_sample_table;
+      bool shaped = (d_ramp_fraction > 0.0);
+      if (symbol != 0) {
+        d_table_index = (d_current_symbol == 0 && shaped) ?
+          SYMBOL_TABLE_RAMP_UP : SYMBOL_TABLE_CARRIER;
+      } else {
+        d_table_index = (d_current_symbol != 0 && shaped) ?
+          SYMBOL_TABLE_RAMP_DOWN : SYMBOL_TABLE_ZERO;
+      }
+      d_current_symbol = symbol;
     }
 
+    /*
+     * Runtime reconfiguration. The sample table is rebuilt and the
+     * current symbol is truncated so that the new settings are applied
+     * from the next symbol boundary. A zero valued symbol at the end of
+     * a burst is truncated to a single sample, which still carries the
+     * end of burst tag.
+     */
+    void
+    ook_modulator_impl::set_baud_rate(int baud_rate)
+    {
+      gr::thread::scoped_lock guard(d_setlock);
+      if ((baud_rate <= 0) || (baud_rate > d_sample_rate)) {
+        throw std::invalid_argument ("ook_modulator: baud rate out of range");
+      }
+      d_baud_rate = baud_rate;
+      m_build_sample_table();
+      d_sample_count = d_burst_tail ? d_symbol_length - 1 : d_symbol_length;
+    }
+
+    void
+    ook_modulator_impl::set_mod_freq(int mod_freq)
+    {
+      gr::thread::scoped_lock guard(d_setlock);
+      d_mod_freq = mod_freq;
+      m_build_sample_table();
+      d_sample_count = d_burst_tail ? d_symbol_length - 1 : d_symbol_length;
+    }
+
+    /*
+     * The remainder of the current symbol can always be generated
+     * without further input. Each subsequent symbol then requires one
+     * input item.
+     */
     void
     ook_modulator_impl::forecast (int noutput_items, gr_vector_int &ninput_items_required)
     {
-      ninput_items_required[0] = noutput_items * d_symbol_length;
+      int remaining = d_symbol_length - d_sample_count;
+      if (noutput_items <= remaining)
+        ninput_items_required[0] = 0;
+      else
+        ninput_items_required[0] =
+          (noutput_items - remaining + d_symbol_length - 1) / d_symbol_length;
+    }
+
+    /*
+     * Get the number of output samples which may be generated without
+     * exceeding the output latency budget. The timestamp tracks the
+     * time at which the last generated sample will be transmitted,
+     * assuming that the downstream sink consumes samples at the nominal
+     * sample rate. If the sink has fallen behind the timestamp is
+     * pulled forward, so that the budget is never exceeded by a catch
+     * up burst.
+     */
+    int
+    ook_modulator_impl::m_get_output_budget()
+    {
+      struct timespec ts_now;
+      clock_gettime (CLOCK_MONOTONIC, &ts_now);
+      int64_t now = (int64_t) ts_now.tv_sec * 1000000000 + ts_now.tv_nsec;
+      if (d_first_call || (d_timestamp < now)) {
+        d_first_call = false;
+        d_timestamp = now;
+      }
+      int64_t budget = (int64_t) OUTPUT_LATENCY * 1000000 - (d_timestamp - now);
+      return (int) (budget * d_sample_rate / 1000000000);
     }
 
     int
@@ -82,49 +218,89 @@ namespace gr {
                        gr_vector_const_void_star &input_items,
                        gr_vector_void_star &output_items)
     {
-      struct timespec ts_now;
+      gr::thread::scoped_lock guard(d_setlock);
       const uint8_t *in = (const uint8_t *) input_items[0];
       gr_complex *out = (gr_complex *) output_items[0];
       int in_i = 0;
       int out_i = 0;
 
-      // Perform basic output rate limiting to prevent transmit buffer
-      // bloat. This approach should be replaced by proper output buffer
-      // latency management when possible. Stalls on idle cycles only.
-      if (d_first_call) {
-        d_first_call = false;
-        clock_gettime (CLOCK_MONOTONIC, &ts_now);
-        d_timestamp = (int64_t) ts_now.tv_sec * 1000000000 + ts_now.tv_nsec;
-      }
-      if (in[0] == 0xFF) {
-        int64_t now;
-        clock_gettime (CLOCK_MONOTONIC, &ts_now);
-        now = (int64_t) ts_now.tv_sec * 1000000000 + ts_now.tv_nsec;
-        if ((d_timestamp - now) > (OUTPUT_LATENCY * 1000000)) {
-          consume_each (1);
-          return 0;
-        }
+      // Limit the output to the latency budget in order to prevent
+      // transmit buffer bloat. If there is insufficient budget for a
+      // full symbol, the block thread sleeps until the refill interval
+      // has become available instead of returning immediately and being
+      // rescheduled. The set lock is released while sleeping so that
+      // runtime reconfiguration is not held up, and the sleep is
+      // interrupted when the flow graph is stopped.
+      int budget = m_get_output_budget();
+      int max_budget = std::max (1, (int) ((int64_t) OUTPUT_LATENCY * d_sample_rate / 1000));
+      int min_budget = std::min (d_symbol_length, max_budget);
+      if (budget < min_budget) {
+        int refill = std::max (min_budget,
+          (int) ((int64_t) OUTPUT_REFILL_INTERVAL * d_sample_rate / 1000));
+        int64_t wait_us = (int64_t) (refill - budget) * 1000000 / d_sample_rate;
+        guard.unlock();
+        boost::this_thread::sleep (boost::posix_time::microseconds (wait_us + 1));
+        guard.lock();
+        budget = m_get_output_budget();
       }
+      noutput_items = std::min (noutput_items, budget);
 
-      while ((in_i < ninput_items[0]) && (out_i < noutput_items)) {
+      // In burst mode idle symbols are charged against the latency
+      // budget in the same way as transmitted symbols, so that idle
+      // input is consumed at the nominal symbol rate.
+      int idle_count = 0;
+      while ((out_i < noutput_items) && (out_i + idle_count < budget)) {
 
-        // Modulate current symbol value to IF.
-        if (d_current_symbol != 0) {
-          out[out_i++] = d_sample_table[d_sample_count];
+        // Get next symbol value at the end of the current symbol. In
+        // burst mode idle bits generate no output, except for the
+        // first idle bit after a burst which is sent as a zero valued
+        // symbol to end the burst.
+        if (d_sample_count >= d_symbol_length) {
+          if (in_i >= ninput_items[0]) {
+            break;
+          }
+          uint8_t this_symbol = in[in_i++];
+          if (d_burst_mode) {
+            if (this_symbol == IDLE_BIT) {
+              if (!d_in_burst) {
+                idle_count += d_symbol_length;
+                continue;
+              }
+              d_in_burst = false;
+              d_burst_tail = true;
+            }
+            else if (!d_in_burst) {
+              d_in_burst = true;
+              add_item_tag(0, nitems_written(0) + out_i, d_sob_tag_key, pmt::PMT_T);
+            }
+          }
+          m_select_symbol_table((this_symbol == 1) ? 1 : 0);
+          d_sample_count = 0;
+        }
+
+        // Modulate current symbol value to IF, copying as much of the
+        // symbol waveform as will fit in the output buffer.
+        int count = std::min (d_symbol_length - d_sample_count, noutput_items - out_i);
+        if (d_table_index != SYMBOL_TABLE_ZERO) {
+          const gr_complex *waveform = d_sample_table +
+            d_table_index * d_symbol_length + d_sample_count;
+          memcpy (out + out_i, waveform, count * sizeof(gr_complex));
         } else {
-          out[out_i++] = gr_complex (0.0, 0.0);
+          std::fill (out + out_i, out + out_i + count, gr_complex (0.0, 0.0));
         }
+        out_i += count;
+        d_sample_count += count;
 
-        // Get next symbol value.
-        d_sample_count += 1;
-        if (d_sample_count >= d_symbol_length) {
-          d_current_symbol = (in[in_i++] == 1) ? 1 : 0;
-          d_sample_count = 0;
+        // Mark the last sample of the burst.
+        if (d_burst_tail && (d_sample_count >= d_symbol_length)) {
+          d_burst_tail = false;
+          add_item_tag(0, nitems_written(0) + out_i - 1, d_eob_tag_key, pmt::PMT_T);
         }
       }
 
-      // Update timestamp based on number of samples generated.
-      d_timestamp += ((int64_t) out_i * 1000000000 / d_sample_rate);
+      // Update timestamp based on number of samples generated, including
+      // the samples which would have been generated for idle symbols.
+      d_timestamp += ((int64_t) (out_i + idle_count) * 1000000000 / d_sample_rate);
 
       // Tell runtime system how many input items we consumed on
       // each input stream.
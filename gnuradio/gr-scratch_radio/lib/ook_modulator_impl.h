@@ -24,6 +24,13 @@
 #include <scratch_radio/ook_modulator.h>
 
 #define OUTPUT_LATENCY 250
+#define OUTPUT_REFILL_INTERVAL 50
+
+// Symbol waveforms held in the sample table.
+#define SYMBOL_TABLE_ZERO -1
+#define SYMBOL_TABLE_CARRIER 0
+#define SYMBOL_TABLE_RAMP_UP 1
+#define SYMBOL_TABLE_RAMP_DOWN 2
 
 namespace gr {
   namespace scratch_radio {
@@ -31,18 +38,37 @@ namespace gr {
     class ook_modulator_impl : public ook_modulator
     {
      private:
+      int d_baud_rate;
       int d_sample_rate;
+      int d_mod_freq;
       int d_sample_count;
       int d_current_symbol;
+      int d_table_index;
+      float d_ramp_fraction;
       int64_t d_timestamp;
       bool d_first_call;
+      bool d_burst_mode;
+      bool d_in_burst;
+      bool d_burst_tail;
       int d_symbol_length;
+      pmt::pmt_t d_sob_tag_key;
+      pmt::pmt_t d_eob_tag_key;
       gr_complex* d_sample_table;
 
+      void m_build_sample_table();
+      int m_get_output_budget();
+      void m_select_symbol_table(int symbol);
+
      public:
-      ook_modulator_impl(int baud_rate, int sample_rate, int mod_freq);
+      ook_modulator_impl(int baud_rate, int sample_rate, int mod_freq,
+        bool burst_mode, float ramp_fraction);
       ~ook_modulator_impl();
 
+      void reset_state();
+
+      void set_baud_rate(int baud_rate);
+      void set_mod_freq(int mod_freq);
+
       // Where all the action really happens
       void forecast (int noutput_items, gr_vector_int &ninput_items_required);
 
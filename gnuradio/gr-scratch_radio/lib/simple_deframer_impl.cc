@@ -22,6 +22,8 @@
 #include "config.h"
 #endif
 
+#include <algorithm>
+#include <stdexcept>
 #include <gnuradio/io_signature.h>
 #include "simple_deframer_impl.h"
 
@@ -29,28 +31,31 @@ namespace gr {
   namespace scratch_radio {
 
     simple_deframer::sptr
-    simple_deframer::make()
+    simple_deframer::make(bool packed, uint32_t sync_word,
+      int max_sync_errors, bool extended, int frame_check)
     {
       return gnuradio::get_initial_sptr
-        (new simple_deframer_impl());
+        (new simple_deframer_impl(packed, sync_word, max_sync_errors,
+          extended, frame_check));
     }
 
     /*
      * The private constructor
      */
-    simple_deframer_impl::simple_deframer_impl()
+    simple_deframer_impl::simple_deframer_impl(bool packed, uint32_t sync_word,
+      int max_sync_errors, bool extended, int frame_check)
       : gr::block("simple_deframer",
               gr::io_signature::make(1, 1, sizeof(uint8_t)),
-              gr::io_signature::make(1, 1, sizeof(uint8_t)))
+              gr::io_signature::make(1, 1, sizeof(uint8_t))),
+        d_frame_check(frame_check)
     {
-      d_idle = true;
-      d_msg_received = false;
-      d_header = 0;
-      d_msg_byte_count = 0;
-      d_msg_length = 0;
-      d_checksum_0 = 0;
-      d_checksum_1 = 0;
-      d_idle_count = 0;
+      d_packed = packed;
+      d_extended = extended;
+      d_length_field_size = extended ? 2 : 1;
+      d_check_size = d_frame_check.check_size();
+      d_sync_word = sync_word;
+      set_max_sync_errors(max_sync_errors);
+      reset_state();
       set_max_output_buffer(4096);
       set_max_noutput_items(256);
     }
@@ -65,26 +70,61 @@ namespace gr {
     void
     simple_deframer_impl::forecast (int noutput_items, gr_vector_int &ninput_items_required)
     {
-      ninput_items_required[0] = noutput_items * 8;
+      if (d_packed)
+        ninput_items_required[0] = noutput_items + 1;
+      else
+        ninput_items_required[0] = noutput_items * 8;
     }
 
-    uint8_t
-    simple_deframer_impl::m_get_data_byte (const uint8_t* in, int offset)
+    void
+    simple_deframer_impl::reset_state()
     {
-      uint8_t byte_shift = 0;
-      for (int i = 0; i < 8; i++) {
-        byte_shift >>= 1;
-        if (in[offset+i] != 0)
-          byte_shift |= 0x80;
-      }
-      return byte_shift;
+      gr::thread::scoped_lock guard(d_setlock);
+      d_bit_offset = 0;
+      d_idle = true;
+      d_msg_received = false;
+      d_header = 0;
+      d_msg_byte_count = 0;
+      d_msg_length = 0;
+      d_idle_count = 0;
     }
 
+    /*
+     * Runtime reconfiguration. The new setting applies from the next
+     * sync word search position.
+     */
     void
-    simple_deframer_impl::m_update_checksum (uint8_t byte_data)
+    simple_deframer_impl::set_max_sync_errors(int max_sync_errors)
     {
-      d_checksum_0 += byte_data;
-      d_checksum_1 += d_checksum_0;
+      gr::thread::scoped_lock guard(d_setlock);
+      if ((max_sync_errors < 0) || (max_sync_errors > SIMPLE_FRAME_MAX_SYNC_ERRORS)) {
+        throw std::invalid_argument ("simple_deframer: max sync errors out of range");
+      }
+      d_max_sync_errors = max_sync_errors;
+    }
+
+    /*
+     * Input bits are addressed by their bit offset from the start of
+     * the input buffer. In packed mode there are eight bits per input
+     * item, least significant bit first, so data bytes may straddle
+     * two input items.
+     */
+    uint8_t
+    simple_deframer_impl::m_get_data_byte (const uint8_t* in, int bit_offset)
+    {
+      if (d_packed) {
+        int shift = bit_offset & 7;
+        in += bit_offset >> 3;
+        if (shift == 0)
+          return in[0];
+        else
+          return (in[0] >> shift) | (in[1] << (8 - shift));
+      }
+      uint8_t byte_data = 0;
+      for (int i = 0; i < 8; i++) {
+        byte_data |= (in[bit_offset+i] != 0) << i;
+      }
+      return byte_data;
     }
 
     int
@@ -93,12 +133,14 @@ namespace gr {
                        gr_vector_const_void_star &input_items,
                        gr_vector_void_star &output_items)
     {
+      gr::thread::scoped_lock guard(d_setlock);
       const uint8_t *in = (const uint8_t *) input_items[0];
       uint8_t *out = (uint8_t *) output_items[0];
-      int in_i = 0;
+      int in_bits = d_packed ? 8 * ninput_items[0] : ninput_items[0];
+      int bit_i = d_bit_offset;
       int out_i = 0;
 
-      while ((in_i <= ninput_items[0] - 8) && (out_i < noutput_items)) {
+      while ((bit_i <= in_bits - 8) && (out_i < noutput_items)) {
 
         // If a valid message has been received, copy it from the
         // local buffer to the output.
@@ -113,78 +155,111 @@ namespace gr {
         }
 
         // In the idle state, search for the start of frame header.
-        // Matches on the byte sequence 0x7E, 0x81, 0xC3, 0x3C.
+        // Matches on the sync word, accepting up to the configured
+        // number of bit errors. The input is searched up to eight bits
+        // at a time using a 64 bit window which holds the last 32 bits
+        // received, followed by the new bits. As with bitwise
+        // processing, each search position must be followed by at least
+        // seven further input bits. An idle output byte is generated for
+        // every eighth '1' bit, so at most one is generated per search
+        // step.
         else if (d_idle) {
-          if (in[in_i++] == 0) {
-            if (d_header == 0x3CC3817E) {
-              d_idle = false;
-              d_header = 0;
-            } else {
-              d_header >>= 1;
+          int bit_count = std::min (8, in_bits - 7 - bit_i);
+          uint8_t this_byte = m_get_data_byte (in, bit_i) & (0xFF >> (8 - bit_count));
+          uint64_t window = d_header | ((uint64_t) this_byte << 32);
+          bool in_sync = false;
+          for (int i = 1; i <= bit_count; i++) {
+            uint32_t sync_errors = ((uint32_t) (window >> i)) ^ d_sync_word;
+            if (__builtin_popcount (sync_errors) <= d_max_sync_errors) {
+              bit_count = i;
+              in_sync = true;
+              break;
             }
+          }
+          int ones_count = __builtin_popcount (this_byte & (0xFF >> (8 - bit_count)));
+          if (ones_count > d_idle_count) {
+            out[out_i++] = 0x00;
+            d_idle_count += 8 - ones_count;
           } else {
-            if (d_idle_count == 0) {
-              out[out_i++] = 0x00;
-              d_idle_count = 7;
-            } else {
-              d_idle_count -= 1;
-            }
-            d_header = 0x40000000 | (d_header >> 1);
+            d_idle_count -= ones_count;
           }
+          if (in_sync) {
+            d_idle = false;
+            d_header = 0;
+            d_msg_byte_count = 0;
+          } else {
+            d_header = (uint32_t) (window >> bit_count);
+          }
+          bit_i += bit_count;
         }
 
-        // Get the number of bytes in the frame.
+        // Get the number of bytes in the frame. The length field is
+        // held at the start of the message buffer so that it is passed
+        // on to the output along with the message contents. Extended
+        // length fields without the extended format flag are invalid.
         else if (d_msg_length == 0) {
-          d_msg_byte_count = 0;
-          d_msg_length = m_get_data_byte (in, in_i);
-          in_i += 8;
-          d_checksum_0 = 0;
-          d_checksum_1 = 0;
-          m_update_checksum (d_msg_length);
-          if (d_msg_length == 0) {
-            d_idle = true;
+          uint8_t length_byte = m_get_data_byte (in, bit_i);
+          bit_i += 8;
+          d_msg_buffer[d_msg_byte_count++] = length_byte;
+          if (d_msg_byte_count == d_length_field_size) {
+            int payload_length = d_msg_buffer[0];
+            if (d_extended) {
+              int length_field = (d_msg_buffer[0] << 8) | d_msg_buffer[1];
+              payload_length = (length_field & SIMPLE_FRAME_EXTENDED_FLAG) ?
+                (length_field & SIMPLE_FRAME_EXTENDED_LENGTH_MASK) : 0;
+            }
+            if (payload_length == 0) {
+              d_idle = true;
+            } else {
+              d_msg_length = d_length_field_size + payload_length;
+            }
           }
         }
 
-        // Read the specified number of bytes from the input
+        // Read the specified number of bytes from the input. Once the
+        // complete message has been received the expected frame check
+        // bytes are calculated over the entire message buffer.
         else if (d_msg_byte_count < d_msg_length) {
-          uint8_t input_data = m_get_data_byte (in, in_i);
-          in_i += 8;
+          uint8_t input_data = m_get_data_byte (in, bit_i);
+          bit_i += 8;
           d_msg_buffer[d_msg_byte_count] = input_data;
           d_msg_byte_count += 1;
-          m_update_checksum (input_data);
-        }
-
-        // Validate first checksum byte.
-        else if (d_msg_byte_count == d_msg_length) {
-          uint8_t check_byte = m_get_data_byte (in, in_i);
-          in_i += 8;
-          if (check_byte == d_checksum_0 % 255) {
-            d_msg_byte_count += 1;
-          } else {
-            d_idle = true;
-            d_msg_length = 0;
+          if (d_msg_byte_count == d_msg_length) {
+            d_frame_check.reset ();
+            d_frame_check.update (d_msg_buffer, d_msg_length);
+            d_frame_check.get_check_bytes (d_check_bytes);
           }
         }
 
-        // Validate second checksum byte.
+        // Validate the frame check bytes. The message is discarded on
+        // the first mismatch.
         else {
-          uint8_t check_byte = m_get_data_byte (in, in_i);
-          in_i += 8;
-          if (check_byte == d_checksum_1 % 255) {
-            out[out_i++] = d_msg_length;
-            d_msg_received = true;
-            d_msg_byte_count = 0;
-          } else {
+          int check_index = d_msg_byte_count - d_msg_length;
+          uint8_t check_byte = m_get_data_byte (in, bit_i);
+          bit_i += 8;
+          if (check_byte != d_check_bytes[check_index]) {
             d_idle = true;
             d_msg_length = 0;
+          } else if (check_index < d_check_size - 1) {
+            d_msg_byte_count += 1;
+          } else {
+            out[out_i++] = d_msg_buffer[0];
+            d_msg_received = true;
+            d_msg_byte_count = 1;
           }
         }
       }
 
       // Tell runtime system how many input items we consumed on
-      // each input stream.
-      consume_each (in_i);
+      // each input stream. In packed mode a partially processed input
+      // item is retained and processing resumes from the saved bit
+      // offset on the next call.
+      if (d_packed) {
+        d_bit_offset = bit_i & 7;
+        consume_each (bit_i >> 3);
+      } else {
+        consume_each (bit_i);
+      }
 
       // Tell runtime system how many output items we produced.
       return out_i;
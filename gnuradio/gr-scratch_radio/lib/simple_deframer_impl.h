@@ -22,6 +22,7 @@
 #define INCLUDED_SCRATCH_RADIO_SIMPLE_DEFRAMER_IMPL_H
 
 #include <scratch_radio/simple_deframer.h>
+#include "frame_check.h"
 
 namespace gr {
   namespace scratch_radio {
@@ -29,23 +30,33 @@ namespace gr {
     class simple_deframer_impl : public simple_deframer
     {
      private:
+      bool d_packed;
+      bool d_extended;
+      int d_length_field_size;
+      uint32_t d_sync_word;
+      int d_max_sync_errors;
+      int d_bit_offset;
       bool d_idle;
       bool d_msg_received;
       uint32_t d_header;
       int d_msg_byte_count;
       int d_msg_length;
-      uint8_t d_msg_buffer[256];
-      uint32_t d_checksum_0;
-      uint32_t d_checksum_1;
+      uint8_t d_msg_buffer[2 + SIMPLE_FRAME_MAX_EXTENDED_LENGTH];
+      frame_check d_frame_check;
+      int d_check_size;
+      uint8_t d_check_bytes[4];
       int d_idle_count;
 
-      uint8_t m_get_data_byte (const uint8_t* in, int offset);
-      void m_update_checksum (uint8_t byte_data);
+      uint8_t m_get_data_byte (const uint8_t* in, int bit_offset);
 
      public:
-      simple_deframer_impl();
+      simple_deframer_impl(bool packed, uint32_t sync_word,
+        int max_sync_errors, bool extended, int frame_check);
       ~simple_deframer_impl();
 
+      void reset_state();
+      void set_max_sync_errors(int max_sync_errors);
+
       // Where all the action really happens
       void forecast (int noutput_items, gr_vector_int &ninput_items_required);
 
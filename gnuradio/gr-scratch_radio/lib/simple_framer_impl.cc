@@ -24,36 +24,51 @@
 
 #include <gnuradio/io_signature.h>
 #include "simple_framer_impl.h"
+#include "bit_format.h"
 
-static const uint8_t c_header[HEADER_LEN] = HEADER_BYTES;
+static const uint8_t c_preamble[PREAMBLE_LEN] = PREAMBLE_BYTES;
 
 namespace gr {
   namespace scratch_radio {
 
     simple_framer::sptr
-    simple_framer::make()
+    simple_framer::make(bool packed, uint32_t sync_word, bool extended,
+      int frame_check)
     {
       return gnuradio::get_initial_sptr
-        (new simple_framer_impl());
+        (new simple_framer_impl(packed, sync_word, extended, frame_check));
     }
 
     /*
      * The private constructor
      */
-    simple_framer_impl::simple_framer_impl()
+    simple_framer_impl::simple_framer_impl(bool packed, uint32_t sync_word, bool extended,
+      int frame_check)
       : gr::block("simple_framer",
               gr::io_signature::make(1, 1, sizeof(uint8_t)),
-              gr::io_signature::make(1, 1, sizeof(uint8_t)))
+              gr::io_signature::make(1, 1, sizeof(uint8_t))),
+        d_frame_check(frame_check)
     {
-      d_idle = true;
-      d_header_index = 0;
-      d_byte_count = 0;
-      d_checksum_0 = 0;
-      d_checksum_1 = 0;
-      d_idle_count = 0;
+      d_packed = packed;
+      d_extended = extended;
+      d_byte_items = packed ? 1 : 8;
+      d_trailer_index = HEADER_LEN + (extended ? 2 : 1);
+      d_check_size = d_frame_check.check_size();
+      d_idle_tag_key = pmt::intern(IDLE_TAG_KEY);
+
+      // The header consists of the fixed preamble followed by the sync
+      // word, least significant byte first.
+      for (int i = 0; i < PREAMBLE_LEN; i++) {
+        d_header[i] = c_preamble[i];
+      }
+      for (int i = PREAMBLE_LEN; i < HEADER_LEN; i++) {
+        d_header[i] = (uint8_t) sync_word;
+        sync_word >>= 8;
+      }
+      reset_state();
       set_max_output_buffer(4096);
       set_max_noutput_items(256);
-      set_output_multiple(8);
+      set_output_multiple(d_byte_items);
     }
 
     /*
@@ -66,33 +81,56 @@ namespace gr {
     void
     simple_framer_impl::forecast (int noutput_items, gr_vector_int &ninput_items_required)
     {
-      ninput_items_required[0] = noutput_items / 8;
+      ninput_items_required[0] = noutput_items / d_byte_items;
     }
 
+    void
+    simple_framer_impl::reset_state()
+    {
+      d_idle = true;
+      d_header_index = 0;
+      d_byte_count = 0;
+      d_length_field = 0;
+      d_frame_check.reset();
+      d_idle_count = 0;
+    }
+
+    /*
+     * In packed mode data bytes are sent as a single output item.
+     * Otherwise they are expanded to eight output items, least
+     * significant bit first.
+     */
     void
     simple_framer_impl::m_send_data_byte(uint8_t* out, int offset, uint8_t byte_data)
     {
+      if (d_packed) {
+        out[offset] = byte_data;
+        return;
+      }
       for (int i = 0; i < 8; i++) {
         out[offset+i] = byte_data & 1;
         byte_data >>= 1;
       }
     }
 
+    /*
+     * In packed mode idle bytes are sent as a single zero valued
+     * output item which is marked using the idle tag. Otherwise they
+     * are sent as eight idle bits.
+     */
     void
     simple_framer_impl::m_send_idle_byte(uint8_t* out, int offset)
     {
+      if (d_packed) {
+        out[offset] = 0x00;
+        add_item_tag(0, nitems_written(0) + offset, d_idle_tag_key, pmt::PMT_T);
+        return;
+      }
       for (int i = 0; i < 8; i++) {
-        out[offset+i] = 0xFF;
+        out[offset+i] = IDLE_BIT;
       }
     }
 
-    void
-    simple_framer_impl::m_update_checksum (uint8_t byte_data)
-    {
-      d_checksum_0 += byte_data;
-      d_checksum_1 += d_checksum_0;
-    }
-
     int
     simple_framer_impl::general_work (int noutput_items,
                        gr_vector_int &ninput_items,
@@ -104,20 +142,23 @@ namespace gr {
       int in_i = 0;
       int out_i = 0;
 
-      while ((in_i < ninput_items[0]) && (out_i <= noutput_items - 8)) {
+      while ((in_i < ninput_items[0]) && (out_i <= noutput_items - d_byte_items)) {
 
         // Process out of frame idle flags until a size byte is
-        // detected, in which case we start generating the header.
+        // detected, in which case we start generating the header. In
+        // the extended frame format this is the first byte of the two
+        // byte length field.
         // Note that each idle flag maps to a single idle bit which
         // means we have 1/8 of the latency in the input buffer when
-        // processing idle cycles.
+        // processing idle cycles. In packed mode each idle byte is
+        // a single output item.
         if (d_idle) {
           uint8_t this_byte = in[in_i++];
           if (this_byte == 0x00) {
             if (d_idle_count == 0) {
               d_idle_count = IDLE_DOWNSAMPLE_RATE - 1;
               m_send_idle_byte (out, out_i);
-              out_i += 8;
+              out_i += d_byte_items;
             } else {
               d_idle_count -= 1;
             }
@@ -125,64 +166,74 @@ namespace gr {
           else {
             d_idle = false;
             d_idle_count = 0;
-            m_send_data_byte (out, out_i, c_header[0]);
-            d_byte_count = this_byte;
+            m_send_data_byte (out, out_i, d_header[0]);
+            d_length_field = this_byte;
+            d_byte_count = d_extended ? 0 : this_byte;
             d_header_index = 1;
-            out_i += 8;
+            out_i += d_byte_items;
           }
         }
 
         // Perform header insertion.
         else if (d_header_index < HEADER_LEN) {
-          m_send_data_byte (out, out_i, c_header[d_header_index++]);
-          out_i += 8;
+          m_send_data_byte (out, out_i, d_header[d_header_index++]);
+          out_i += d_byte_items;
         }
 
         // Add the length field.
         else if (d_header_index == HEADER_LEN) {
-          m_send_data_byte (out, out_i, d_byte_count);
-          d_checksum_0 = 0;
-          d_checksum_1 = 0;
-          m_update_checksum (d_byte_count);
+          m_send_data_byte (out, out_i, d_length_field);
+          d_frame_check.reset();
+          d_frame_check.update (d_length_field);
+          d_header_index += 1;
+          out_i += d_byte_items;
+        }
+
+        // Add the second byte of an extended length field, which is
+        // read from the input once the first byte has been sent.
+        else if (d_header_index < d_trailer_index) {
+          uint8_t this_byte = in[in_i++];
+          m_send_data_byte (out, out_i, this_byte);
+          d_frame_check.update (this_byte);
+          d_byte_count = ((d_length_field << 8) | this_byte) &
+            SIMPLE_FRAME_EXTENDED_LENGTH_MASK;
           d_header_index += 1;
-          out_i += 8;
+          out_i += d_byte_items;
         }
 
         // Transfer the payload data.
         else if (d_byte_count > 0) {
           uint8_t this_byte = in[in_i++];
           m_send_data_byte (out, out_i, this_byte);
-          m_update_checksum (this_byte);
+          d_frame_check.update (this_byte);
           d_byte_count -= 1;
-          out_i += 8;
+          out_i += d_byte_items;
         }
 
-        // Append the first checksum byte.
-        else if (d_header_index == HEADER_LEN + 1) {
-          m_send_data_byte (out, out_i, d_checksum_0 % 255);
-          d_header_index += 1;
-          out_i += 8;
-        }
-
-        // Append the second checksum byte.
-        else if (d_header_index == HEADER_LEN + 2) {
-          m_send_data_byte (out, out_i, d_checksum_1 % 255);
+        // Append the frame check bytes, which are calculated once all
+        // the payload data has been sent.
+        else if (d_header_index < d_trailer_index + d_check_size) {
+          int check_index = d_header_index - d_trailer_index;
+          if (check_index == 0) {
+            d_frame_check.get_check_bytes (d_check_bytes);
+          }
+          m_send_data_byte (out, out_i, d_check_bytes[check_index]);
           d_header_index += 1;
-          out_i += 8;
+          out_i += d_byte_items;
         }
 
         // Append the frame terminator byte.
-        else if (d_header_index == HEADER_LEN + 3) {
+        else if (d_header_index == d_trailer_index + d_check_size) {
           m_send_data_byte (out, out_i, FRAME_TERMINATOR);
           d_header_index += 1;
-          out_i += 8;
+          out_i += d_byte_items;
         }
 
         // Insert idle byte at end of frame.
         else {
           m_send_idle_byte (out, out_i);
           d_idle = true;
-          out_i += 8;
+          out_i += d_byte_items;
         }
       }
 
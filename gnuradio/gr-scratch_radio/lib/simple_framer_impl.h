@@ -22,10 +22,11 @@
 #define INCLUDED_SCRATCH_RADIO_SIMPLE_FRAMER_IMPL_H
 
 #include <scratch_radio/simple_framer.h>
+#include "frame_check.h"
 
-#define HEADER_LEN 10
-#define HEADER_BYTES \
-  {0xA5, 0xF0, 0xA5, 0xF0, 0xA5, 0xF0, 0x7E, 0x81, 0xC3, 0x3C}
+#define PREAMBLE_LEN 6
+#define PREAMBLE_BYTES {0xA5, 0xF0, 0xA5, 0xF0, 0xA5, 0xF0}
+#define HEADER_LEN (PREAMBLE_LEN + 4)
 #define FRAME_TERMINATOR 0xFF
 
 #define IDLE_DOWNSAMPLE_RATE 10
@@ -36,21 +37,31 @@ namespace gr {
     class simple_framer_impl : public simple_framer
     {
      private:
+      bool d_packed;
+      bool d_extended;
+      int d_byte_items;
+      int d_trailer_index;
+      int d_check_size;
+      pmt::pmt_t d_idle_tag_key;
+      uint8_t d_header[HEADER_LEN];
       bool d_idle;
       int d_header_index;
       int d_byte_count;
-      uint32_t d_checksum_0;
-      uint32_t d_checksum_1;
+      uint8_t d_length_field;
+      frame_check d_frame_check;
+      uint8_t d_check_bytes[4];
       int d_idle_count;
 
-      void m_send_data_byte (uint8_t* out, int offset, uint8_t byteData);
+      void m_send_data_byte (uint8_t* out, int offset, uint8_t byte_data);
       void m_send_idle_byte (uint8_t* out, int offset);
-      void m_update_checksum (uint8_t byte_data);
 
      public:
-      simple_framer_impl();
+      simple_framer_impl(bool packed, uint32_t sync_word, bool extended,
+        int frame_check);
       ~simple_framer_impl();
 
+      void reset_state();
+
       // Where all the action really happens
       void forecast (int noutput_items, gr_vector_int &ninput_items_required);
 
@@ -22,6 +22,7 @@
 #include "config.h"
 #endif
 
+#include <stdexcept>
 #include <gnuradio/io_signature.h>
 #include "symbol_sync_impl.h"
 
@@ -29,16 +30,16 @@ namespace gr {
   namespace scratch_radio {
 
     symbol_sync::sptr
-    symbol_sync::make(int baud_rate, int sample_rate)
+    symbol_sync::make(int baud_rate, int sample_rate, bool packed)
     {
       return gnuradio::get_initial_sptr
-        (new symbol_sync_impl(baud_rate, sample_rate));
+        (new symbol_sync_impl(baud_rate, sample_rate, packed));
     }
 
     /*
      * The private constructor
      */
-    symbol_sync_impl::symbol_sync_impl(int baud_rate, int sample_rate)
+    symbol_sync_impl::symbol_sync_impl(int baud_rate, int sample_rate, bool packed)
       : gr::block("symbol_sync",
               gr::io_signature::make(1, 1, sizeof(float)),
               gr::io_signature::make(1, 1, sizeof(uint8_t)))
@@ -46,8 +47,8 @@ namespace gr {
       d_baud_rate = baud_rate;
       d_sample_rate = sample_rate;
       d_sample_ratio = 1 + sample_rate / baud_rate;
-      d_nco_count = sample_rate;
-      d_symbol_req = true;
+      d_packed = packed;
+      reset_state();
       set_history(2);
     }
 
@@ -58,10 +59,37 @@ namespace gr {
     {
     }
 
+    /*
+     * Runtime reconfiguration of the expected symbol rate.
+     */
+    void
+    symbol_sync_impl::set_baud_rate(int baud_rate)
+    {
+      gr::thread::scoped_lock guard(d_setlock);
+      if ((baud_rate <= 0) || (baud_rate > d_sample_rate)) {
+        throw std::invalid_argument ("symbol_sync: baud rate out of range");
+      }
+      d_baud_rate = baud_rate;
+      d_sample_ratio = 1 + d_sample_rate / baud_rate;
+    }
+
+    void
+    symbol_sync_impl::reset_state()
+    {
+      gr::thread::scoped_lock guard(d_setlock);
+      d_nco_count = d_sample_rate;
+      d_symbol_req = true;
+      d_out_bits = 0;
+      d_out_bit_count = 0;
+    }
+
     void
     symbol_sync_impl::forecast (int noutput_items, gr_vector_int &ninput_items_required)
     {
-      ninput_items_required[0] = noutput_items * d_sample_ratio;
+      if (d_packed)
+        ninput_items_required[0] = noutput_items * 8 * d_sample_ratio;
+      else
+        ninput_items_required[0] = noutput_items * d_sample_ratio;
     }
 
     int
@@ -70,6 +98,7 @@ namespace gr {
                        gr_vector_const_void_star &input_items,
                        gr_vector_void_star &output_items)
     {
+      gr::thread::scoped_lock guard(d_setlock);
       const float *in = (const float *) input_items[0];
       uint8_t *out = (uint8_t *) output_items[0];
       int in_i = 0;
@@ -89,12 +118,24 @@ namespace gr {
         }
 
         // Sample data at half the symbol period after detecting a
-        // zero crossing and full symbol periods thereafter.
+        // zero crossing and full symbol periods thereafter. In packed
+        // mode the sampled bits are accumulated least significant bit
+        // first and output once eight bits have been received.
         if (d_nco_count >= d_sample_rate) {
           d_nco_count -= d_sample_rate;
           d_symbol_req = true;
         } else if (d_symbol_req && (d_nco_count >= d_sample_rate / 2)) {
-          out[out_i++] = (this_sample < 0) ? 0 : 1;
+          uint8_t this_bit = (this_sample < 0) ? 0 : 1;
+          if (!d_packed) {
+            out[out_i++] = this_bit;
+          } else {
+            d_out_bits |= this_bit << d_out_bit_count;
+            if (++d_out_bit_count == 8) {
+              out[out_i++] = d_out_bits;
+              d_out_bits = 0;
+              d_out_bit_count = 0;
+            }
+          }
           d_symbol_req = false;
         }
       }
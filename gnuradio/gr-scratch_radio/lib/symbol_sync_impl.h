@@ -34,11 +34,18 @@ namespace gr {
       int d_sample_ratio;
       int d_nco_count;
       bool d_symbol_req;
+      bool d_packed;
+      uint8_t d_out_bits;
+      int d_out_bit_count;
 
      public:
-      symbol_sync_impl(int baud_rate, int sample_rate);
+      symbol_sync_impl(int baud_rate, int sample_rate, bool packed);
       ~symbol_sync_impl();
 
+      void reset_state();
+
+      void set_baud_rate(int baud_rate);
+
       // Where all the action really happens
       void forecast (int noutput_items, gr_vector_int &ninput_items_required);
 
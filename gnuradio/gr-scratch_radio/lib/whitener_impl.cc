@@ -0,0 +1,116 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifdef HAVE_CONFIG_H
+#include "config.h"
+#endif
+
+#include <gnuradio/io_signature.h>
+#include "whitener_impl.h"
+#include "whitening.h"
+#include "bit_format.h"
+
+namespace gr {
+  namespace scratch_radio {
+
+    whitener::sptr
+    whitener::make(bool packed)
+    {
+      return gnuradio::get_initial_sptr
+        (new whitener_impl(packed));
+    }
+
+    /*
+     * The private constructor
+     */
+    whitener_impl::whitener_impl(bool packed)
+      : gr::sync_block("whitener",
+              gr::io_signature::make(1, 1, sizeof(uint8_t)),
+              gr::io_signature::make(1, 1, sizeof(uint8_t)))
+    {
+      d_packed = packed;
+      d_idle_tag_key = pmt::intern(IDLE_TAG_KEY);
+      reset_state();
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    whitener_impl::~whitener_impl()
+    {
+    }
+
+    void
+    whitener_impl::reset_state()
+    {
+      d_history = 0;
+    }
+
+    int
+    whitener_impl::work(int noutput_items,
+        gr_vector_const_void_star &input_items,
+        gr_vector_void_star &output_items)
+    {
+      const uint8_t* in = (const uint8_t*) input_items[0];
+      uint8_t* out = (uint8_t*) output_items[0];
+
+      // Scramble packed data a byte at a time. Idle bytes are passed
+      // through as zero valued bytes, with the idle tag being
+      // propagated by the runtime.
+      if (d_packed) {
+        std::vector<tag_t> idle_tags;
+        uint64_t in_offset = nitems_read(0);
+        std::vector<bool> idle_flags(noutput_items, false);
+        get_tags_in_range(idle_tags, 0, in_offset, in_offset + noutput_items, d_idle_tag_key);
+        for (size_t t = 0; t < idle_tags.size(); t++) {
+          idle_flags[idle_tags[t].offset - in_offset] = true;
+        }
+        for (int i = 0; i < noutput_items; i++) {
+          if (idle_flags[i]) {
+            out[i] = 0x00;
+            continue;
+          }
+          uint8_t byte_data = in[i] ^ whitening_sequence(d_history);
+          d_history = (d_history >> 8) | ((uint32_t) byte_data << 24);
+          out[i] = byte_data;
+        }
+      }
+
+      // Scramble unpacked data a bit at a time, passing through idle
+      // bits unchanged.
+      else {
+        for (int i = 0; i < noutput_items; i++) {
+          if (in[i] == IDLE_BIT) {
+            out[i] = IDLE_BIT;
+            continue;
+          }
+          uint8_t bit_data = ((in[i] > 0) ? 1 : 0) ^ (whitening_sequence(d_history) & 1);
+          d_history = (d_history >> 1) | ((uint32_t) bit_data << 31);
+          out[i] = bit_data;
+        }
+      }
+
+      // Tell runtime system how many output items we produced.
+      return noutput_items;
+    }
+
+  } /* namespace scratch_radio */
+} /* namespace gr */
+
@@ -0,0 +1,42 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2018 <+YOU OR YOUR COMPANY+>.
+ *
+ * This is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 3, or (at your option)
+ * any later version.
+ *
+ * This software is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this software; see the file COPYING.  If not, write to
+ * the Free Software Foundation, Inc., 51 Franklin Street,
+ * Boston, MA 02110-1301, USA.
+ */
+
+#ifndef INCLUDED_SCRATCH_RADIO_WHITENING_H
+#define INCLUDED_SCRATCH_RADIO_WHITENING_H
+
+#include <stdint.h>
+
+/*
+ * Data whitening uses the self synchronising scrambler polynomial
+ * x^17 + x^12 + 1, as used by G3RUH packet radio modems. The history
+ * of scrambled bits is held in a 32 bit register, with the most
+ * recent bit in the most significant bit position. Since the shortest
+ * feedback tap is longer than eight bits, up to eight new bits may be
+ * processed at once using the whitening sequence derived from the
+ * history, least significant bit first.
+ */
+static inline uint8_t
+whitening_sequence (uint32_t history)
+{
+  return (uint8_t) ((history >> 20) ^ (history >> 15));
+}
+
+#endif /* INCLUDED_SCRATCH_RADIO_WHITENING_H */
+
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 <+YOU OR YOUR COMPANY+>.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+import pmt
+import scratch_radio_swig as scratch_radio
+
+class qa_burst_gap_fill_cc (gr_unittest.TestCase):
+
+    def setUp (self):
+        self.tb = gr.top_block ()
+
+    def tearDown (self):
+        self.tb = None
+
+    def _make_tag (self, offset, key):
+        tag = gr.tag_t()
+        tag.offset = offset
+        tag.key = pmt.intern(key)
+        tag.value = pmt.PMT_T
+        return tag
+
+    # The burst is passed through unchanged, with zero valued samples
+    # inserted before and after it. The burst position depends on the
+    # block scheduling, so it is located using the copied tags.
+    def test_001_t (self):
+        srcData = (1.0, 1.0j, -1.0, -1.0j)
+        tags = [self._make_tag(0, "tx_sob"), self._make_tag(3, "tx_eob")]
+        source = blocks.vector_source_c(srcData, False, 1, tags)
+        gapFill = scratch_radio.burst_gap_fill_cc(100000)
+        head = blocks.head(gr.sizeof_gr_complex, 4000)
+        sink = blocks.vector_sink_c()
+        self.tb.connect(source, gapFill, head, sink)
+        self.tb.run()
+        burstTags = [(pmt.symbol_to_string(tag.key), tag.offset)
+            for tag in sink.tags()]
+        self.assertEqual(2, len(burstTags))
+        burstStart = burstTags[0][1]
+        self.assertEqual([("tx_sob", burstStart), ("tx_eob", burstStart + 3)],
+            burstTags)
+        refData = ((0.0,) * burstStart + srcData +
+            (0.0,) * (4000 - burstStart - 4))
+        self.assertComplexTuplesAlmostEqual(refData, sink.data())
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_burst_gap_fill_cc, "qa_burst_gap_fill_cc.xml")
+
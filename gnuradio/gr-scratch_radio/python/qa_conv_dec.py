@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 <+YOU OR YOUR COMPANY+>.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+import scratch_radio_swig as scratch_radio
+
+class qa_conv_dec (gr_unittest.TestCase):
+
+    def setUp (self):
+        self.tb = gr.top_block ()
+
+    def tearDown (self):
+        self.tb = None
+
+    def encode (self, srcData):
+        tb = gr.top_block ()
+        source = blocks.vector_source_b(srcData)
+        encoder = scratch_radio.conv_enc()
+        sink = blocks.vector_sink_b()
+        tb.connect(source, encoder)
+        tb.connect(encoder, sink)
+        tb.run()
+        return list(sink.data())
+
+    def decode (self, codeData):
+        tb = gr.top_block ()
+        source = blocks.vector_source_b(codeData)
+        decoder = scratch_radio.conv_dec()
+        sink = blocks.vector_sink_b()
+        tb.connect(source, decoder)
+        tb.connect(decoder, sink)
+        tb.run()
+        return sink.data()
+
+    # Corrects isolated bit errors in the received code bits. The data
+    # is followed by zero bits so that it is all output by the decoder.
+    def test_001_t (self):
+        srcData = tuple([(i * i + i / 5) % 2 for i in range(256)])
+        codeData = self.encode (srcData + (0,) * 64)
+        for errorOffset in (10, 50, 51, 120, 300, 450):
+            codeData[errorOffset] ^= 1
+        decodedData = self.decode (codeData)
+        self.assertEqual(srcData, decodedData[0:256])
+
+    # Selects the correct code bit alignment when the received code
+    # bits are offset by one bit.
+    def test_002_alignment (self):
+        srcData = tuple([(i * i + i / 5) % 2 for i in range(256)])
+        codeData = [1] + self.encode (srcData + (0,) * 64)
+        decodedData = self.decode (codeData)
+        self.assertEqual(srcData, decodedData[1:257])
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_conv_dec, "qa_conv_dec.xml")
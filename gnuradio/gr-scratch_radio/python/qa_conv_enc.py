@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 <+YOU OR YOUR COMPANY+>.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+import pmt
+import scratch_radio_swig as scratch_radio
+
+class qa_conv_enc (gr_unittest.TestCase):
+
+    def setUp (self):
+        self.tb = gr.top_block ()
+
+    def tearDown (self):
+        self.tb = None
+
+    def test_001_t (self):
+        srcData = (1, 0, 1, 1, 0, 0, 1, 0, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF,
+            0xFF, 0xFF, 0xFF, 0xFF, 0xFF)
+        refData = (1, 1, 1, 0, 0, 0, 1, 0, 0, 1, 0, 1, 1, 1, 1, 1,
+            0, 1, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0,
+            0xFF, 0xFF, 0xFF, 0xFF)
+        source = blocks.vector_source_b(srcData)
+        encoder = scratch_radio.conv_enc()
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, encoder)
+        self.tb.connect(encoder, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_002_packed (self):
+        srcData = (0x4D, 0x00, 0x00)
+        refData = (0x47, 0xFA, 0x82, 0x03, 0x00, 0x00)
+        idleTags = []
+        for offset in (1, 2):
+            idleTag = gr.tag_t()
+            idleTag.offset = offset
+            idleTag.key = pmt.intern("idle")
+            idleTag.value = pmt.PMT_T
+            idleTags.append(idleTag)
+        source = blocks.vector_source_b(srcData, False, 1, idleTags)
+        encoder = scratch_radio.conv_enc(True)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, encoder)
+        self.tb.connect(encoder, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+        idleOffsets = sorted([tag.offset for tag in sink.tags()
+            if pmt.symbol_to_string(tag.key) == "idle"])
+        self.assertEqual([4, 5], idleOffsets)
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_conv_enc, "qa_conv_enc.xml")
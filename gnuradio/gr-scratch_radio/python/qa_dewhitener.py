@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 <+YOU OR YOUR COMPANY+>.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+import scratch_radio_swig as scratch_radio
+
+class qa_dewhitener (gr_unittest.TestCase):
+
+    def setUp (self):
+        self.tb = gr.top_block ()
+
+    def tearDown (self):
+        self.tb = None
+
+    def whiten (self, srcData, packed):
+        tb = gr.top_block ()
+        source = blocks.vector_source_b(srcData)
+        whitener = scratch_radio.whitener(packed)
+        sink = blocks.vector_sink_b()
+        tb.connect(source, whitener)
+        tb.connect(whitener, sink)
+        tb.run()
+        return sink.data()
+
+    # The dewhitener is synchronised once 17 bits have been received,
+    # so it recovers the data after an arbitrary received prefix.
+    def test_001_t (self):
+        srcData = tuple([(i * i + i / 5) % 2 for i in range(256)])
+        lineData = (1, 1, 0, 1, 0) + self.whiten (srcData, False)
+        source = blocks.vector_source_b(lineData)
+        dewhitener = scratch_radio.dewhitener()
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, dewhitener)
+        self.tb.connect(dewhitener, sink)
+        self.tb.run()
+        self.assertEqual(srcData[17:], sink.data()[22:])
+
+    def test_002_packed (self):
+        srcData = tuple([(i * 37 + i / 3) % 256 for i in range(64)])
+        lineData = (0xA5, 0x3C) + self.whiten (srcData, True)
+        source = blocks.vector_source_b(lineData)
+        dewhitener = scratch_radio.dewhitener(True)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, dewhitener)
+        self.tb.connect(dewhitener, sink)
+        self.tb.run()
+        self.assertEqual(srcData[3:], sink.data()[5:])
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_dewhitener, "qa_dewhitener.xml")
@@ -55,5 +55,17 @@ class qa_manc_dec (gr_unittest.TestCase):
         self.tb.run()
         self.assertEqual(refData, sink.data())
 
+    def test_003_packed (self):
+        srcData = (0x99, 0xA5, 0xA5)
+        for (invert, refData) in ((False, (0x65,)), (True, (0x9A,))):
+            self.tb = gr.top_block ()
+            source = blocks.vector_source_b(srcData)
+            decoder = scratch_radio.manc_dec(invert, True)
+            sink = blocks.vector_sink_b()
+            self.tb.connect(source, decoder)
+            self.tb.connect(decoder, sink)
+            self.tb.run()
+            self.assertEqual(refData, sink.data())
+
 if __name__ == '__main__':
     gr_unittest.run(qa_manc_dec, "qa_manc_dec.xml")
@@ -21,6 +21,7 @@
 
 from gnuradio import gr, gr_unittest
 from gnuradio import blocks
+import pmt
 import scratch_radio_swig as scratch_radio
 
 class qa_manc_enc (gr_unittest.TestCase):
@@ -55,5 +56,23 @@ class qa_manc_enc (gr_unittest.TestCase):
         self.tb.run()
         self.assertEqual(refData, sink.data())
 
+    def test_003_packed (self):
+        srcData = (0x0F, 0x00, 0x5A)
+        refData = (0xAA, 0x55, 0x00, 0x00, 0x99, 0x66)
+        idleTag = gr.tag_t()
+        idleTag.offset = 1
+        idleTag.key = pmt.intern("idle")
+        idleTag.value = pmt.PMT_T
+        source = blocks.vector_source_b(srcData, False, 1, [idleTag])
+        encoder = scratch_radio.manc_enc(False, True)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, encoder)
+        self.tb.connect(encoder, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+        idleOffsets = sorted([tag.offset for tag in sink.tags()
+            if pmt.symbol_to_string(tag.key) == "idle"])
+        self.assertEqual([2, 3], idleOffsets)
+
 if __name__ == '__main__':
     gr_unittest.run(qa_manc_enc, "qa_manc_enc.xml")
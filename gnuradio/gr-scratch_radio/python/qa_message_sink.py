@@ -19,6 +19,8 @@
 # Boston, MA 02110-1301, USA.
 #
 
+import os
+import time
 from gnuradio import gr, gr_unittest
 from gnuradio import blocks
 import scratch_radio_swig as scratch_radio
@@ -59,5 +61,88 @@ class qa_message_sink (gr_unittest.TestCase):
             self.assertEqual(message, result)
         msgFile.close()
 
+    def test_002_t (self):
+        # Constructing a sink on a named pipe with no reader must not
+        # block, and the sink attaches once a reader is present.
+        msgFileName = "/tmp/gr-scratch.qa_message_sink.pipe"
+        if os.path.exists(msgFileName):
+            os.remove(msgFileName)
+        os.mkfifo(msgFileName)
+        sink = scratch_radio.message_sink(msgFileName)
+        self.assertFalse(sink.is_attached())
+
+        readFd = os.open(msgFileName, os.O_RDONLY | os.O_NONBLOCK)
+        time.sleep(0.2)
+        srcData = (5, ord('h'), ord('e'), ord('l'), ord('l'), ord('o'), 0)
+        source = blocks.vector_source_b(srcData)
+        self.tb.connect(source, sink)
+        self.tb.run ()
+        self.assertTrue(sink.is_attached())
+        self.assertEqual("hello\n", os.read(readFd, 100))
+        os.close(readFd)
+        os.remove(msgFileName)
+
+    def test_003_t (self):
+        # Messages held back by the flush latency limit are written out
+        # when the flow graph stops.
+        messages = [
+            "This is a deferred sink test message.",
+            "This is a second deferred sink test message."]
+
+        srcData = []
+        for message in messages:
+            srcData.append(len(message))
+            for i in range(len(message)):
+                srcData.append(ord(message[i]))
+            srcData.append(0)
+
+        msgFileName = "/tmp/gr-scratch.qa_message_sink.txt"
+        open(msgFileName, 'w').close()
+
+        sink = scratch_radio.message_sink(msgFileName, 60000)
+        source = blocks.vector_source_b(srcData)
+        self.tb.connect(source, sink)
+        self.tb.run ()
+
+        msgFile = open(msgFileName, 'r')
+        for message in messages:
+            result = msgFile.readline().rstrip()
+            self.assertEqual(message, result)
+        msgFile.close()
+
+    def test_004_extended (self):
+        # Fragmented messages are reassembled, and messages with missing
+        # fragments are discarded.
+        messages = [
+            "This is an extended sink test message.",
+            "Z" * 3000,
+            "This is a message after a fragmented message."]
+
+        srcData = [0x80, len(messages[0])]
+        srcData.extend([ord(c) for c in messages[0]])
+        srcData.extend([0xC7, 0xFF])
+        srcData.extend([ord('Z')] * 2047)
+        srcData.extend([0x8B, 0xB9])
+        srcData.extend([ord('Z')] * 953)
+        srcData.extend([0x00, 0x00])
+        srcData.extend([0x88, 0x05])
+        srcData.extend([ord('X')] * 5)
+        srcData.extend([0x80, len(messages[2])])
+        srcData.extend([ord(c) for c in messages[2]])
+        srcData.append(0x00)
+
+        msgFileName = "/tmp/gr-scratch.qa_message_sink.txt"
+        open(msgFileName, 'w').close()
+
+        sink = scratch_radio.message_sink(msgFileName, 0, True)
+        source = blocks.vector_source_b(srcData)
+        self.tb.connect(source, sink)
+        self.tb.run ()
+
+        msgFile = open(msgFileName, 'r')
+        results = [line.rstrip() for line in msgFile.readlines()]
+        msgFile.close()
+        self.assertEqual(messages, results)
+
 if __name__ == '__main__':
     gr_unittest.run(qa_message_sink, "qa_message_sink.xml")
@@ -67,5 +67,65 @@ class qa_message_source (gr_unittest.TestCase):
                 retry = False
         self.assertEqual(refData, genData)
 
+    def test_002_t (self):
+        messages = [
+            "This is a source test message.",
+            "X" * 300,
+            "This is a message after an oversized message."]
+
+        sourceFileName = "/tmp/gr-scratch.qa_message_source.txt"
+        sourceFile = open(sourceFileName, 'w')
+        refData = []
+        for message in messages:
+            if len(message) <= 255:
+                refData.append(len(message))
+                for i in range(len(message)):
+                    refData.append(ord(message[i]))
+            sourceFile.write(message)
+            sourceFile.write("\n")
+        refData = tuple(refData)
+        sourceFile.close()
+
+        # Oversized messages are discarded and all the remaining queued
+        # messages are sent back to back.
+        source = scratch_radio.message_source(sourceFileName, 300)
+        sink = blocks.vector_sink_b()
+        head = blocks.head(1, len(refData))
+        self.tb.connect(source, head)
+        self.tb.connect(head, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_003_extended (self):
+        messages = [
+            "This is an extended source test message.",
+            "Y" * 3000]
+
+        sourceFileName = "/tmp/gr-scratch.qa_message_source.txt"
+        sourceFile = open(sourceFileName, 'w')
+        for message in messages:
+            sourceFile.write(message)
+            sourceFile.write("\n")
+        sourceFile.close()
+
+        # Messages which are longer than the maximum extended frame
+        # length are split into fragments, each with its own length
+        # field giving the fragment flag and fragment index.
+        refData = [0x80, len(messages[0])]
+        refData.extend([ord(c) for c in messages[0]])
+        refData.extend([0xC7, 0xFF])
+        refData.extend([ord('Y')] * 2047)
+        refData.extend([0x8B, 0xB9])
+        refData.extend([ord('Y')] * 953)
+        refData = tuple(refData)
+
+        source = scratch_radio.message_source(sourceFileName, 3000, True)
+        sink = blocks.vector_sink_b()
+        head = blocks.head(1, len(refData))
+        self.tb.connect(source, head)
+        self.tb.connect(head, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
 if __name__ == '__main__':
     gr_unittest.run(qa_message_source, "qa_message_source.xml")
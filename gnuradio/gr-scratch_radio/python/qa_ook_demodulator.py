@@ -68,5 +68,33 @@ class qa_ook_demodulator (gr_unittest.TestCase):
         self.tb.run()
         self.assertFloatTuplesAlmostEqual(refData, sink.data())
 
+    # The moving averages are periodically recalculated, so rounding
+    # errors do not build up over long runs of input samples.
+    def test_002_long_run (self):
+        srcData = (0.6+0.8j,) * 200000
+        source = blocks.vector_source_c(srcData)
+        demodulator = scratch_radio.ook_demodulator(2, 8)
+        sink = blocks.vector_sink_f()
+        self.tb.connect(source, demodulator)
+        self.tb.connect(demodulator, sink)
+        self.tb.run()
+        self.assertFloatTuplesAlmostEqual((0.0,) * 1000, sink.data()[-1000:], 5)
+
+    # Each decimated output sample is the average of the undecimated
+    # output samples for the decimation period.
+    def test_003_decimation (self):
+        srcData = ((0.0,) * 5 + (1.0,) * 4 + (0.0,) * 4 + (1.0,) * 8) * 4
+        source = blocks.vector_source_c(srcData)
+        demodulator = scratch_radio.ook_demodulator(2, 8)
+        decimatingDemodulator = scratch_radio.ook_demodulator(2, 8, 3)
+        sink = blocks.vector_sink_f()
+        decimatedSink = blocks.vector_sink_f()
+        self.tb.connect(source, demodulator, sink)
+        self.tb.connect(source, decimatingDemodulator, decimatedSink)
+        self.tb.run()
+        refData = sink.data()
+        refData = [sum(refData[i:i+3]) / 3 for i in range(0, len(refData), 3)]
+        self.assertFloatTuplesAlmostEqual(refData, decimatedSink.data(), 5)
+
 if __name__ == '__main__':
     gr_unittest.run(qa_ook_demodulator, "qa_ook_demodulator.xml")
@@ -19,8 +19,10 @@
 # Boston, MA 02110-1301, USA.
 #
 
+import time
 from gnuradio import gr, gr_unittest
 from gnuradio import blocks
+import pmt
 import scratch_radio_swig as scratch_radio
 
 class qa_ook_modulator (gr_unittest.TestCase):
@@ -32,11 +34,12 @@ class qa_ook_modulator (gr_unittest.TestCase):
         self.tb = None
 
     def test_001_t (self):
-        srcData = (0, 1, 0, 1, 0, 0)
-        refData = (0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0, 0.0,
-            0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0)
+        srcData = (0, 1, 0, 1, 1, 0)
+        refData = (0.0, 0.0, 0.0, 0.0, -0.5j, -0.5j, -0.5j, -0.5j,
+            0.0, 0.0, 0.0, 0.0, -0.5j, -0.5j, -0.5j, -0.5j,
+            -0.5j, -0.5j, -0.5j, -0.5j, 0.0, 0.0, 0.0, 0.0)
         source = blocks.vector_source_b(srcData)
-        modulator = scratch_radio.ook_modulator(2, 8)
+        modulator = scratch_radio.ook_modulator(1000, 4000, 0)
         sink = blocks.vector_sink_c()
         self.tb.connect(source, modulator)
         self.tb.connect(modulator, sink)
@@ -44,16 +47,73 @@ class qa_ook_modulator (gr_unittest.TestCase):
         self.assertComplexTuplesAlmostEqual(refData, sink.data())
 
     def test_002_t (self):
-        srcData = (0, 1, 0, 1, 0, 0)
-        refData = (0.0, 0.0, 0.0, 2.0/3.0, 1.0, 1.0, 2.0/3.0,
-            0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0/3.0, 0.0, 0.0, 0.0)
+        srcData = (1, 0, 1)
+        refData = (-0.5j, 0.5, 0.5j, -0.5, 0.0, 0.0, 0.0, 0.0,
+            -0.5j, 0.5, 0.5j, -0.5)
         source = blocks.vector_source_b(srcData)
-        modulator = scratch_radio.ook_modulator(3, 10)
+        modulator = scratch_radio.ook_modulator(1000, 4000, 1000)
         sink = blocks.vector_sink_c()
         self.tb.connect(source, modulator)
         self.tb.connect(modulator, sink)
         self.tb.run()
         self.assertComplexTuplesAlmostEqual(refData, sink.data())
 
+    # Each input symbol is interpolated to a whole number of output
+    # samples, which sets the relative rate of the block.
+    def test_003_relative_rate (self):
+        modulator = scratch_radio.ook_modulator(1000, 4000, 0)
+        self.assertAlmostEqual(4.0, modulator.relative_rate())
+        modulator.set_baud_rate(500)
+        self.assertAlmostEqual(8.0, modulator.relative_rate())
+
+    # In burst mode idle bits generate no output. Each burst is followed
+    # by a zero valued symbol and is delimited by start and end of burst
+    # tags.
+    def test_004_burst_mode (self):
+        srcData = (0xFF, 0xFF, 1, 0, 0xFF, 0xFF, 0xFF, 1, 0xFF)
+        refData = (-0.5j, -0.5j, -0.5j, -0.5j, 0.0, 0.0, 0.0, 0.0,
+            0.0, 0.0, 0.0, 0.0, -0.5j, -0.5j, -0.5j, -0.5j,
+            0.0, 0.0, 0.0, 0.0)
+        source = blocks.vector_source_b(srcData)
+        modulator = scratch_radio.ook_modulator(1000, 4000, 0, True)
+        sink = blocks.vector_sink_c()
+        self.tb.connect(source, modulator)
+        self.tb.connect(modulator, sink)
+        self.tb.run()
+        self.assertComplexTuplesAlmostEqual(refData, sink.data())
+        burstTags = [(pmt.symbol_to_string(tag.key), tag.offset)
+            for tag in sink.tags()]
+        self.assertEqual([("tx_sob", 0), ("tx_eob", 11),
+            ("tx_sob", 12), ("tx_eob", 19)], burstTags)
+
+    # In burst mode idle bits are consumed at the nominal symbol rate
+    # once the output latency budget has been used, rather than as fast
+    # as they can be supplied. The latency budget covers 250 symbols.
+    def test_005_burst_mode_idle_rate (self):
+        srcData = (0xFF,) * 1250
+        source = blocks.vector_source_b(srcData)
+        modulator = scratch_radio.ook_modulator(1000, 4000, 0, True)
+        sink = blocks.vector_sink_c()
+        self.tb.connect(source, modulator)
+        self.tb.connect(modulator, sink)
+        startTime = time.time()
+        self.tb.run()
+        self.assertGreater(time.time() - startTime, 0.8)
+        self.assertEqual((), sink.data())
+
+    # Pulse shaping ramps the carrier up or down with a raised cosine
+    # envelope at the start of each symbol where the value changes.
+    def test_006_pulse_shaping (self):
+        srcData = (1, 1, 0)
+        refData = (-0.0732j, -0.4268j, -0.5j, -0.5j, -0.5j, -0.5j, -0.5j,
+            -0.5j, -0.4268j, -0.0732j, 0.0, 0.0)
+        source = blocks.vector_source_b(srcData)
+        modulator = scratch_radio.ook_modulator(1000, 4000, 0, False, 0.5)
+        sink = blocks.vector_sink_c()
+        self.tb.connect(source, modulator)
+        self.tb.connect(modulator, sink)
+        self.tb.run()
+        self.assertComplexTuplesAlmostEqual(refData, sink.data(), 4)
+
 if __name__ == '__main__':
     gr_unittest.run(qa_ook_modulator, "qa_ook_modulator.xml")
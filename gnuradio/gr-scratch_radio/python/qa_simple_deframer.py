@@ -248,5 +248,89 @@ class qa_simple_deframer (gr_unittest.TestCase):
         self.tb.run()
         self.assertEqual(refData, sink.data())
 
+    def test_005_packed (self):
+        srcData = (0x00, 0x00, 0x00, 0x04, 0x01, 0x02, 0x03, 0x04, 0x00, 0x00, 0x00)
+        refData = (0x00, 0x00, 0x00, 0x00, 0x00, 0x04, 0x01, 0x02,
+            0x03, 0x04, 0x00)
+        source = blocks.vector_source_b(srcData)
+        framer = scratch_radio.simple_framer(True)
+        deframer = scratch_radio.simple_deframer(True)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, framer)
+        self.tb.connect(framer, deframer)
+        self.tb.connect(deframer, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_006_sync_errors (self):
+        srcData = (0x00, 0xA5, 0xF0, 0xA5, 0xF0, 0xA5, 0xF0, 0x7F, 0x81, 0xC1,
+            0x3C, 0x04, 0x01, 0x02, 0x03, 0x04, 0x0E, 0x28, 0xFF, 0x00, 0x00)
+        refData = (0x00, 0x00, 0x00, 0x00, 0x00, 0x04, 0x01, 0x02,
+            0x03, 0x04, 0x00)
+        refIdleData = (0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00)
+        for (maxSyncErrors, expected) in ((1, refIdleData), (2, refData)):
+            tb = gr.top_block ()
+            source = blocks.vector_source_b(srcData)
+            deframer = scratch_radio.simple_deframer(True,
+                scratch_radio.SIMPLE_FRAME_SYNC_WORD, maxSyncErrors)
+            sink = blocks.vector_sink_b()
+            tb.connect(source, deframer)
+            tb.connect(deframer, sink)
+            tb.run()
+            self.assertEqual(expected, sink.data())
+
+    def test_007_sync_word (self):
+        srcData = (0x00, 0x00, 0x00, 0x04, 0x01, 0x02, 0x03, 0x04, 0x00, 0x00, 0x00)
+        refData = (0x00, 0x00, 0x00, 0x00, 0x00, 0x04, 0x01, 0x02,
+            0x03, 0x04, 0x00)
+        source = blocks.vector_source_b(srcData)
+        framer = scratch_radio.simple_framer(True, 0x12345678)
+        deframer = scratch_radio.simple_deframer(True, 0x12345678)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, framer)
+        self.tb.connect(framer, deframer)
+        self.tb.connect(deframer, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_008_extended (self):
+        srcData = (0x00, 0x00, 0x00, 0x80, 0x04, 0x01, 0x02, 0x03, 0x04,
+            0x00, 0x00, 0x00)
+        refData = (0x00, 0x00, 0x00, 0x00, 0x00, 0x80, 0x04, 0x01,
+            0x02, 0x03, 0x04, 0x00)
+        syncWord = scratch_radio.SIMPLE_FRAME_SYNC_WORD
+        source = blocks.vector_source_b(srcData)
+        framer = scratch_radio.simple_framer(True, syncWord, True)
+        deframer = scratch_radio.simple_deframer(True, syncWord, 0, True)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, framer)
+        self.tb.connect(framer, deframer)
+        self.tb.connect(deframer, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_009_frame_check (self):
+        srcHeader = (0x00, 0xA5, 0xF0, 0xA5, 0xF0, 0xA5, 0xF0, 0x7E, 0x81, 0xC3,
+            0x3C, 0x04, 0x01, 0x02, 0x03, 0x04)
+        refData = (0x00, 0x00, 0x00, 0x00, 0x00, 0x04, 0x01, 0x02,
+            0x03, 0x04, 0x00)
+        refIdleData = (0x00, 0x00, 0x00, 0x00, 0x00, 0x00)
+        testCases = (
+            (scratch_radio.SIMPLE_FRAME_CHECK_CRC16, (0x28, 0x27), refData),
+            (scratch_radio.SIMPLE_FRAME_CHECK_CRC16, (0x28, 0x26), refIdleData),
+            (scratch_radio.SIMPLE_FRAME_CHECK_CRC32, (0x0C, 0x75, 0xDA, 0xA4), refData),
+            (scratch_radio.SIMPLE_FRAME_CHECK_CRC32, (0x0C, 0x75, 0xDA, 0xA5), refIdleData))
+        for (frameCheck, checkBytes, expected) in testCases:
+            srcData = srcHeader + checkBytes + (0xFF, 0x00, 0x00)
+            tb = gr.top_block ()
+            source = blocks.vector_source_b(srcData)
+            deframer = scratch_radio.simple_deframer(True,
+                scratch_radio.SIMPLE_FRAME_SYNC_WORD, 0, False, frameCheck)
+            sink = blocks.vector_sink_b()
+            tb.connect(source, deframer)
+            tb.connect(deframer, sink)
+            tb.run()
+            self.assertEqual(expected, sink.data())
+
 if __name__ == '__main__':
     gr_unittest.run(qa_simple_deframer, "qa_simple_deframer.xml")
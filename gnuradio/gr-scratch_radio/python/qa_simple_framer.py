@@ -21,6 +21,7 @@
 
 from gnuradio import gr, gr_unittest
 from gnuradio import blocks
+import pmt
 import scratch_radio_swig as scratch_radio
 
 class qa_simple_framer (gr_unittest.TestCase):
@@ -176,5 +177,71 @@ class qa_simple_framer (gr_unittest.TestCase):
                 retry = False
         self.assertEqual(refData, genData)
 
+    def test_004_packed (self):
+        srcData = (0x00, 0x00, 0x00, 0x04, 0x01, 0x02, 0x03, 0x04, 0x00, 0x00, 0x00)
+        refData = (0x00, 0xA5, 0xF0, 0xA5, 0xF0, 0xA5, 0xF0, 0x7E, 0x81, 0xC3,
+            0x3C, 0x04, 0x01, 0x02, 0x03, 0x04, 0x0E, 0x28, 0xFF, 0x00, 0x00)
+        refIdleOffsets = [0, 19, 20]
+
+        source = blocks.vector_source_b(srcData)
+        framer = scratch_radio.simple_framer(True)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, framer)
+        self.tb.connect(framer, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+        idleOffsets = [tag.offset for tag in sink.tags()
+            if pmt.symbol_to_string(tag.key) == "idle"]
+        self.assertEqual(refIdleOffsets, idleOffsets)
+
+    def test_005_sync_word (self):
+        srcData = (0x00, 0x00, 0x00, 0x04, 0x01, 0x02, 0x03, 0x04, 0x00, 0x00, 0x00)
+        refData = (0x00, 0xA5, 0xF0, 0xA5, 0xF0, 0xA5, 0xF0, 0x78, 0x56, 0x34,
+            0x12, 0x04, 0x01, 0x02, 0x03, 0x04, 0x0E, 0x28, 0xFF, 0x00, 0x00)
+
+        source = blocks.vector_source_b(srcData)
+        framer = scratch_radio.simple_framer(True, 0x12345678)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, framer)
+        self.tb.connect(framer, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_006_extended (self):
+        srcData = (0x00, 0x00, 0x00, 0x80, 0x04, 0x01, 0x02, 0x03, 0x04,
+            0x00, 0x00, 0x00)
+        refData = (0x00, 0xA5, 0xF0, 0xA5, 0xF0, 0xA5, 0xF0, 0x7E, 0x81, 0xC3,
+            0x3C, 0x80, 0x04, 0x01, 0x02, 0x03, 0x04, 0x8E, 0x2B, 0xFF, 0x00,
+            0x00)
+
+        source = blocks.vector_source_b(srcData)
+        framer = scratch_radio.simple_framer(True,
+            scratch_radio.SIMPLE_FRAME_SYNC_WORD, True)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, framer)
+        self.tb.connect(framer, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_007_frame_check (self):
+        srcData = (0x00, 0x00, 0x00, 0x04, 0x01, 0x02, 0x03, 0x04, 0x00, 0x00, 0x00)
+        refHeader = (0x00, 0xA5, 0xF0, 0xA5, 0xF0, 0xA5, 0xF0, 0x7E, 0x81, 0xC3,
+            0x3C, 0x04, 0x01, 0x02, 0x03, 0x04)
+        refTrailers = (
+            (scratch_radio.SIMPLE_FRAME_CHECK_FLETCHER, (0x0E, 0x28)),
+            (scratch_radio.SIMPLE_FRAME_CHECK_CRC16, (0x28, 0x27)),
+            (scratch_radio.SIMPLE_FRAME_CHECK_CRC32, (0x0C, 0x75, 0xDA, 0xA4)))
+        for (frameCheck, checkBytes) in refTrailers:
+            refData = refHeader + checkBytes + (0xFF, 0x00, 0x00)
+            tb = gr.top_block ()
+            source = blocks.vector_source_b(srcData)
+            framer = scratch_radio.simple_framer(True,
+                scratch_radio.SIMPLE_FRAME_SYNC_WORD, False, frameCheck)
+            sink = blocks.vector_sink_b()
+            tb.connect(source, framer)
+            tb.connect(framer, sink)
+            tb.run()
+            self.assertEqual(refData, sink.data())
+
 if __name__ == '__main__':
     gr_unittest.run(qa_simple_framer, "qa_simple_framer.xml")
@@ -23,6 +23,20 @@ from gnuradio import gr, gr_unittest
 from gnuradio import blocks
 import scratch_radio_swig as scratch_radio
 
+# Input samples for a 2 baud symbol rate at a 10 Hz sample rate, together
+# with the bits which they encode.
+SRC_DATA = (0.0, 1.1, 1.2, 1.3, 1.4, 0.0, -1.1, -1.2, -1.3, -1.4,
+  -1.0, -1.1, -1.2, -1.3, -1.4, 1.0, 1.1, 1.2, 1.3, 1.4,
+  1.0, 1.1, 1.2, 1.3, 1.4, 1.0, 1.1, 1.2, 1.3, 1.4,
+  0.0, -1.1, -1.2, -1.3, -1.4, 0.0)
+SRC_BITS = (1, 0, 0, 1, 1, 1, 0)
+
+# Packs bits into bytes, least significant bit first, discarding any
+# incomplete final byte.
+def pack_bits (bits):
+    return tuple(sum(bit << i for (i, bit) in enumerate(bits[n:n+8]))
+        for n in range(0, len(bits) - 7, 8))
+
 class qa_symbol_sync (gr_unittest.TestCase):
 
     def setUp (self):
@@ -32,12 +46,8 @@ class qa_symbol_sync (gr_unittest.TestCase):
         self.tb = None
 
     def test_001_t (self):
-        srcData = (0.0, 1.1, 1.2, 1.3, 1.4, 0.0, -1.1, -1.2, -1.3, -1.4,
-          -1.0, -1.1, -1.2, -1.3, -1.4, 1.0, 1.1, 1.2, 1.3, 1.4,
-          1.0, 1.1, 1.2, 1.3, 1.4, 1.0, 1.1, 1.2, 1.3, 1.4,
-          0.0, -1.1, -1.2, -1.3, -1.4, 0.0)
-        refData = (1, 0, 0, 1, 1, 1, 0)
-        source = blocks.vector_source_f(srcData)
+        refData = SRC_BITS
+        source = blocks.vector_source_f(SRC_DATA)
         sync = scratch_radio.symbol_sync(2, 10)
         sink = blocks.vector_sink_b()
         self.tb.connect(source, sync)
@@ -45,5 +55,43 @@ class qa_symbol_sync (gr_unittest.TestCase):
         self.tb.run()
         self.assertEqual(refData, sink.data())
 
+    def test_002_set_baud_rate (self):
+        refData = SRC_BITS
+        source = blocks.vector_source_f(SRC_DATA)
+        sync = scratch_radio.symbol_sync(5, 10)
+        sync.set_baud_rate(2)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, sync)
+        self.tb.connect(sync, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_003_reset_state (self):
+        refData = SRC_BITS
+        sync = scratch_radio.symbol_sync(2, 10)
+        source = blocks.vector_source_f(SRC_DATA[:13])
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, sync)
+        self.tb.connect(sync, sink)
+        self.tb.run()
+        self.tb.disconnect_all()
+        sync.reset_state()
+        source = blocks.vector_source_f(SRC_DATA)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, sync)
+        self.tb.connect(sync, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_004_packed (self):
+        refData = pack_bits(SRC_BITS + SRC_BITS)
+        source = blocks.vector_source_f(SRC_DATA + SRC_DATA)
+        sync = scratch_radio.symbol_sync(2, 10, True)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, sync)
+        self.tb.connect(sync, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
 if __name__ == '__main__':
     gr_unittest.run(qa_symbol_sync, "qa_symbol_sync.xml")
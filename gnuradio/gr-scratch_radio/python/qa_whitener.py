@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 <+YOU OR YOUR COMPANY+>.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+import pmt
+import scratch_radio_swig as scratch_radio
+
+class qa_whitener (gr_unittest.TestCase):
+
+    def setUp (self):
+        self.tb = gr.top_block ()
+
+    def tearDown (self):
+        self.tb = None
+
+    def test_001_t (self):
+        srcData = (1,) + (0,) * 23 + (0xFF, 0xFF) + (1,) * 8
+        refData = (1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1,
+            0, 0, 0, 0, 0, 0, 0xFF, 0xFF, 0, 1, 1, 1, 1, 1, 1, 1)
+        source = blocks.vector_source_b(srcData)
+        whitener = scratch_radio.whitener()
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, whitener)
+        self.tb.connect(whitener, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+
+    def test_002_packed (self):
+        srcData = (0x01, 0x00, 0x00, 0x00, 0xFF)
+        refData = (0x01, 0x10, 0x02, 0x00, 0xFE)
+        idleTag = gr.tag_t()
+        idleTag.offset = 3
+        idleTag.key = pmt.intern("idle")
+        idleTag.value = pmt.PMT_T
+        source = blocks.vector_source_b(srcData, False, 1, [idleTag])
+        whitener = scratch_radio.whitener(True)
+        sink = blocks.vector_sink_b()
+        self.tb.connect(source, whitener)
+        self.tb.connect(whitener, sink)
+        self.tb.run()
+        self.assertEqual(refData, sink.data())
+        idleOffsets = [tag.offset for tag in sink.tags()
+            if pmt.symbol_to_string(tag.key) == "idle"]
+        self.assertEqual([3], idleOffsets)
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_whitener, "qa_whitener.xml")
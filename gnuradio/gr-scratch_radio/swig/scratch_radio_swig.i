@@ -12,15 +12,25 @@
 #include "scratch_radio/manc_dec.h"
 #include "scratch_radio/simple_framer.h"
 #include "scratch_radio/simple_deframer.h"
+#include "scratch_radio/simple_frame_format.h"
 #include "scratch_radio/message_source.h"
 #include "scratch_radio/message_sink.h"
 #include "scratch_radio/ook_modulator.h"
 #include "scratch_radio/ook_demodulator.h"
 #include "scratch_radio/symbol_sync.h"
 #include "scratch_radio/fast_agc_cc.h"
+#include "scratch_radio/bit_packer.h"
+#include "scratch_radio/bit_unpacker.h"
+#include "scratch_radio/conv_enc.h"
+#include "scratch_radio/conv_dec.h"
+#include "scratch_radio/whitener.h"
+#include "scratch_radio/dewhitener.h"
+#include "scratch_radio/burst_gap_fill_cc.h"
 %}
 
 
+%include "scratch_radio/simple_frame_format.h"
+
 %include "scratch_radio/manc_enc.h"
 GR_SWIG_BLOCK_MAGIC2(scratch_radio, manc_enc);
 %include "scratch_radio/manc_dec.h"
@@ -41,3 +51,17 @@ GR_SWIG_BLOCK_MAGIC2(scratch_radio, ook_demodulator);
 GR_SWIG_BLOCK_MAGIC2(scratch_radio, symbol_sync);
 %include "scratch_radio/fast_agc_cc.h"
 GR_SWIG_BLOCK_MAGIC2(scratch_radio, fast_agc_cc);
+%include "scratch_radio/bit_packer.h"
+GR_SWIG_BLOCK_MAGIC2(scratch_radio, bit_packer);
+%include "scratch_radio/bit_unpacker.h"
+GR_SWIG_BLOCK_MAGIC2(scratch_radio, bit_unpacker);
+%include "scratch_radio/conv_enc.h"
+GR_SWIG_BLOCK_MAGIC2(scratch_radio, conv_enc);
+%include "scratch_radio/conv_dec.h"
+GR_SWIG_BLOCK_MAGIC2(scratch_radio, conv_dec);
+%include "scratch_radio/whitener.h"
+GR_SWIG_BLOCK_MAGIC2(scratch_radio, whitener);
+%include "scratch_radio/dewhitener.h"
+GR_SWIG_BLOCK_MAGIC2(scratch_radio, dewhitener);
+%include "scratch_radio/burst_gap_fill_cc.h"
+GR_SWIG_BLOCK_MAGIC2(scratch_radio, burst_gap_fill_cc);
@@ -1,85 +1,213 @@
 #!/usr/bin/env python
 
-from PyQt4 import QtCore, QtGui
-from gnuradio import gr
-from gnuradio import qtgui
-from gnuradio import fft
-from gnuradio import filter
-from gnuradio import blocks
-from threading import Thread
-from Queue import Queue
+import time
+startupTime = time.time()
 
 import os
 import sys
-import time
 import re
-import sip
-import limesdr
-import scratch_radio
+import errno
+import argparse
+import collections
+import importlib
+import json
+import select
+import threading
+
+from gnuradio import gr
 
 COMMAND_PIPE_NAME = '/tmp/gr-control/command.pipe'
 
 SDR_DEFAULT_FREQ = 433.92e6
 SDR_SAMPLE_RATE  = 400e3
 SDR_BANDWIDTH    = 300e3
+SDR_NOMINAL_GAIN = 40
 
+FILTER_TAP_CACHE_SIZE = 32
+FILTER_TAP_CACHE_FILE = os.path.expanduser('~/.scratch-radio/filter_taps.json')
+
+#
+# Records the time taken by each phase of the driver startup, including the
+# time spent importing lazily loaded modules. The breakdown is only reported
+# if startup profiling has been enabled.
 #
-# Specifies the base class for a managed flow graph block.
+class StartupProfiler(object):
+  def __init__(self, startTime):
+    self.enabled = False
+    self.complete = False
+    self.startTime = startTime
+    self.markTime = startTime
+    self.phases = []
+
+  # Marks the end of a startup phase.
+  def mark(self, phaseName):
+    now = time.time()
+    self.phases.append((phaseName, now - self.markTime))
+    self.markTime = now
+
+  # Records the time taken to import a lazily loaded module. Imports after
+  # startup are reported immediately.
+  def recordImport(self, moduleName, duration):
+    if (not self.complete):
+      self.phases.append(("  import " + moduleName, duration))
+    elif (self.enabled):
+      print "GNURadio: Imported %s in %.1f ms" % (moduleName, 1e3 * duration)
+
+  # Reports the startup phase timings and marks startup as complete.
+  def report(self):
+    self.complete = True
+    if (not self.enabled):
+      return
+    print "GNURadio: Startup completed in %.1f ms" % \
+      (1e3 * (self.markTime - self.startTime))
+    for (phaseName, duration) in self.phases:
+      print "  %-32s %8.1f ms" % (phaseName, 1e3 * duration)
+
+startupProfiler = StartupProfiler(startupTime)
+startupProfiler.mark("import core modules")
+
+#
+# Implements a proxy for a module which is imported on first use. Import
+# times are recorded by the startup profiler.
+#
+class LazyModule(object):
+  def __init__(self, moduleName):
+    self._moduleName = moduleName
+    self._module = None
+
+  def _load(self):
+    if (self._module == None):
+      importStart = time.time()
+      self._module = importlib.import_module(self._moduleName)
+      startupProfiler.recordImport(self._moduleName, time.time() - importStart)
+    return self._module
+
+  # Checks whether the module can be imported.
+  def available(self):
+    try:
+      self._load()
+    except ImportError:
+      return False
+    return True
+
+  def __getattr__(self, name):
+    return getattr(self._load(), name)
+
+filter = LazyModule("gnuradio.filter")
+blocks = LazyModule("gnuradio.blocks")
+channels = LazyModule("gnuradio.channels")
+scratch_radio = LazyModule("scratch_radio")
+
+# The LimeSDR blocks are not required when using the simulated radio backend
+# and the SoapySDR bindings are only used for device discovery if present.
+limesdr = LazyModule("limesdr")
+soapySDR = LazyModule("SoapySDR")
+
+#
+# Specifies the base class for a managed flow graph block. This includes a
+# pool of idle GNU Radio blocks, keyed on block class and configuration, which
+# allows blocks released on a graph reset to be reused when the graph is
+# rebuilt instead of being constructed again.
 #
 class FlowGraphBlock(object):
+  idleBlockPool = {}
   def __init__(self):
-    pass
+    self.poolKey = None
   def grBlock(self):
     return None
   def cleanup(self):
-    pass
+    self._releasePooledBlock()
+  def configure(self, param, value):
+    return False
+  def status(self):
+    return None
+
+  # Takes an idle block with matching configuration from the pool, resetting
+  # its internal state. Returns None if no suitable block is available, in
+  # which case the caller should create a new one. Either way the block will
+  # be returned to the pool on cleanup.
+  def _takePooledBlock(self, *config):
+    self._setPoolKey(*config)
+    idleBlocks = FlowGraphBlock.idleBlockPool.get(self.poolKey)
+    if (not idleBlocks):
+      return None
+    pooledBlock = idleBlocks.pop()
+    if hasattr(pooledBlock, "reset_state"):
+      pooledBlock.reset_state()
+    return pooledBlock
+
+  # Sets the pool key from the block configuration. This must be called again
+  # whenever the block is reconfigured, so that it is returned to the pool
+  # under its current configuration.
+  def _setPoolKey(self, *config):
+    self.poolKey = (self.__class__.__name__,) + config
+
+  # Returns the block to the pool of idle blocks.
+  def _releasePooledBlock(self):
+    if (self.poolKey != None):
+      idleBlocks = FlowGraphBlock.idleBlockPool.setdefault(self.poolKey, [])
+      idleBlocks.append(self.grBlock())
+      self.poolKey = None
 
 #
 # Implements a radio source data block using the gr-limesdr block which
-# supports native decimation and digital filtering. This wraps the
-# cached component reference to ensure that it is only initialised once.
+# supports native decimation and digital filtering. This wraps a cached
+# component reference for each device to ensure that it is only initialised
+# once, and tracks the devices which are in use by the current flow graph.
 #
 class RadioSourceBlock(FlowGraphBlock):
-  sdrSource = None
+  sdrSources = {}
+  activeDevices = set()
   def __init__(self, deviceSerialNumber):
     FlowGraphBlock.__init__(self)
-    if (RadioSourceBlock.sdrSource == None):
-      sdrSrc = limesdr.source(
-        deviceSerialNumber, # device_number
-        1,                  # device_type = LimeSDR-Mini
-        1,                  # chip_mode = SISO
-        0,                  # channel = A (in SISO mode)
-        0,                  # file_switch = NO (don't load parameters from file)
-        "",                 # filename = unused for no parameter file
-        SDR_DEFAULT_FREQ,   # rf_freq (default to 433MHz ISM band)
-        SDR_SAMPLE_RATE,    # samp_rate (default set to nominal 400 kHz)
-        16,                 # oversample (decimate by x16)
-        1,                  # calibration_ch0 enabled
-        2.5e6,              # calibr_bandw_ch0 (default set to minimum 2.5 MHz)
-        0,                  # calibration_ch1 disabled
-        0,                  # calibr_bandw_ch1 unused
-        3,                  # lna_path_mini = LNAW
-        0,                  # lna_path_ch0 unused for LimeSDR-Mini
-        0,                  # lna_path_ch1 unused for LimeSDR-Mini
-        1,                  # analog_filter_ch0 enabled
-        1.5e6,              # analog_bandw_ch0 (default set to minimum 1.5 MHz)
-        0,                  # analog_filter_ch1 disabled
-        1.5e6,              # analog_bandw_ch1 unused
-        1,                  # digital_filter_ch0 enabled
-        SDR_BANDWIDTH,      # digital_bandw_ch0 (default to nominal 200 kHz)
-        0,                  # digital_filter_ch1 disabled
-        SDR_BANDWIDTH,      # digital_bandw_ch1 unused
-        40,                 # gain_dB_ch0 (default set to nominal 40dB)
-        0,                  # gain_dB_ch1 unused
-        0,                  # nco_freq_ch0 is unused
-        0,                  # nco_freq_ch1 is unused
-        0,                  # cmix_mode_ch0 is unused
-        0                   # cmix_mode_ch1 is unused
-      )
-      RadioSourceBlock.sdrSource = sdrSrc
-
+    self.deviceSerialNumber = deviceSerialNumber
+    self.sdrSource = None
+
+  # Creates the gr-limesdr source block for the selected device. The gr-limesdr
+  # blocks are only loaded at this point, so a missing installation is reported
+  # when the first radio source is created and None is returned.
+  def _createSdrSource(self, topBlock):
+    if (not limesdr.available()):
+      print "GNURadio: LimeSDR GNU Radio blocks not installed"
+      return None
+    deviceSerialNumber = self.deviceSerialNumber
+    return limesdr.source(
+      deviceSerialNumber, # device_number
+      1,                  # device_type = LimeSDR-Mini
+      1,                  # chip_mode = SISO
+      0,                  # channel = A (in SISO mode)
+      0,                  # file_switch = NO (don't load parameters from file)
+      "",                 # filename = unused for no parameter file
+      SDR_DEFAULT_FREQ,   # rf_freq (default to 433MHz ISM band)
+      SDR_SAMPLE_RATE,    # samp_rate (default set to nominal 400 kHz)
+      16,                 # oversample (decimate by x16)
+      1,                  # calibration_ch0 enabled
+      2.5e6,              # calibr_bandw_ch0 (default set to minimum 2.5 MHz)
+      0,                  # calibration_ch1 disabled
+      0,                  # calibr_bandw_ch1 unused
+      3,                  # lna_path_mini = LNAW
+      0,                  # lna_path_ch0 unused for LimeSDR-Mini
+      0,                  # lna_path_ch1 unused for LimeSDR-Mini
+      1,                  # analog_filter_ch0 enabled
+      1.5e6,              # analog_bandw_ch0 (default set to minimum 1.5 MHz)
+      0,                  # analog_filter_ch1 disabled
+      1.5e6,              # analog_bandw_ch1 unused
+      1,                  # digital_filter_ch0 enabled
+      SDR_BANDWIDTH,      # digital_bandw_ch0 (default to nominal 200 kHz)
+      0,                  # digital_filter_ch1 disabled
+      SDR_BANDWIDTH,      # digital_bandw_ch1 unused
+      40,                 # gain_dB_ch0 (default set to nominal 40dB)
+      0,                  # gain_dB_ch1 unused
+      0,                  # nco_freq_ch0 is unused
+      0,                  # nco_freq_ch1 is unused
+      0,                  # cmix_mode_ch0 is unused
+      0                   # cmix_mode_ch1 is unused
+    )
+
+  # The optional third parameter selects the device serial number, otherwise
+  # the default device is used. Each device may only be used once per graph.
   def setup(self, topBlock, params):
-    if (len(params) != 2):
+    if ((len(params) < 2) or (len(params) > 3)):
       print "GNURadio: Invalid number of radio source parameters"
       return None
     try:
@@ -88,59 +216,99 @@ class RadioSourceBlock(FlowGraphBlock):
     except ValueError, msg:
       print "GNURadio: Invalid radio source parameter - %s" % msg
       return None
-    RadioSourceBlock.sdrSource.set_rf_freq(tuningFreq)
-    RadioSourceBlock.sdrSource.set_gain(rxGain, 0)
+    if (len(params) == 3):
+      self.deviceSerialNumber = params[2]
+    if (self.deviceSerialNumber not in topBlock.deviceSerialNumbers):
+      print "GNURadio: Unknown radio source device - %s" % self.deviceSerialNumber
+      return None
+    if (self.deviceSerialNumber in RadioSourceBlock.activeDevices):
+      print "GNURadio: Radio source device already in use - %s" % self.deviceSerialNumber
+      return None
+    if (self.deviceSerialNumber not in RadioSourceBlock.sdrSources):
+      sdrSource = self._createSdrSource(topBlock)
+      if (sdrSource == None):
+        return None
+      RadioSourceBlock.sdrSources[self.deviceSerialNumber] = sdrSource
+    self.sdrSource = RadioSourceBlock.sdrSources[self.deviceSerialNumber]
+    self.sdrSource.set_rf_freq(tuningFreq)
+    self.sdrSource.set_gain(rxGain, 0)
+    RadioSourceBlock.activeDevices.add(self.deviceSerialNumber)
     return self
 
   def grBlock(self):
-    return RadioSourceBlock.sdrSource
+    return self.sdrSource
+
+  def cleanup(self):
+    RadioSourceBlock.activeDevices.discard(self.deviceSerialNumber)
+
+  def configure(self, param, value):
+    if (param == "FREQ"):
+      self.sdrSource.set_rf_freq(float(value))
+    elif (param == "GAIN"):
+      self.sdrSource.set_gain(int(float(value)), 0)
+    else:
+      return False
+    return True
 
 #
 # Implements a radio sink data block using the gr-limesdr block which
-# supports native interpolation and digital filtering. This wraps the
-# cached component reference to ensure that it is only initialised once.
+# supports native interpolation and digital filtering. This wraps a cached
+# component reference for each device to ensure that it is only initialised
+# once, and tracks the devices which are in use by the current flow graph.
 #
 class RadioSinkBlock(FlowGraphBlock):
-  sdrSink = None
+  sdrSinks = {}
+  activeDevices = set()
   def __init__(self, deviceSerialNumber):
     FlowGraphBlock.__init__(self)
-    if (RadioSinkBlock.sdrSink == None):
-      sdrSnk = limesdr.sink(
-        deviceSerialNumber, # device_number
-        1,                  # device_type = LimeSDR-Mini
-        1,                  # chip_mode = SISO
-        0,                  # channel = A (in SISO mode)
-        0,                  # file_switch = NO (don't load parameters from file)
-        "",                 # filename = unused for no parameter file
-        SDR_DEFAULT_FREQ,   # rf_freq (default to 433MHz ISM band)
-        SDR_SAMPLE_RATE,    # samp_rate (default set to nominal 400 kHz)
-        16,                 # oversample (interpolate by x16)
-        0,                  # calibration_ch0 disabled - TODO: get this working
-        5e6,                # calibr_bandw_ch0 (default set to minimum 5 MHz)
-        0,                  # calibration_ch1 disabled
-        0,                  # calibr_bandw_ch1 unused
-        2,                  # pa_path_mini = BAND2
-        0,                  # pa_path_ch0 unused for LimeSDR-Mini
-        0,                  # pa_path_ch1 unused for LimeSDR-Mini
-        1,                  # analog_filter_ch0 enabled
-        5e6,                # analog_bandw_ch0 (default set to minimum 5 MHz)
-        0,                  # analog_filter_ch1 disabled
-        1.5e6,              # analog_bandw_ch1 unused
-        1,                  # digital_filter_ch0 enabled
-        SDR_BANDWIDTH,      # digital_bandw_ch0 (default to nominal 200 kHz)
-        0,                  # digital_filter_ch1 disabled
-        SDR_BANDWIDTH,      # digital_bandw_ch1 unused
-        40,                 # gain_dB_ch0 (default set to nominal 40dB)
-        0,                  # gain_dB_ch1 unused
-        0,                  # nco_freq_ch0 is unused
-        0,                  # nco_freq_ch1 is unused
-        0,                  # cmix_mode_ch0 is unused
-        0                   # cmix_mode_ch1 is unused
-      )
-      RadioSinkBlock.sdrSink = sdrSnk
-
+    self.deviceSerialNumber = deviceSerialNumber
+    self.sdrSink = None
+
+  # Creates the gr-limesdr sink block for the selected device. The gr-limesdr
+  # blocks are only loaded at this point, so a missing installation is reported
+  # when the first radio sink is created and None is returned.
+  def _createSdrSink(self, topBlock):
+    if (not limesdr.available()):
+      print "GNURadio: LimeSDR GNU Radio blocks not installed"
+      return None
+    deviceSerialNumber = self.deviceSerialNumber
+    return limesdr.sink(
+      deviceSerialNumber, # device_number
+      1,                  # device_type = LimeSDR-Mini
+      1,                  # chip_mode = SISO
+      0,                  # channel = A (in SISO mode)
+      0,                  # file_switch = NO (don't load parameters from file)
+      "",                 # filename = unused for no parameter file
+      SDR_DEFAULT_FREQ,   # rf_freq (default to 433MHz ISM band)
+      SDR_SAMPLE_RATE,    # samp_rate (default set to nominal 400 kHz)
+      16,                 # oversample (interpolate by x16)
+      0,                  # calibration_ch0 disabled - TODO: get this working
+      5e6,                # calibr_bandw_ch0 (default set to minimum 5 MHz)
+      0,                  # calibration_ch1 disabled
+      0,                  # calibr_bandw_ch1 unused
+      2,                  # pa_path_mini = BAND2
+      0,                  # pa_path_ch0 unused for LimeSDR-Mini
+      0,                  # pa_path_ch1 unused for LimeSDR-Mini
+      1,                  # analog_filter_ch0 enabled
+      5e6,                # analog_bandw_ch0 (default set to minimum 5 MHz)
+      0,                  # analog_filter_ch1 disabled
+      1.5e6,              # analog_bandw_ch1 unused
+      1,                  # digital_filter_ch0 enabled
+      SDR_BANDWIDTH,      # digital_bandw_ch0 (default to nominal 200 kHz)
+      0,                  # digital_filter_ch1 disabled
+      SDR_BANDWIDTH,      # digital_bandw_ch1 unused
+      40,                 # gain_dB_ch0 (default set to nominal 40dB)
+      0,                  # gain_dB_ch1 unused
+      0,                  # nco_freq_ch0 is unused
+      0,                  # nco_freq_ch1 is unused
+      0,                  # cmix_mode_ch0 is unused
+      0                   # cmix_mode_ch1 is unused
+    )
+
+  # The optional third parameter selects the device serial number, otherwise
+  # the default device is used. Each device may only be used once per graph.
   def setup(self, topBlock, params):
-    if (len(params) != 2):
+    if ((len(params) < 2) or (len(params) > 3)):
       print "GNURadio: Invalid number of radio sink parameters"
       return None
     try:
@@ -149,12 +317,166 @@ class RadioSinkBlock(FlowGraphBlock):
     except ValueError, msg:
       print "GNURadio: Invalid radio sink parameter - %s" % msg
       return None
-    RadioSinkBlock.sdrSink.set_rf_freq(tuningFreq)
-    RadioSinkBlock.sdrSink.set_gain(txGain, 0)
+    if (len(params) == 3):
+      self.deviceSerialNumber = params[2]
+    if (self.deviceSerialNumber not in topBlock.deviceSerialNumbers):
+      print "GNURadio: Unknown radio sink device - %s" % self.deviceSerialNumber
+      return None
+    if (self.deviceSerialNumber in RadioSinkBlock.activeDevices):
+      print "GNURadio: Radio sink device already in use - %s" % self.deviceSerialNumber
+      return None
+    if (self.deviceSerialNumber not in RadioSinkBlock.sdrSinks):
+      sdrSink = self._createSdrSink(topBlock)
+      if (sdrSink == None):
+        return None
+      RadioSinkBlock.sdrSinks[self.deviceSerialNumber] = sdrSink
+    self.sdrSink = RadioSinkBlock.sdrSinks[self.deviceSerialNumber]
+    self.sdrSink.set_rf_freq(tuningFreq)
+    self.sdrSink.set_gain(txGain, 0)
+    RadioSinkBlock.activeDevices.add(self.deviceSerialNumber)
     return self
 
   def grBlock(self):
-    return RadioSinkBlock.sdrSink
+    return self.sdrSink
+
+  def cleanup(self):
+    RadioSinkBlock.activeDevices.discard(self.deviceSerialNumber)
+
+  def configure(self, param, value):
+    if (param == "FREQ"):
+      self.sdrSink.set_rf_freq(float(value))
+    elif (param == "GAIN"):
+      self.sdrSink.set_gain(int(float(value)), 0)
+    else:
+      return False
+    return True
+
+#
+# Implements a simulated radio channel which loops back the transmitted signal
+# from a simulated radio sink to the corresponding simulated radio source. The
+# channel applies attenuation, additive white Gaussian noise, a frequency
+# offset and sample clock drift, and is throttled to the nominal radio sample
+# rate. The effective frequency offset and attenuation track the transmit and
+# receive tuning frequencies and gains. Gaps between transmitted bursts are
+# filled with zero valued samples, as for a radio which transmits nothing
+# between bursts.
+#
+class SimulatedRadioChannel(gr.hier_block2):
+  def __init__(self, options):
+    gr.hier_block2.__init__(self, "Simulated Radio Channel",
+      gr.io_signature(1, 1, gr.sizeof_gr_complex),
+      gr.io_signature(1, 1, gr.sizeof_gr_complex))
+    self.options = options
+    self.txFreq = None
+    self.rxFreq = None
+    self.txGain = SDR_NOMINAL_GAIN
+    self.rxGain = SDR_NOMINAL_GAIN
+    self.pathGain = blocks.multiply_const_cc(1.0)
+    self.channelModel = channels.channel_model(
+      options.sim_noise_voltage, 0.0,
+      1.0 + options.sim_clock_drift * 1e-6, [1.0+0j])
+    self.throttle = blocks.throttle(gr.sizeof_gr_complex, SDR_SAMPLE_RATE)
+    self.gapFill = scratch_radio.burst_gap_fill_cc(SDR_SAMPLE_RATE)
+    self.connect(self, self.gapFill, self.pathGain, self.channelModel,
+      self.throttle, self)
+    self._update()
+
+  # Updates the channel model after a change of tuning frequency or gain.
+  def _update(self):
+    freqOffset = self.options.sim_freq_offset
+    if ((self.txFreq != None) and (self.rxFreq != None)):
+      freqOffset += self.txFreq - self.rxFreq
+    self.channelModel.set_frequency_offset(freqOffset / SDR_SAMPLE_RATE)
+    gainDb = self.txGain + self.rxGain - 2 * SDR_NOMINAL_GAIN
+    gainDb -= self.options.sim_attenuation
+    self.pathGain.set_k(10.0 ** (gainDb / 20.0))
+
+  def setTxFreq(self, freq):
+    self.txFreq = freq
+    self._update()
+
+  def setRxFreq(self, freq):
+    self.rxFreq = freq
+    self._update()
+
+  def setTxGain(self, gain):
+    self.txGain = gain
+    self._update()
+
+  def setRxGain(self, gain):
+    self.rxGain = gain
+    self._update()
+
+#
+# Implements the simulated radio backend, which provides a configurable number
+# of simulated devices with one loopback channel per device.
+#
+class SimulatedRadioBackend(object):
+  def __init__(self, options):
+    self.options = options
+    self.channels = {}
+
+  # Implements device enumeration for the simulated devices.
+  def enumerate(self):
+    return [RadioDevice("Simulated Radio", "SIM%d" % i, "Loopback")
+      for i in range(self.options.sim_devices)]
+
+  # Gets the channel for a given device, creating it on first use.
+  def getChannel(self, deviceSerialNumber):
+    if (deviceSerialNumber not in self.channels):
+      self.channels[deviceSerialNumber] = SimulatedRadioChannel(self.options)
+    return self.channels[deviceSerialNumber]
+
+#
+# Provides the gr-limesdr tuning interface for one side of a simulated radio
+# channel, so that simulated devices can be used in place of the real ones.
+#
+class SimulatedRadioTuner(object):
+  def __init__(self, channel, isReceiver):
+    self.channel = channel
+    self.isReceiver = isReceiver
+
+  def set_rf_freq(self, freq):
+    if (self.isReceiver):
+      self.channel.setRxFreq(freq)
+    else:
+      self.channel.setTxFreq(freq)
+
+  def set_gain(self, gain, channelIndex):
+    if (self.isReceiver):
+      self.channel.setRxGain(gain)
+    else:
+      self.channel.setTxGain(gain)
+
+#
+# Implements a radio source block using the simulated radio backend. This
+# provides the output side of the simulated loopback channel.
+#
+class SimulatedRadioSourceBlock(RadioSourceBlock):
+  def __init__(self, deviceSerialNumber):
+    RadioSourceBlock.__init__(self, deviceSerialNumber)
+
+  def _createSdrSource(self, topBlock):
+    channel = topBlock.radioBackend.getChannel(self.deviceSerialNumber)
+    return SimulatedRadioTuner(channel, True)
+
+  def grBlock(self):
+    return self.sdrSource.channel
+
+#
+# Implements a radio sink block using the simulated radio backend. This
+# provides the input side of the simulated loopback channel.
+#
+class SimulatedRadioSinkBlock(RadioSinkBlock):
+  def __init__(self, deviceSerialNumber):
+    RadioSinkBlock.__init__(self, deviceSerialNumber)
+
+  def _createSdrSink(self, topBlock):
+    channel = topBlock.radioBackend.getChannel(self.deviceSerialNumber)
+    return SimulatedRadioTuner(channel, False)
+
+  def grBlock(self):
+    return self.sdrSink.channel
 
 #
 # Implements a frequency domain display sink block with complex data input.
@@ -177,7 +499,13 @@ class DisplaySinkFreqBlock(FlowGraphBlock):
       print "GNURadio: Invalid frequency plot parameter - %s" % msg
       return None
 
-    # Create a new QT GUI component if required.
+    # Create a new QT GUI component if required. The QT modules are only
+    # imported on demand so that they are not needed in headless mode.
+    from PyQt4 import QtGui
+    from gnuradio import qtgui
+    from gnuradio import fft
+    import sip
+    self.sampleRate = sampleRate
     plotTitle = "Spectrum Plot For '%s' Block" % compName
     if (len(DisplaySinkFreqBlock.idleFreqSinkCs) == 0):
       self.plotSink = qtgui.freq_sink_c(
@@ -197,6 +525,13 @@ class DisplaySinkFreqBlock(FlowGraphBlock):
   def grBlock(self):
     return self.plotSink
 
+  def configure(self, param, value):
+    if (param == "FREQ"):
+      self.plotSink.set_frequency_range(float(value), self.sampleRate)
+    else:
+      return False
+    return True
+
   def cleanup(self):
     self.pyobj.hide()
     idleFreqSinkC = (self.plotSink, self.pyobj)
@@ -223,7 +558,13 @@ class DisplaySinkWaterfallBlock(FlowGraphBlock):
       print "GNURadio: Invalid waterfall plot parameter - %s" % msg
       return None
 
-    # Create a new QT GUI component if required.
+    # Create a new QT GUI component if required. The QT modules are only
+    # imported on demand so that they are not needed in headless mode.
+    from PyQt4 import QtGui
+    from gnuradio import qtgui
+    from gnuradio import fft
+    import sip
+    self.sampleRate = sampleRate
     plotTitle = "Waterfall Plot For '%s' Block" % compName
     if (len(DisplaySinkWaterfallBlock.idleWaterfallSinkCs) == 0):
       self.plotSink = qtgui.waterfall_sink_c(
@@ -244,11 +585,126 @@ class DisplaySinkWaterfallBlock(FlowGraphBlock):
   def grBlock(self):
     return self.plotSink
 
+  def configure(self, param, value):
+    if (param == "FREQ"):
+      self.plotSink.set_frequency_range(float(value), self.sampleRate)
+    else:
+      return False
+    return True
+
   def cleanup(self):
     self.pyobj.hide()
     idleWaterfallSinkC = (self.plotSink, self.pyobj)
     DisplaySinkWaterfallBlock.idleWaterfallSinkCs.append(idleWaterfallSinkC)
 
+#
+# Implements a bounded least recently used cache of FIR filter taps, keyed on
+# the full set of filter design parameters. If a cache file is specified, the
+# cache contents are saved to it as plain JSON data each time a new filter is
+# designed so that they persist across driver restarts. Complex taps are saved
+# as separate lists of real and imaginary parts. The file contents are checked
+# on loading and failure to load or save the cache file is not fatal.
+#
+class FilterTapCache(object):
+  def __init__(self, maxEntries, cacheFileName):
+    self.maxEntries = maxEntries
+    self.cacheFileName = cacheFileName
+    self.entries = None
+    self.hits = 0
+    self.misses = 0
+
+  # Loads the persisted cache entries on first use. Any invalid cache file
+  # content results in an empty cache.
+  def _load(self):
+    self.entries = collections.OrderedDict()
+    if ((self.cacheFileName == None) or
+        (not os.path.exists(self.cacheFileName))):
+      return
+    try:
+      with open(self.cacheFileName, 'r') as cacheFile:
+        for entry in json.load(cacheFile):
+          (key, taps) = self._decodeEntry(entry)
+          self.entries[key] = taps
+      print "GNURadio: Loaded %d cached filter designs" % len(self.entries)
+    except Exception, msg:
+      print "GNURadio: Ignoring invalid filter tap cache - %s" % msg
+      self.entries.clear()
+
+  # Converts a cache file entry to a design key and taps tuple, raising
+  # ValueError if the entry is not valid.
+  def _decodeEntry(self, entry):
+    key = entry["key"]
+    real = entry["real"]
+    imag = entry.get("imag")
+    if ((not isinstance(key, list)) or (len(key) == 0) or
+        (not isinstance(key[0], basestring)) or
+        (not self._isNumberList(key[1:])) or (not self._isNumberList(real))):
+      raise ValueError("malformed filter design entry")
+    if (imag == None):
+      taps = tuple(float(x) for x in real)
+    elif (self._isNumberList(imag) and (len(imag) == len(real))):
+      taps = tuple(complex(x, y) for (x, y) in zip(real, imag))
+    else:
+      raise ValueError("malformed complex filter taps")
+    return ((str(key[0]),) + tuple(key[1:]), taps)
+
+  # Converts a design key and taps tuple to a cache file entry.
+  def _encodeEntry(self, key, taps):
+    entry = {"key" : list(key)}
+    if any(isinstance(x, complex) for x in taps):
+      entry["real"] = [complex(x).real for x in taps]
+      entry["imag"] = [complex(x).imag for x in taps]
+    else:
+      entry["real"] = [float(x) for x in taps]
+    return entry
+
+  def _isNumberList(self, values):
+    return (isinstance(values, list) and all(
+      isinstance(x, (int, long, float)) and not isinstance(x, bool)
+      for x in values))
+
+  # Saves the cache entries, replacing the cache file atomically. The cache
+  # directory is created if required and is only accessible by the user.
+  def _save(self):
+    if (self.cacheFileName == None):
+      return
+    cacheFilePath = os.path.dirname(self.cacheFileName)
+    tempFileName = self.cacheFileName + ".tmp"
+    try:
+      if not os.path.exists(cacheFilePath):
+        os.makedirs(cacheFilePath, 0700)
+      with open(tempFileName, 'w') as cacheFile:
+        json.dump([self._encodeEntry(key, taps)
+          for (key, taps) in self.entries.items()], cacheFile)
+      os.rename(tempFileName, self.cacheFileName)
+    except (IOError, OSError), msg:
+      print "GNURadio: Failed to save filter tap cache - %s" % msg
+
+  # Returns the filter taps for the specified design key, calling the design
+  # function to generate them if they are not already cached.
+  def lookup(self, key, designFn):
+    if (self.entries == None):
+      self._load()
+    if (key in self.entries):
+      filterTaps = self.entries.pop(key)
+      self.entries[key] = filterTaps
+      self.hits += 1
+      print "Using cached FIR filter with %d taps (%d hits, %d misses)" % \
+        (len(filterTaps), self.hits, self.misses)
+      return filterTaps
+    filterTaps = tuple(designFn())
+    self.entries[key] = filterTaps
+    while (len(self.entries) > self.maxEntries):
+      self.entries.popitem(last=False)
+    self.misses += 1
+    print "Generated FIR filter with %d taps (%d hits, %d misses)" % \
+      (len(filterTaps), self.hits, self.misses)
+    self._save()
+    return filterTaps
+
+# The filter tap cache file is only used if enabled on the command line.
+filterTapCache = FilterTapCache(FILTER_TAP_CACHE_SIZE, None)
+
 #
 # Implements a low pass filter block with configurable cutoff frequency.
 #
@@ -267,21 +723,51 @@ class LowPassFilterBlock(FlowGraphBlock):
     except ValueError, msg:
       print "GNURadio: Invalid low pass filter parameter - %s" % msg
       return None
+    self.sampleRate = sampleRate
+    filterTaps = self._designTaps(cutoffFreq, gain)
+    if (filterTaps == None):
+      return None
+    self.firFilter = self._takePooledBlock()
+    if (self.firFilter == None):
+      self.firFilter = filter.fir_filter_ccf(1, filterTaps)
+    else:
+      self.firFilter.set_taps(filterTaps)
+    return self
+
+  # Calculate the FIR filter taps using the Blackman-Harris window method.
+  def _designTaps(self, cutoffFreq, gain):
+    sampleRate = self.sampleRate
     if ((cutoffFreq <= 0) or (cutoffFreq >= sampleRate/2)):
       print "GNURadio: Low pass cutoff frequency out of range"
       return None
-
-    # Calculate the FIR filter taps using the Blackman-Harris window method.
     transitionWidth = sampleRate/25
-    filterTaps = filter.firdes.low_pass(gain, sampleRate,
-      cutoffFreq, transitionWidth, filter.firdes.WIN_BLACKMAN_HARRIS)
-    print "Generated FIR filter with %d taps" % len(filterTaps)
-    self.firFilter = filter.fir_filter_ccf(1, filterTaps)
-    return self
+    window = filter.firdes.WIN_BLACKMAN_HARRIS
+    filterTaps = filterTapCache.lookup(
+      ("LOW-PASS", sampleRate, cutoffFreq, gain, window),
+      lambda: filter.firdes.low_pass(gain, sampleRate,
+        cutoffFreq, transitionWidth, window))
+    self.cutoffFreq = cutoffFreq
+    self.gain = gain
+    return filterTaps
 
   def grBlock(self):
     return self.firFilter
 
+  # Updates the filter taps in place, which takes effect on the next call to
+  # the running filter block.
+  def configure(self, param, value):
+    if (param == "CUTOFF"):
+      filterTaps = self._designTaps(float(value), self.gain)
+    elif (param == "GAIN"):
+      filterTaps = self._designTaps(self.cutoffFreq, float(value))
+    else:
+      return False
+    if (filterTaps == None):
+      print "GNURadio: Filter taps not updated for %s - %s" % (param, value)
+      return False
+    self.firFilter.set_taps(filterTaps)
+    return True
+
 #
 # Implements a band pass filter block with configurable cutoff frequencies.
 # This creates a single sided band pass filter with complex coefficients
@@ -303,28 +789,63 @@ class BandPassFilterBlock(FlowGraphBlock):
     except ValueError, msg:
       print "GNURadio: Invalid band pass filter parameter - %s" % msg
       return None
+    self.sampleRate = sampleRate
+    filterTaps = self._designTaps(lowCutoffFreq, highCutoffFreq, gain)
+    if (filterTaps == None):
+      return None
+    self.firFilter = self._takePooledBlock()
+    if (self.firFilter == None):
+      self.firFilter = filter.fir_filter_ccc(1, filterTaps)
+    else:
+      self.firFilter.set_taps(filterTaps)
+    return self
+
+  # Calculate the FIR filter taps using the Blackman-Harris window method.
+  def _designTaps(self, lowCutoffFreq, highCutoffFreq, gain):
+    sampleRate = self.sampleRate
     if ((lowCutoffFreq <= 0) or (highCutoffFreq >= sampleRate/2) or
         (lowCutoffFreq >= highCutoffFreq)):
       print "GNURadio: Band pass cutoff frequencies out of range"
       return None
-
-    # Calculate the FIR filter taps using the Blackman-Harris window method.
     transitionWidth = sampleRate/25
-    filterTaps = filter.firdes.complex_band_pass(gain, sampleRate, lowCutoffFreq,
-      highCutoffFreq, transitionWidth, filter.firdes.WIN_BLACKMAN_HARRIS)
-    print "Generated FIR filter with %d taps" % len(filterTaps)
-    self.firFilter = filter.fir_filter_ccc(1, filterTaps)
-    return self
+    window = filter.firdes.WIN_BLACKMAN_HARRIS
+    filterTaps = filterTapCache.lookup(
+      ("BAND-PASS", sampleRate, lowCutoffFreq, highCutoffFreq, gain, window),
+      lambda: filter.firdes.complex_band_pass(gain, sampleRate, lowCutoffFreq,
+        highCutoffFreq, transitionWidth, window))
+    self.lowCutoffFreq = lowCutoffFreq
+    self.highCutoffFreq = highCutoffFreq
+    self.gain = gain
+    return filterTaps
 
   def grBlock(self):
     return self.firFilter
 
+  # Updates the filter taps in place, which takes effect on the next call to
+  # the running filter block.
+  def configure(self, param, value):
+    if (param == "LOW-CUTOFF"):
+      filterTaps = self._designTaps(float(value), self.highCutoffFreq, self.gain)
+    elif (param == "HIGH-CUTOFF"):
+      filterTaps = self._designTaps(self.lowCutoffFreq, float(value), self.gain)
+    elif (param == "GAIN"):
+      filterTaps = self._designTaps(self.lowCutoffFreq, self.highCutoffFreq, float(value))
+    else:
+      return False
+    if (filterTaps == None):
+      print "GNURadio: Filter taps not updated for %s - %s" % (param, value)
+      return False
+    self.firFilter.set_taps(filterTaps)
+    return True
+
 #
-# Implements a ScratchRadio message source block.
+# Implements a ScratchRadio message source block. When using the extended
+# frame format, long messages are split into fragments.
 #
 class MessageSourceBlock(FlowGraphBlock):
-  def __init__(self):
+  def __init__(self, extended):
     FlowGraphBlock.__init__(self)
+    self.extended = extended
 
   def setup(self, params):
     if (len(params) != 2):
@@ -348,21 +869,33 @@ class MessageSourceBlock(FlowGraphBlock):
       print "GNURadio: Invalid message source CPS rate - %s" % msg
       return None
 
-    self.msgSource = scratch_radio.message_source(msgFileName, msgCpsRate)
+    self.msgSource = self._takePooledBlock(msgFileName, msgCpsRate, self.extended)
+    if (self.msgSource == None):
+      self.msgSource = scratch_radio.message_source(
+        msgFileName, msgCpsRate, self.extended)
     return self
 
   def grBlock(self):
     return self.msgSource
 
+  def status(self):
+    if (self.msgSource.is_attached()):
+      return "attached"
+    return "waiting for writer"
+
 #
-# Implements a ScratchRadio message sink block.
+# Implements a ScratchRadio message sink block. When using the extended frame
+# format, fragmented messages are reassembled.
 #
 class MessageSinkBlock(FlowGraphBlock):
-  def __init__(self):
+  def __init__(self, extended):
     FlowGraphBlock.__init__(self)
+    self.extended = extended
 
+  # The optional second parameter specifies the maximum time in milliseconds
+  # for which received messages may be buffered before being written out.
   def setup(self, params):
-    if (len(params) != 1):
+    if ((len(params) < 1) or (len(params) > 2)):
       print "GNURadio: Invalid number of message sink parameters"
       return None
 
@@ -378,41 +911,97 @@ class MessageSinkBlock(FlowGraphBlock):
       print "GNURadio: Invalid message sink file name - %s" % msg
       return None
 
-    self.msgSink = scratch_radio.message_sink(msgFileName)
+    try:
+      maxFlushLatency = int(params[1]) if (len(params) == 2) else 0
+    except ValueError, msg:
+      print "GNURadio: Invalid message sink flush latency - %s" % msg
+      return None
+
+    self.msgSink = self._takePooledBlock(msgFileName, maxFlushLatency, self.extended)
+    if (self.msgSink == None):
+      self.msgSink = scratch_radio.message_sink(
+        msgFileName, maxFlushLatency, self.extended)
     return self
 
   def grBlock(self):
     return self.msgSink
 
+  def status(self):
+    if (self.msgSink.is_attached()):
+      return "attached"
+    return "waiting for reader"
+
 #
-# Implements a ScratchRadio simple framer block.
+# Implements a ScratchRadio simple framer block. In packed mode the framer
+# generates eight bits per output item.
 #
 class SimpleFramerBlock(FlowGraphBlock):
-  def __init__(self):
+  def __init__(self, packed, syncWord, extended, frameCheck):
     FlowGraphBlock.__init__(self)
-    self.simpleFramer = scratch_radio.simple_framer()
+    self.simpleFramer = self._takePooledBlock(
+      packed, syncWord, extended, frameCheck)
+    if (self.simpleFramer == None):
+      self.simpleFramer = scratch_radio.simple_framer(
+        packed, syncWord, extended, frameCheck)
 
   def grBlock(self):
     return self.simpleFramer
 
 #
-# Implements a ScratchRadio simple deframer block.
+# Implements a ScratchRadio simple deframer block. In packed mode the deframer
+# accepts eight bits per input item.
 #
 class SimpleDeframerBlock(FlowGraphBlock):
-  def __init__(self):
+  def __init__(self, packed, syncWord, extended, frameCheck):
     FlowGraphBlock.__init__(self)
-    self.simpleDeframer = scratch_radio.simple_deframer()
+    self.packed = packed
+    self.syncWord = syncWord
+    self.extended = extended
+    self.frameCheck = frameCheck
+
+  # The optional parameter specifies the maximum number of bit errors which
+  # are accepted when matching the frame sync word.
+  def setup(self, params):
+    if (len(params) > 1):
+      print "GNURadio: Invalid number of simple deframer parameters"
+      return None
+    try:
+      maxSyncErrors = int(params[0]) if (len(params) == 1) else 0
+    except ValueError, msg:
+      print "GNURadio: Invalid simple deframer parameter - %s" % msg
+      return None
+    self.simpleDeframer = self._takePooledBlock(
+      self.packed, self.syncWord, self.extended, self.frameCheck)
+    if (self.simpleDeframer == None):
+      self.simpleDeframer = scratch_radio.simple_deframer(
+        self.packed, self.syncWord, 0, self.extended, self.frameCheck)
+    try:
+      self.simpleDeframer.set_max_sync_errors(maxSyncErrors)
+    except ValueError, msg:
+      print "GNURadio: Invalid simple deframer parameter - %s" % msg
+      self._releasePooledBlock()
+      return None
+    return self
 
   def grBlock(self):
     return self.simpleDeframer
 
+  def configure(self, param, value):
+    if (param == "MAX-SYNC-ERRORS"):
+      self.simpleDeframer.set_max_sync_errors(int(value))
+    else:
+      return False
+    return True
+
 #
 # Implements a Manchester encoder block.
 #
 class ManchesterEncoderBlock(FlowGraphBlock):
-  def __init__(self):
+  def __init__(self, packed):
     FlowGraphBlock.__init__(self)
-    self.encoder = scratch_radio.manc_enc(False)
+    self.encoder = self._takePooledBlock(packed)
+    if (self.encoder == None):
+      self.encoder = scratch_radio.manc_enc(False, packed)
 
   def grBlock(self):
     return self.encoder
@@ -421,19 +1010,103 @@ class ManchesterEncoderBlock(FlowGraphBlock):
 # Implements a Manchester decoder block.
 #
 class ManchesterDecoderBlock(FlowGraphBlock):
-  def __init__(self):
+  def __init__(self, packed):
+    FlowGraphBlock.__init__(self)
+    self.decoder = self._takePooledBlock(packed)
+    if (self.decoder == None):
+      self.decoder = scratch_radio.manc_dec(False, packed)
+
+  def grBlock(self):
+    return self.decoder
+
+#
+# Implements a convolutional encoder block for forward error correction. This
+# is placed between the framer and the line encoder.
+#
+class ConvolutionalEncoderBlock(FlowGraphBlock):
+  def __init__(self, packed):
+    FlowGraphBlock.__init__(self)
+    self.encoder = self._takePooledBlock(packed)
+    if (self.encoder == None):
+      self.encoder = scratch_radio.conv_enc(packed)
+
+  def grBlock(self):
+    return self.encoder
+
+#
+# Implements a Viterbi decoder block for forward error correction. This is
+# placed between the line decoder and the deframer.
+#
+class ConvolutionalDecoderBlock(FlowGraphBlock):
+  def __init__(self, packed):
     FlowGraphBlock.__init__(self)
-    self.decoder = scratch_radio.manc_dec(False)
+    self.decoder = self._takePooledBlock(packed)
+    if (self.decoder == None):
+      self.decoder = scratch_radio.conv_dec(packed)
 
   def grBlock(self):
     return self.decoder
 
+#
+# Implements a data whitener block. This may be used instead of the Manchester
+# encoder, giving twice the data rate for the same symbol rate.
+#
+class WhitenerBlock(FlowGraphBlock):
+  def __init__(self, packed):
+    FlowGraphBlock.__init__(self)
+    self.whitener = self._takePooledBlock(packed)
+    if (self.whitener == None):
+      self.whitener = scratch_radio.whitener(packed)
+
+  def grBlock(self):
+    return self.whitener
+
+#
+# Implements a data dewhitener block. This may be used instead of the
+# Manchester decoder.
+#
+class DewhitenerBlock(FlowGraphBlock):
+  def __init__(self, packed):
+    FlowGraphBlock.__init__(self)
+    self.dewhitener = self._takePooledBlock(packed)
+    if (self.dewhitener == None):
+      self.dewhitener = scratch_radio.dewhitener(packed)
+
+  def grBlock(self):
+    return self.dewhitener
+
+#
+# Implements an OOK modulator with a packed bit stream input. The OOK modulator
+# only supports unpacked bit streams, so the input is unpacked first.
+#
+class PackedOokModulator(gr.hier_block2):
+  def __init__(self, baudRate, sampleRate, modFreq, burstMode, rampFraction):
+    gr.hier_block2.__init__(self, "Packed OOK Modulator",
+      gr.io_signature(1, 1, gr.sizeof_char),
+      gr.io_signature(1, 1, gr.sizeof_gr_complex))
+    self.unpacker = scratch_radio.bit_unpacker()
+    self.modulator = scratch_radio.ook_modulator(
+      baudRate, sampleRate, modFreq, burstMode, rampFraction)
+    self.connect(self, self.unpacker, self.modulator, self)
+
+  def reset_state(self):
+    self.modulator.reset_state()
+
+  def set_baud_rate(self, baudRate):
+    self.modulator.set_baud_rate(baudRate)
+
+  def set_mod_freq(self, modFreq):
+    self.modulator.set_mod_freq(modFreq)
+
 #
 # Implements an OOK modulator block.
 #
 class OokModulatorBlock(FlowGraphBlock):
-  def __init__(self):
+  def __init__(self, packed, burstMode, rampFraction):
     FlowGraphBlock.__init__(self)
+    self.packed = packed
+    self.burstMode = burstMode
+    self.rampFraction = rampFraction
 
   def setup(self, params):
     if (len(params) != 3):
@@ -450,18 +1123,46 @@ class OokModulatorBlock(FlowGraphBlock):
       return None
 
     # TODO: Should check valid range for baudRate and sampleRate.
-    self.modulator = scratch_radio.ook_modulator(baudRate, sampleRate, modFreq)
+    self.baudRate = baudRate
+    self.sampleRate = sampleRate
+    self.modFreq = modFreq
+    self.modulator = self._takePooledBlock(*self._poolConfig())
+    if (self.modulator == None):
+      if (self.packed):
+        self.modulator = PackedOokModulator(baudRate, sampleRate,
+          modFreq, self.burstMode, self.rampFraction)
+      else:
+        self.modulator = scratch_radio.ook_modulator(baudRate, sampleRate,
+          modFreq, self.burstMode, self.rampFraction)
     return self
 
   def grBlock(self):
     return self.modulator
 
+  # Gets the modulator configuration used to select pooled blocks.
+  def _poolConfig(self):
+    return (self.baudRate, self.sampleRate, self.modFreq,
+      self.packed, self.burstMode, self.rampFraction)
+
+  def configure(self, param, value):
+    if (param == "BAUD-RATE"):
+      self.baudRate = int(value)
+      self.modulator.set_baud_rate(self.baudRate)
+    elif (param == "MOD-FREQ"):
+      self.modFreq = int(value)
+      self.modulator.set_mod_freq(self.modFreq)
+    else:
+      return False
+    self._setPoolKey(*self._poolConfig())
+    return True
+
 #
 # Implements an OOK demodulator block.
 #
 class OokDemodulatorBlock(FlowGraphBlock):
-  def __init__(self):
+  def __init__(self, decimation):
     FlowGraphBlock.__init__(self)
+    self.decimation = decimation
 
   def setup(self, params):
     if (len(params) != 2):
@@ -477,18 +1178,26 @@ class OokDemodulatorBlock(FlowGraphBlock):
       return None
 
     # TODO: Should check valid range for baudRate and sampleRate.
-    self.demodulator = scratch_radio.ook_demodulator(baudRate, sampleRate)
+    self.demodulator = self._takePooledBlock(
+      baudRate, sampleRate, self.decimation)
+    if (self.demodulator == None):
+      self.demodulator = scratch_radio.ook_demodulator(
+        baudRate, sampleRate, self.decimation)
     return self
 
   def grBlock(self):
     return self.demodulator
 
 #
-# Implements a symbol synchronisation block.
+# Implements a symbol synchronisation block. In packed mode the recovered bits
+# are output eight bits per item. The specified sample rate is reduced by the
+# OOK demodulator decimation factor.
 #
 class SymbolSyncBlock(FlowGraphBlock):
-  def __init__(self):
+  def __init__(self, packed, decimation):
     FlowGraphBlock.__init__(self)
+    self.packed = packed
+    self.decimation = decimation
 
   def setup(self, params):
     if (len(params) != 2):
@@ -502,23 +1211,50 @@ class SymbolSyncBlock(FlowGraphBlock):
     except ValueError, msg:
       print "GNURadio: Invalid symbol sync parameter - %s" % msg
       return None
+    sampleRate /= self.decimation
+    if (not self._checkSampleRate(baudRate, sampleRate)):
+      return None
 
     # TODO: Should check valid range for baudRate and sampleRate.
-    self.symbolSync = scratch_radio.symbol_sync(baudRate, sampleRate)
+    self.symbolSync = self._takePooledBlock(baudRate, sampleRate, self.packed)
+    if (self.symbolSync == None):
+      self.symbolSync = scratch_radio.symbol_sync(
+        baudRate, sampleRate, self.packed)
+    self.sampleRate = sampleRate
     return self
 
   def grBlock(self):
     return self.symbolSync
 
+  # Checks that the decimated sample rate provides at least four samples per
+  # symbol at the specified baud rate.
+  def _checkSampleRate(self, baudRate, sampleRate):
+    if (sampleRate < 4 * baudRate):
+      print "GNURadio: Symbol sync sample rate too low for RX decimation"
+      return False
+    return True
+
+  def configure(self, param, value):
+    if (param == "BAUD-RATE"):
+      baudRate = int(value)
+      if (not self._checkSampleRate(baudRate, self.sampleRate)):
+        return False
+      self.symbolSync.set_baud_rate(baudRate)
+    else:
+      return False
+    self._setPoolKey(baudRate, self.sampleRate, self.packed)
+    return True
+
 #
 # Implements the flow graph. On initialisation ensures that the graph is reset
 # to a known state and builds a mapping of component types to their associated
 # creation functions.
 #
 class FlowGraph(gr.top_block):
-  def __init__(self, deviceSerialNumber):
+  def __init__(self, deviceRegistry, radioBackend, headless):
     gr.top_block.__init__(self, "Scratch Flow Graph")
     self.comps = {}
+    self.channelPadding = []
     self.compCreateFns = {}
     self.compCreateFns["RADIO-SOURCE"] = self._createRadioSource
     self.compCreateFns["RADIO-SINK"] = self._createRadioSink
@@ -531,27 +1267,65 @@ class FlowGraph(gr.top_block):
     self.compCreateFns["SIMPLE-DEFRAMER"] = self._createSimpleDeframer
     self.compCreateFns["MANCHESTER-ENCODER"] = self._createManchesterEncoder
     self.compCreateFns["MANCHESTER-DECODER"] = self._createManchesterDecoder
+    self.compCreateFns["CONVOLUTIONAL-ENCODER"] = self._createConvolutionalEncoder
+    self.compCreateFns["CONVOLUTIONAL-DECODER"] = self._createConvolutionalDecoder
+    self.compCreateFns["WHITENER"] = self._createWhitener
+    self.compCreateFns["DEWHITENER"] = self._createDewhitener
     self.compCreateFns["OOK-MODULATOR"] = self._createOokModulator
     self.compCreateFns["OOK-DEMODULATOR"] = self._createOokDemodulator
     self.compCreateFns["BIT-RATE-SAMPLER"] = self._createSymbolSync
-    self.deviceSerialNumber = deviceSerialNumber
+    self.deviceRegistry = deviceRegistry
+    self.deviceSerialNumbers = []
+    self.radioBackend = radioBackend
+    self.headless = headless
+    self.bitFormat = "UNPACKED"
+    self.frameFormat = "STANDARD"
+    self.frameCheck = "FLETCHER"
+    self.txMode = "CONTINUOUS"
+    self.txRampFraction = 0.0
+    self.rxDecimation = 1
+    self.syncWord = None
+
+  # Updates the list of available radio devices, waiting for any device scan
+  # which is still running in the background.
+  def _updateDevices(self):
+    self.deviceSerialNumbers = self.deviceRegistry.waitForScan()
 
   # Add a new radio source data block to the hierarchy. This uses the Lime
-  # Microsystems SoapySDR driver.
+  # Microsystems SoapySDR driver unless the simulated radio backend has been
+  # selected. The first device found is the default.
   def _createRadioSource(self, compName, params):
-    radioSourceBlock = RadioSourceBlock(deviceSerialNumber)
+    self._updateDevices()
+    if (len(self.deviceSerialNumbers) == 0):
+      print "GNURadio: No radio devices available"
+      return None
+    if (self.radioBackend != None):
+      radioSourceBlock = SimulatedRadioSourceBlock(self.deviceSerialNumbers[0])
+    else:
+      radioSourceBlock = RadioSourceBlock(self.deviceSerialNumbers[0])
     return radioSourceBlock.setup(self, params)
 
   # Add a new radio sink data block to the hierarchy. This uses the Lime
-  # Microsystems SoapySDR driver.
+  # Microsystems SoapySDR driver unless the simulated radio backend has been
+  # selected. The first device found is the default.
   def _createRadioSink(self, compName, params):
-    radioSinkBlock = RadioSinkBlock(deviceSerialNumber)
+    self._updateDevices()
+    if (len(self.deviceSerialNumbers) == 0):
+      print "GNURadio: No radio devices available"
+      return None
+    if (self.radioBackend != None):
+      radioSinkBlock = SimulatedRadioSinkBlock(self.deviceSerialNumbers[0])
+    else:
+      radioSinkBlock = RadioSinkBlock(self.deviceSerialNumbers[0])
     return radioSinkBlock.setup(self, params)
 
   # Create a new display sink. This is currently limited to a simple FFT
   # or waterfall displays, but more advanced options can be included at
-  # a later date
+  # a later date. Display sinks are not available in headless mode.
   def _createDisplaySink(self, compName, params):
+    if (self.headless):
+      print "GNURadio: Display sinks are not supported in headless mode"
+      return None
     displayType = params.pop(0)
     if (displayType == "WATERFALL"):
       displaySinkBlock = DisplaySinkWaterfallBlock()
@@ -575,45 +1349,102 @@ class FlowGraph(gr.top_block):
 
   # Create a new message source block.
   def _createMessageSource(self, compName, params):
-    messageSource = MessageSourceBlock()
+    messageSource = MessageSourceBlock(self.frameFormat == "EXTENDED")
     return messageSource.setup(params)
 
   # Create a new message sink block.
   def _createMessageSink(self, compName, params):
-    messageSink = MessageSinkBlock()
+    messageSink = MessageSinkBlock(self.frameFormat == "EXTENDED")
     return messageSink.setup(params)
 
+  # Gets the frame sync word for new framing components. The default is only
+  # looked up on first use so that the block library is not loaded early.
+  def _getSyncWord(self):
+    if (self.syncWord == None):
+      self.syncWord = scratch_radio.SIMPLE_FRAME_SYNC_WORD
+    return self.syncWord
+
+  # Gets the block library identifier for the selected frame check type.
+  def _getFrameCheck(self):
+    return getattr(scratch_radio, "SIMPLE_FRAME_CHECK_" + self.frameCheck)
+
   # Create a new simple framer block.
   def _createSimpleFramer(self, compName, params):
-    return SimpleFramerBlock()
+    return SimpleFramerBlock(self.bitFormat == "PACKED", self._getSyncWord(),
+      self.frameFormat == "EXTENDED", self._getFrameCheck())
 
   # Create a new simple deframer block.
   def _createSimpleDeframer(self, compName, params):
-    return SimpleDeframerBlock()
+    simpleDeframer = SimpleDeframerBlock(self.bitFormat == "PACKED",
+      self._getSyncWord(), self.frameFormat == "EXTENDED",
+      self._getFrameCheck())
+    return simpleDeframer.setup(params)
 
   # Create a new Manchester encoder block.
   def _createManchesterEncoder(self, compName, params):
-    return ManchesterEncoderBlock()
+    return ManchesterEncoderBlock(self.bitFormat == "PACKED")
 
   # Create a new Manchester decoder block.
   def _createManchesterDecoder(self, compName, params):
-    return ManchesterDecoderBlock()
+    return ManchesterDecoderBlock(self.bitFormat == "PACKED")
+
+  # Create a new convolutional encoder block.
+  def _createConvolutionalEncoder(self, compName, params):
+    return ConvolutionalEncoderBlock(self.bitFormat == "PACKED")
+
+  # Create a new convolutional decoder block.
+  def _createConvolutionalDecoder(self, compName, params):
+    return ConvolutionalDecoderBlock(self.bitFormat == "PACKED")
+
+  # Create a new data whitener block.
+  def _createWhitener(self, compName, params):
+    return WhitenerBlock(self.bitFormat == "PACKED")
+
+  # Create a new data dewhitener block.
+  def _createDewhitener(self, compName, params):
+    return DewhitenerBlock(self.bitFormat == "PACKED")
 
   # Create a new OOK modulator block.
   def _createOokModulator(self, compName, params):
-    modulator = OokModulatorBlock()
+    modulator = OokModulatorBlock(self.bitFormat == "PACKED",
+      self.txMode == "BURST", self.txRampFraction)
     return modulator.setup(params)
 
   # Create a new OOK demodulator block.
   def _createOokDemodulator(self, compName, params):
-    demodulator = OokDemodulatorBlock()
+    demodulator = OokDemodulatorBlock(self.rxDecimation)
     return demodulator.setup(params)
 
   # Create a new symbol timing recovery block.
   def _createSymbolSync(self, compName, params):
-    symbolSync = SymbolSyncBlock()
+    symbolSync = SymbolSyncBlock(self.bitFormat == "PACKED", self.rxDecimation)
     return symbolSync.setup(params)
 
+  # Starts the flow graph. Simulated radio channels which only have one side in
+  # use are padded with a null source or sink so that the graph is complete.
+  def start(self):
+    if (self.radioBackend != None):
+      for (deviceSerialNumber, channel) in self.radioBackend.channels.items():
+        sourceActive = deviceSerialNumber in RadioSourceBlock.activeDevices
+        sinkActive = deviceSerialNumber in RadioSinkBlock.activeDevices
+        if (sourceActive and not sinkActive):
+          padding = (blocks.null_source(gr.sizeof_gr_complex), channel)
+        elif (sinkActive and not sourceActive):
+          padding = (channel, blocks.null_sink(gr.sizeof_gr_complex))
+        else:
+          continue
+        self.connect(*padding)
+        self.channelPadding.append(padding)
+    gr.top_block.start(self)
+
+  # Waits for the flow graph to stop, then removes any simulated radio channel
+  # padding so that the graph may be modified.
+  def wait(self):
+    gr.top_block.wait(self)
+    for padding in self.channelPadding:
+      self.disconnect(*padding)
+    self.channelPadding = []
+
   # Resets the flow graph by disconnecting all the components and then removing
   # them from the component table. This uses the cleanup method to release any
   # associated component resources.
@@ -623,25 +1454,151 @@ class FlowGraph(gr.top_block):
       component.cleanup()
     self.comps = {}
 
-  # Perform initial processing for the 'CREATE' command. This checks the common
-  # command fields and then dispatches further processing to component specific
-  # functions.
-  def createComponent(self, params):
+  # Reports the status of each component which provides status information.
+  def reportStatus(self):
+    for compName in sorted(self.comps.keys()):
+      compStatus = self.comps[compName].status()
+      if (compStatus != None):
+        print "  %s : %s" % (compName, compStatus)
+
+  # Updates a graph wide configuration option. Options apply to components
+  # created after the update, so they may only be changed while the graph is
+  # empty. The supported options are:
+  #   BIT-FORMAT       - 'PACKED' selects eight bits per item between the
+  #                      framing, line coding and bit sampling components,
+  #                      otherwise 'UNPACKED'.
+  #   SYNC-WORD        - the 32 bit frame sync word in hexadecimal, shared by
+  #                      the simple framer and deframer components.
+  #   FRAME-FORMAT     - 'EXTENDED' selects two byte frame length fields and
+  #                      fragmentation of long messages, otherwise 'STANDARD'.
+  #   FRAME-CHECK      - the simple framer and deframer integrity check, which
+  #                      is one of 'FLETCHER', 'CRC16' or 'CRC32'.
+  #   TX-MODE          - 'BURST' makes the OOK modulator generate no samples
+  #                      between frames and tag the start and end of each
+  #                      burst, otherwise 'CONTINUOUS'. Burst mode requires the
+  #                      simulated radio backend, since the gr-limesdr sink
+  #                      ignores the tags.
+  #   TX-RAMP-FRACTION - the fraction of the symbol period, from 0.0 to 1.0,
+  #                      over which the OOK modulator ramps the carrier on and
+  #                      off to reduce the transmit bandwidth. The default of
+  #                      0.0 generates square pulses.
+  #   RX-DECIMATION    - the integer factor, of at least 1, by which the OOK
+  #                      demodulator reduces the sample rate. The bit rate
+  #                      sampler rejects decimated sample rates below 4 samples
+  #                      per bit when it is created or its baud rate is changed.
+  def configureGraph(self, params):
+    if (len(params) != 2):
+      print "GNURadio: Malformed CONFIG command"
+      return False
+    option = params[0]
+    value = params[1]
+    if (len(self.comps) != 0):
+      print "GNURadio: Graph options may only be changed for an empty graph"
+      return False
+    if (option == "BIT-FORMAT"):
+      if (value not in ("PACKED", "UNPACKED")):
+        print "GNURadio: Invalid bit format - %s" % value
+        return False
+      self.bitFormat = value
+    elif (option == "SYNC-WORD"):
+      try:
+        syncWord = int(value, 16)
+      except ValueError, msg:
+        print "GNURadio: Invalid sync word - %s" % msg
+        return False
+      if ((syncWord < 0) or (syncWord > 0xFFFFFFFF)):
+        print "GNURadio: Sync word out of range - %s" % value
+        return False
+      self.syncWord = syncWord
+    elif (option == "FRAME-FORMAT"):
+      if (value not in ("STANDARD", "EXTENDED")):
+        print "GNURadio: Invalid frame format - %s" % value
+        return False
+      self.frameFormat = value
+    elif (option == "FRAME-CHECK"):
+      if (value not in ("FLETCHER", "CRC16", "CRC32")):
+        print "GNURadio: Invalid frame check - %s" % value
+        return False
+      self.frameCheck = value
+    elif (option == "TX-MODE"):
+      if (value not in ("CONTINUOUS", "BURST")):
+        print "GNURadio: Invalid transmit mode - %s" % value
+        return False
+      if ((value == "BURST") and (self.radioBackend == None)):
+        print "GNURadio: Burst transmit mode requires the simulated radio backend"
+        return False
+      self.txMode = value
+    elif (option == "TX-RAMP-FRACTION"):
+      try:
+        txRampFraction = float(value)
+      except ValueError, msg:
+        print "GNURadio: Invalid TX ramp fraction - %s" % msg
+        return False
+      if ((txRampFraction < 0.0) or (txRampFraction > 1.0)):
+        print "GNURadio: TX ramp fraction out of range - %s" % value
+        return False
+      self.txRampFraction = txRampFraction
+    elif (option == "RX-DECIMATION"):
+      try:
+        rxDecimation = int(value)
+      except ValueError, msg:
+        print "GNURadio: Invalid RX decimation - %s" % msg
+        return False
+      if (rxDecimation < 1):
+        print "GNURadio: RX decimation out of range - %s" % value
+        return False
+      self.rxDecimation = rxDecimation
+    else:
+      print "GNURadio: Unknown graph option - %s" % option
+      return False
+    return True
+
+  # Checks the common fields for a 'CREATE' command. The list of new component
+  # names is used to detect duplicates within a graph transaction.
+  def _checkCreateParams(self, params, newNames):
     if (len(params) < 2):
       print "GNURadio: Malformed CREATE command"
       return False
-    compType = params.pop(0)
-    compName = params.pop(0)
+    compType = params[0]
+    compName = params[1]
 
     # Check for duplicate component names.
-    if (compName in self.comps):
+    if ((compName in self.comps) or (compName in newNames)):
       print "GNURadio: Duplicate component name - %s" % compName
       return False
 
-    # Get the component creation function to use.
+    # Check that the component creation function is available.
     if (compType not in self.compCreateFns):
       print "GNURadio: Unknown component type - %s" % compType
       return False
+    return True
+
+  # Checks the fields for a 'CONNECT' command. The list of new component names
+  # is used to allow connections to components in the same graph transaction.
+  def _checkConnectParams(self, params, newNames):
+    if (len(params) != 4):
+      print "GNURadio: Malformed CONNECT command"
+      return False
+    sourceName = params[0];
+    targetName = params[2];
+
+    # Check for valid component names.
+    if ((sourceName not in self.comps) and (sourceName not in newNames)):
+      print "GNURadio: Unknown source for connection - %s" % sourceName
+      return False
+    if ((targetName not in self.comps) and (targetName not in newNames)):
+      print "GNURadio: Unknown target for connection - %s" % targetName
+      return False
+    return True
+
+  # Perform initial processing for the 'CREATE' command. This checks the common
+  # command fields and then dispatches further processing to component specific
+  # functions.
+  def createComponent(self, params):
+    if (not self._checkCreateParams(params, [])):
+      return False
+    compType = params.pop(0)
+    compName = params.pop(0)
     compCreateFn = self.compCreateFns[compType]
 
     # Run the component creation function.
@@ -656,38 +1613,129 @@ class FlowGraph(gr.top_block):
   # are currently ignored, since no multiple input or multiple output blocks
   # are defined.
   def connectComponents(self, params):
-    if (len(params) != 4):
-      print "GNURadio: Malformed CONNECT command"
+    if (not self._checkConnectParams(params, [])):
       return False
-    sourceName = params[0];
-    targetName = params[2];
 
-    # Check for valid component names.
-    if (sourceName not in self.comps):
-      print "GNURadio: Unknown source for connection - %s" % sourceName
+    # Hook up the associated GNU Radio blocks.
+    source = self.comps[params[0]]
+    target = self.comps[params[2]]
+    self.connect(source.grBlock(), target.grBlock())
+    return True
+
+  # Updates a single parameter of an existing component. This may be used to
+  # retune or otherwise reconfigure components while the radio is running.
+  def configureComponent(self, params):
+    if (len(params) != 3):
+      print "GNURadio: Malformed SET command"
       return False
-    if (targetName not in self.comps):
-      print "GNURadio: Unknown target for connection - %s" % targetName
+    compName = params[0]
+    param = params[1]
+    value = params[2]
+    if (compName not in self.comps):
+      print "GNURadio: Unknown component for SET command - %s" % compName
       return False
+    try:
+      handled = self.comps[compName].configure(param, value)
+    except ValueError, msg:
+      print "GNURadio: Invalid %s parameter value - %s" % (param, msg)
+      return False
+    if (not handled):
+      print "GNURadio: Failed to set %s parameter - %s" % (compName, param)
+    return handled
 
-    # Hook up the associated GNU Radio blocks.
-    source = self.comps[sourceName]
-    target = self.comps[targetName]
-    self.connect(source.grBlock(), target.grBlock())
+  # Builds a set of new components and connections as a single transaction.
+  # The complete topology is validated before any components are created and
+  # any components or connections which have already been added are removed
+  # again if a later step fails, leaving the existing graph unchanged.
+  def buildGraph(self, createList, connectList):
+    newNames = []
+    for params in createList:
+      if (not self._checkCreateParams(params, newNames)):
+        return False
+      newNames.append(params[1])
+    for params in connectList:
+      if (not self._checkConnectParams(params, newNames)):
+        return False
+
+    # Create all the new components in a single pass.
+    newComps = {}
+    for params in createList:
+      compCreateFn = self.compCreateFns[params[0]]
+      newComp = compCreateFn(params[1], params[2:])
+      if (newComp == None):
+        print "GNURadio: Graph transaction failed to create - %s" % params[1]
+        for component in newComps.values():
+          component.cleanup()
+        return False
+      newComps[params[1]] = newComp
+    self.comps.update(newComps)
+
+    # Hook up all the associated GNU Radio blocks.
+    connections = []
+    try:
+      for params in connectList:
+        source = self.comps[params[0]].grBlock()
+        target = self.comps[params[2]].grBlock()
+        self.connect(source, target)
+        connections.append((source, target))
+    except Exception, msg:
+      print "GNURadio: Graph transaction failed to connect - %s" % msg
+      for (source, target) in connections:
+        self.disconnect(source, target)
+      for compName in newComps:
+        self.comps.pop(compName).cleanup()
+      return False
+    print "GNURadio: Graph transaction created %d components, %d connections" % (
+      len(createList), len(connectList))
     return True
 
 #
-# Implements command parsing on a timed callback from the main QT event loop.
-# This allows QT GUI components to be manipulated in direct response to the
-# incoming commands.
+# Implements a histogram of command latencies, measured from the time a command
+# line arrives on the command pipe until the command has been acted on. This
+# includes both queueing delay and the command processing time. Power of two
+# bin sizes are used, with latencies recorded in microseconds.
 #
-class CommandParser(QtCore.QObject):
-  def __init__(self, parent, commandQueue, deviceSerialNumber):
-    QtCore.QObject.__init__(self, parent)
-    self.cmdQueue = commandQueue
-    self.flowGraph = FlowGraph(deviceSerialNumber)
+class LatencyHistogram(object):
+  def __init__(self, numBins=24):
+    self.bins = [0] * numBins
+    self.count = 0
+    self.total = 0.0
+    self.maximum = 0.0
+
+  def record(self, latency):
+    binIndex = int(latency * 1e6).bit_length()
+    if (binIndex >= len(self.bins)):
+      binIndex = len(self.bins) - 1
+    self.bins[binIndex] += 1
+    self.count += 1
+    self.total += latency
+    if (latency > self.maximum):
+      self.maximum = latency
+
+  def report(self):
+    if (self.count == 0):
+      print "GNURadio: No command latencies recorded"
+      return
+    print "GNURadio: Command latency for %d commands (mean %.1f us, max %.1f us)" % (
+      self.count, 1e6 * self.total / self.count, 1e6 * self.maximum)
+    for binIndex in range(len(self.bins)):
+      if (self.bins[binIndex] != 0):
+        print "  < %9d us : %d" % (1 << binIndex, self.bins[binIndex])
+
+#
+# Implements command parsing. The parser is driven from the main event loop
+# whenever data is available on the command pipe. When running with the QT GUI
+# this is the QT event loop, which allows QT GUI components to be manipulated
+# in direct response to the incoming commands.
+#
+class CommandParser(object):
+  def __init__(self, commandReader, deviceRegistry, radioBackend, headless):
+    self.cmdReader = commandReader
+    self.deviceRegistry = deviceRegistry
+    self.flowGraph = FlowGraph(deviceRegistry, radioBackend, headless)
     self.radioRunning = False
-    self.timerId = self.startTimer(500)
+    self.graphTransaction = None
+    self.latencyHistogram = LatencyHistogram()
 
   def _processInteractiveCommands(self, command):
     print "Interactive command: %s" % command
@@ -695,6 +1743,10 @@ class CommandParser(QtCore.QObject):
     cmdTerms = command.split()
     cmdType = cmdTerms.pop(0)
 
+    # Reconfigure a running block.
+    if (cmdType == "SET"):
+      handled = self.flowGraph.configureComponent(cmdTerms)
+
     if (not handled):
       print "GNURadio: Unhandled interactive command type - %s" % cmdType
     return handled
@@ -705,14 +1757,32 @@ class CommandParser(QtCore.QObject):
     cmdTerms = command.split()
     cmdType = cmdTerms.pop(0)
 
+    # Stage block creation and connection while a graph transaction is open.
+    if ((self.graphTransaction != None) and
+        ((cmdType == "CREATE") or (cmdType == "CONNECT"))):
+      self.graphTransaction.append((cmdType, cmdTerms))
+      handled = True
+
     # Create a new block.
-    if (cmdType == "CREATE"):
+    elif (cmdType == "CREATE"):
       handled = self.flowGraph.createComponent(cmdTerms)
 
     # Connect existing blocks.
     elif (cmdType == "CONNECT"):
       handled = self.flowGraph.connectComponents(cmdTerms)
 
+    # Reconfigure an existing block.
+    elif (cmdType == "SET"):
+      handled = self.flowGraph.configureComponent(cmdTerms)
+
+    # Open, commit or abort a graph transaction.
+    elif (cmdType == "GRAPH"):
+      handled = self._processGraphCommand(cmdTerms)
+
+    # Update the graph wide configuration options.
+    elif (cmdType == "CONFIG"):
+      handled = self.flowGraph.configureGraph(cmdTerms)
+
     # Ignore comments.
     elif (cmdType == "#"):
       handled = True
@@ -721,7 +1791,42 @@ class CommandParser(QtCore.QObject):
       print "GNURadio: Unhandled setup command type - %s" % cmdType
     return handled
 
-  # Parses individual commands as they are removed from the command queue.
+  # Processes the graph transaction commands. Block creation and connection
+  # commands issued between 'GRAPH BEGIN' and 'GRAPH COMMIT' are validated and
+  # applied to the flow graph as a single transaction on commit.
+  def _processGraphCommand(self, params):
+    if (len(params) != 1):
+      print "GNURadio: Malformed GRAPH command"
+      return False
+    action = params[0]
+    if (action == "BEGIN"):
+      if (self.graphTransaction != None):
+        print "GNURadio: Graph transaction already open"
+        return False
+      self.graphTransaction = []
+      return True
+    if (self.graphTransaction == None):
+      print "GNURadio: No graph transaction open"
+      return False
+    stagedCommands = self.graphTransaction
+    self.graphTransaction = None
+    if (action == "ABORT"):
+      print "GNURadio: Graph transaction aborted"
+      return True
+    elif (action == "COMMIT"):
+      createList = []
+      connectList = []
+      for (cmdType, cmdTerms) in stagedCommands:
+        if (cmdType == "CREATE"):
+          createList.append(cmdTerms)
+        else:
+          connectList.append(cmdTerms)
+      return self.flowGraph.buildGraph(createList, connectList)
+    else:
+      print "GNURadio: Unknown graph transaction action - %s" % action
+      return False
+
+  # Parses individual commands as they are read from the command pipe.
   def _parseCommand(self, command):
     handled = False
 
@@ -735,6 +1840,7 @@ class CommandParser(QtCore.QObject):
         self.radioRunning = False
         print "GNURadio: STOPPED"
       self.flowGraph.resetGraph()
+      self.graphTransaction = None
       print "GNURadio: RESET"
 
     # Start the radio running if it is currently idle.
@@ -760,6 +1866,25 @@ class CommandParser(QtCore.QObject):
       else:
         print "GNURadio: STOPPED (NOT RUNNING)"
 
+    # Report the command latency histogram.
+    elif (command == "LATENCY"):
+      handled = True
+      self.latencyHistogram.report()
+
+    # Report the radio state and component status.
+    elif (command == "STATUS"):
+      handled = True
+      print "GNURadio: %s with %d components" % (
+        "RUNNING" if self.radioRunning else "STOPPED", len(self.flowGraph.comps))
+      self.flowGraph.reportStatus()
+
+    # Rescan for radio devices and report the devices found.
+    elif (command == "DEVICES"):
+      handled = True
+      self.deviceRegistry.waitForScan()
+      self.deviceRegistry.scan()
+      self.deviceRegistry.report()
+
     # Process interactive commands for running radio.
     elif (self.radioRunning):
       handled = self._processInteractiveCommands(command)
@@ -768,21 +1893,28 @@ class CommandParser(QtCore.QObject):
     else:
       handled = self._processSetupCommands (command)
 
-  # Overrides the standard QTObject timer callback to parse outstanding
-  # commands from the command queue.
-  def timerEvent(self, event):
-    if (self.timerId == event.timerId()):
-      while (not self.cmdQueue.empty()):
-        self._parseCommand(self.cmdQueue.get())
+  # Invoked from the main event loop when data is available on the command
+  # pipe. Parses all the complete commands which have been received, recording
+  # the latency from command arrival until the command has been acted on. A
+  # failed command is reported and does not prevent the following commands
+  # from being processed.
+  def readCommands(self):
+    for (arrivalTime, command) in self.cmdReader.readCommands():
+      try:
+        self._parseCommand(command)
+      except Exception, msg:
+        print "GNURadio: Command failed - %s" % msg
+      finally:
+        self.latencyHistogram.record(time.time() - arrivalTime)
 
 #
-# Implements command file reader as an independent Python thread, which carries
-# out blocking line reads on the command file and forwards them to the main
-# QT application thread via a Python queue.
+# Implements a non-blocking command pipe reader. The command pipe is opened for
+# both reading and writing, which means that opening it does not block until
+# the Scratch extension connects and that no end of file condition is seen
+# when the extension closes its end of the pipe.
 #
-class CommandReader(Thread):
-  def __init__(self, commandQueue):
-    Thread.__init__(self)
+class CommandReader(object):
+  def __init__(self):
 
     # Creates the command pipe FIFO if not already present.
     commandPipePath = os.path.dirname(COMMAND_PIPE_NAME)
@@ -790,57 +1922,222 @@ class CommandReader(Thread):
       os.makedirs(commandPipePath)
     if not os.path.exists(COMMAND_PIPE_NAME):
       os.mkfifo(COMMAND_PIPE_NAME)
+    self.cmdFd = os.open(COMMAND_PIPE_NAME, os.O_RDWR | os.O_NONBLOCK)
+    self.lineBuffer = ''
+    self.lineBufferTime = None
+
+  def fileno(self):
+    return self.cmdFd
+
+  # Reads all the data currently available on the command pipe and splits it
+  # into complete command lines, each tagged with its arrival time. Every read
+  # is timestamped as soon as it returns, and a command line takes the arrival
+  # time of the read which delivered its first byte. Partial lines are retained
+  # until the rest of the line is received.
+  def readCommands(self):
+    commands = []
+    while True:
+      try:
+        data = os.read(self.cmdFd, 4096)
+      except OSError, err:
+        if (err.errno == errno.EAGAIN):
+          break
+        raise
+      readTime = time.time()
+      if (data == ''):
+        break
+      if (self.lineBuffer == ''):
+        self.lineBufferTime = readTime
+      lines = (self.lineBuffer + data).split('\n')
+      self.lineBuffer = lines.pop()
+      for line in lines:
+        cmd = line.rstrip()
+        if (cmd != ''):
+          commands.append((self.lineBufferTime, cmd))
+        self.lineBufferTime = readTime
+    return commands
 
-    # Registers the command queue instance.
-    self.cmdQueue = commandQueue
-    self.running = True
+#
+# Specifies the information held for each radio device found during device
+# enumeration.
+#
+RadioDevice = collections.namedtuple("RadioDevice", ["name", "serial", "media"])
 
-  def run(self):
-    cmdFile = open(COMMAND_PIPE_NAME, 'r')
-    while self.running:
-      cmd = cmdFile.readline().rstrip()
-      if (cmd == ''):
-        time.sleep(0.5)
-      else:
-        self.cmdQueue.put(cmd)
-        while (self.cmdQueue.full()):
-          time.sleep(0.5)
-
-#
-# Check for the availability of a single LimeMini device on startup.
-#
-def checkForLimeMini():
-  regex = '\s*\*\s*\[\s*(.+),\s*(.+),\s*(.+),\s*(.+),\s*serial=(.+)\]'
-  limeUtil = os.popen("LimeUtil -find")
-  deviceList = limeUtil.readlines()
-  limeUtil.close()
-  deviceSerialNumber = None
-  for deviceInfo in deviceList:
-    matches = re.match(regex, deviceInfo)
-    if (matches != None):
-      deviceInfo = matches.groups()
-      if (deviceInfo[0] == "LimeSDR Mini"):
-        deviceSerialNumber = deviceInfo[4]
-  return deviceSerialNumber
-
-#
-# Run the main application.
-#
-def runApp(deviceSerialNumber):
-  qapp = QtGui.QApplication(sys.argv)
-  cmdQueue = Queue(8)
-  cmdReader = CommandReader(cmdQueue)
-  cmdReader.start()
-  cmdParser = CommandParser(qapp, cmdQueue, deviceSerialNumber)
-  qapp.exec_()
+#
+# Enumerates LimeSDR Mini devices in process using the SoapySDR bindings.
+# Raises ImportError if the bindings are not installed.
+#
+class SoapyDeviceEnumerator(object):
+  def enumerate(self):
+    devices = []
+    for deviceArgs in soapySDR.Device.enumerate("driver=lime"):
+      deviceArgs = dict(deviceArgs)
+      deviceName = deviceArgs.get("name", deviceArgs.get("label", ""))
+      if (deviceName.startswith("LimeSDR Mini") and ("serial" in deviceArgs)):
+        devices.append(RadioDevice("LimeSDR Mini",
+          deviceArgs["serial"], deviceArgs.get("media", "")))
+    return devices
+
+#
+# Enumerates LimeSDR Mini devices by parsing the output of 'LimeUtil -find'.
+# This is used if the SoapySDR bindings are not available.
+#
+class LimeUtilDeviceEnumerator(object):
+  def enumerate(self):
+    regex = '\s*\*\s*\[\s*(.+),\s*(.+),\s*(.+),\s*(.+),\s*serial=(.+)\]'
+    limeUtil = os.popen("LimeUtil -find")
+    deviceList = limeUtil.readlines()
+    limeUtil.close()
+    devices = []
+    for deviceInfo in deviceList:
+      matches = re.match(regex, deviceInfo)
+      if (matches != None):
+        deviceInfo = matches.groups()
+        if (deviceInfo[0] == "LimeSDR Mini"):
+          devices.append(RadioDevice(deviceInfo[0], deviceInfo[4], deviceInfo[1]))
+    return devices
+
+#
+# Implements a fake device enumerator which reports a fixed list of device
+# serial numbers. This is used for testing without radio hardware.
+#
+class FakeDeviceEnumerator(object):
+  def __init__(self, deviceSerialNumbers):
+    self.deviceSerialNumbers = deviceSerialNumbers
+
+  def enumerate(self):
+    return [RadioDevice("Fake Radio", serial, "None")
+      for serial in self.deviceSerialNumbers]
+
+#
+# Holds the list of radio devices found by the first enumerator which is able
+# to run. The device list is cached for the session and only updated when a
+# rescan is requested. The initial scan may be run in the background, in which
+# case users of the device list must first wait for it to complete.
+#
+class DeviceRegistry(object):
+  def __init__(self, enumerators):
+    self.enumerators = enumerators
+    self.enumeratorName = None
+    self.devices = []
+    self.scanThread = None
+
+  # Starts a device scan in the background.
+  def startScan(self):
+    self.scanThread = threading.Thread(
+      target=self.scan, name="DeviceDiscovery")
+    self.scanThread.daemon = True
+    self.scanThread.start()
+
+  # Waits for any background device scan to complete, reporting the devices
+  # found. Returns the list of device serial numbers.
+  def waitForScan(self):
+    if (self.scanThread != None):
+      self.scanThread.join()
+      self.scanThread = None
+      self.report()
+    return self.deviceSerialNumbers()
+
+  # Scans for devices, trying each enumerator in turn.
+  def scan(self):
+    for enumerator in self.enumerators:
+      try:
+        self.devices = enumerator.enumerate()
+        self.enumeratorName = enumerator.__class__.__name__
+        return self.devices
+      except (ImportError, OSError, RuntimeError), msg:
+        print "GNURadio: %s failed - %s" % (enumerator.__class__.__name__, msg)
+    self.devices = []
+    self.enumeratorName = None
+    return self.devices
+
+  def deviceSerialNumbers(self):
+    return [device.serial for device in self.devices]
+
+  def report(self):
+    print "GNURadio: Found %d radio devices using %s" % \
+      (len(self.devices), self.enumeratorName)
+    for device in self.devices:
+      print "  %s : %s (%s)" % (device.serial, device.name, device.media)
+
+#
+# Run the main application. In headless mode the command pipe is polled
+# directly, otherwise a socket notifier on the command pipe triggers parsing
+# from the QT event loop. Device discovery runs in the background, so that
+# commands can be processed immediately. Only the commands which require the
+# device list wait for discovery to complete.
+#
+def runApp(options):
+  if (options.radio_backend == "simulated"):
+    radioBackend = SimulatedRadioBackend(options)
+    deviceRegistry = DeviceRegistry([radioBackend])
+  else:
+    radioBackend = None
+    if (options.fake_devices != None):
+      deviceRegistry = DeviceRegistry(
+        [FakeDeviceEnumerator(options.fake_devices.split(","))])
+    else:
+      deviceRegistry = DeviceRegistry(
+        [SoapyDeviceEnumerator(), LimeUtilDeviceEnumerator()])
+  deviceRegistry.startScan()
+  startupProfiler.mark("start device discovery")
+  cmdReader = CommandReader()
+  startupProfiler.mark("command pipe setup")
+  print "Starting GNU Radio Driver Application"
+
+  cmdParser = CommandParser(cmdReader, deviceRegistry, radioBackend,
+    options.headless)
+  startupProfiler.mark("flow graph setup")
+  if (options.headless):
+    startupProfiler.report()
+    while True:
+      select.select([cmdReader.fileno()], [], [])
+      cmdParser.readCommands()
+  else:
+    from PyQt4 import QtCore, QtGui
+    qapp = QtGui.QApplication(sys.argv)
+    cmdNotifier = QtCore.QSocketNotifier(
+      cmdReader.fileno(), QtCore.QSocketNotifier.Read, qapp)
+    cmdNotifier.activated.connect(lambda fd: cmdParser.readCommands())
+    startupProfiler.mark("QT application setup")
+    startupProfiler.report()
+    qapp.exec_()
+
+#
+# Parse the command line options.
+#
+def parseArgs():
+  parser = argparse.ArgumentParser(description="Scratch GNU Radio driver")
+  parser.add_argument("--radio-backend", choices=["lime", "simulated"],
+    default="lime", help="radio hardware backend to use")
+  parser.add_argument("--headless", action="store_true",
+    help="run without the QT GUI (display sinks are not supported)")
+  parser.add_argument("--profile-startup", action="store_true",
+    help="print a breakdown of the driver startup time")
+  parser.add_argument("--filter-tap-cache", action="store_true",
+    help="persist designed FIR filter taps across driver restarts")
+  parser.add_argument("--fake-devices", metavar="SERIALS",
+    help="comma separated device serial numbers to report instead of "
+    "scanning for LimeSDR devices (for testing)")
+  parser.add_argument("--sim-devices", type=int, default=1,
+    help="number of simulated radio devices")
+  parser.add_argument("--sim-noise-voltage", type=float, default=0.0,
+    help="simulated channel AWGN voltage")
+  parser.add_argument("--sim-freq-offset", type=float, default=0.0,
+    help="simulated channel frequency offset in Hz")
+  parser.add_argument("--sim-clock-drift", type=float, default=0.0,
+    help="simulated sample clock drift in ppm")
+  parser.add_argument("--sim-attenuation", type=float, default=0.0,
+    help="simulated channel attenuation in dB")
+  return parser.parse_args()
 
 if __name__ == '__main__':
   try:
-    deviceSerialNumber = checkForLimeMini()
-    if (deviceSerialNumber == None):
-      print "No LimeSDR Mini Device Found!"
-    else:
-      print "Starting GNU Radio Driver Application For Device: ", deviceSerialNumber
-      runApp(deviceSerialNumber)
+    options = parseArgs()
+    startupProfiler.enabled = options.profile_startup
+    if (options.filter_tap_cache):
+      filterTapCache.cacheFileName = FILTER_TAP_CACHE_FILE
+    startupProfiler.mark("parse arguments")
+    runApp(options)
   except [[KeyboardInterrupt]]:
     pass
@@ -337,6 +337,38 @@
         }
     }
 
+    // Block for creating a forward error correction encoder.
+    ext.createFecEncoder = function(name) {
+        if (this._checkComponentAbsent(name)) {
+            this._sendCommand("CREATE CONVOLUTIONAL-ENCODER " + name);
+            this._connectDataProcessor(name);
+        }
+    }
+
+    // Block for creating a forward error correction decoder.
+    ext.createFecDecoder = function(name) {
+        if (this._checkComponentAbsent(name)) {
+            this._sendCommand("CREATE CONVOLUTIONAL-DECODER " + name);
+            this._connectDataProcessor(name);
+        }
+    }
+
+    // Block for creating a data whitener.
+    ext.createWhitener = function(name) {
+        if (this._checkComponentAbsent(name)) {
+            this._sendCommand("CREATE WHITENER " + name);
+            this._connectDataProcessor(name);
+        }
+    }
+
+    // Block for creating a data dewhitener.
+    ext.createDewhitener = function(name) {
+        if (this._checkComponentAbsent(name)) {
+            this._sendCommand("CREATE DEWHITENER " + name);
+            this._connectDataProcessor(name);
+        }
+    }
+
     // Block for creating an OOK modulator.
     ext.createOokModulator = function(name, modFreq) {
         if (this._checkComponentAbsent(name)) {
@@ -425,6 +457,10 @@
             [' ', '\u2503 simple deframer %s', 'createSimpleDeframer', 'rx-deframer'],
             [' ', '\u2503 Manchester encoder %s', 'createManchesterEncoder', 'mcr-encoder'],
             [' ', '\u2503 Manchester decoder %s', 'createManchesterDecoder', 'mcr-decoder'],
+            [' ', '\u2503 FEC encoder %s', 'createFecEncoder', 'fec-encoder'],
+            [' ', '\u2503 FEC decoder %s', 'createFecDecoder', 'fec-decoder'],
+            [' ', '\u2503 data whitener %s', 'createWhitener', 'whitener'],
+            [' ', '\u2503 data dewhitener %s', 'createDewhitener', 'dewhitener'],
             [' ', '\u2503 OOK modulator %s at %n kHz', 'createOokModulator', 'ook-modulator', sampleRate/8000],
             [' ', '\u2503 OOK demodulator %s', 'createOokDemodulator', 'ook-demodulator'],
             [' ', '\u2503 bit rate sampler %s', 'createBitRateSampler', 'bit-sampler'],
@@ -33,5 +33,7 @@ then
     mkfifo $RX_MSG_PIPE_NAME
 fi
 
-# Runs the GNU Radio script. Uses flock to ensure only one instance is running.
-flock -w 0.1 $SCRIPT_LOCK_NAME python $GR_SCRIPT_NAME
+# Runs the GNU Radio script, passing through any command line options (for
+# example --radio-backend=simulated). Uses flock to ensure only one instance
+# is running.
+flock -w 0.1 $SCRIPT_LOCK_NAME python $GR_SCRIPT_NAME "$@"